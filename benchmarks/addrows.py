@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Compare adding rows one at a time with `addRow` to adding them in one batch with `addRows`,
+for [TableWidget][customQObjects.widgets.TableWidget] and
+[TableView][customQObjects.widgets.TableView].
+
+Run from the repository root, e.g.
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/addrows.py --rows 100000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from qtpy.QtWidgets import QApplication  # noqa: E402
+from customQObjects.widgets import TableView, TableWidget  # noqa: E402
+
+HEADER = ["id", "name", "value", "flag"]
+
+
+def makeRows(count):
+    return [[str(i), f"name{i}", str(i * 2.5), "x"] for i in range(count)]
+
+
+def addRowLoop(table, rows, **kwargs):
+    for row in rows:
+        table.addRow(row, **kwargs)
+
+
+def addRows(table, rows, **kwargs):
+    table.addRows(rows, **kwargs)
+
+
+def timeIt(tableType, func, rows, **kwargs) -> float:
+    table = tableType(horizontalHeader=HEADER)
+    t0 = time.perf_counter()
+    func(table, rows, **kwargs)
+    dt = time.perf_counter() - t0
+    assert table.rowCount == len(rows)
+    table.deleteLater()
+    return dt
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=100_000, help="number of rows to add")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])  # noqa: F841
+    rows = makeRows(args.rows)
+    cases = [("no kwargs", {}), ("toolTip kwarg", {"toolTip": "tip"})]
+
+    print(f"Adding {args.rows} rows of {len(HEADER)} columns")
+    for label, kwargs in cases:
+        loop = timeIt(TableWidget, addRowLoop, rows, **kwargs)
+        print(f"\n{label}")
+        print(f"  {'TableWidget.addRow loop':26s} {loop:7.3f} s  {args.rows / loop:10.0f} rows/s")
+        for tableType in [TableWidget, TableView]:
+            dt = timeIt(tableType, addRows, rows, **kwargs)
+            name = f"{tableType.__name__}.addRows"
+            speedup = loop / dt
+            print(f"  {name:26s} {dt:7.3f} s  {args.rows / dt:10.0f} rows/s  {speedup:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Compare calling a method or property of a container's current widget directly, with
+`currentWidget()`, through the forwarders that
+[WrapSignalsMeta][customQObjects.core.WrapSignalsMeta] creates, and through `__getattr__`.
+
+Run from the repository root, e.g.
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/forwarding.py
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from qtpy.QtWidgets import QApplication, QWidget  # noqa: E402
+from customQObjects.core import WrapSignalsMeta  # noqa: E402
+from customQObjects.widgets import StackedWidget  # noqa: E402
+
+
+class Page(QWidget):
+    def __init__(self):
+        super().__init__()
+        self._value = 0
+
+    def method(self, value):
+        return value
+
+    @property
+    def value(self):
+        return self._value
+
+
+class Container(StackedWidget, metaclass=WrapSignalsMeta, widget_class=Page):
+    pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--number", type=int, default=1_000_000, help="calls per timing")
+    parser.add_argument("--repeat", type=int, default=5, help="number of timings")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])  # noqa: F841
+    container = Container()
+    container.addWidget("page")
+    page = container.currentWidget()
+    # set after the class is made, so it is only found through __getattr__
+    page.dynamicMethod = page.method
+
+    cases = [
+        ("page method", lambda: page.method(1)),
+        ("currentWidget method", lambda: container.currentWidget().method(1)),
+        ("forwarded method", lambda: container.method(1)),
+        ("__getattr__ method", lambda: container.dynamicMethod(1)),
+        ("page property", lambda: page.value),
+        ("currentWidget property", lambda: container.currentWidget().value),
+        ("forwarded property", lambda: container.value),
+    ]
+    print(f"Best of {args.repeat} x {args.number} calls")
+    for label, func in cases:
+        best = min(timeit.repeat(func, number=args.number, repeat=args.repeat))
+        print(f"  {label:24s} {best / args.number * 1e9:7.0f} ns per call")
+
+
+if __name__ == "__main__":
+    main()
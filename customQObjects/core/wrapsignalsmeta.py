@@ -6,36 +6,50 @@ automatically wrap signals from its child widgets.
 """
 
 import inspect
-import ast
-from functools import partial
-from qtpy.QtCore import QObject
+import weakref
+from functools import partial, update_wrapper
+from qtpy.QtCore import QMetaMethod, QObject, QTimer, Signal
 
+# Qt meta-type names that have a natural Python equivalent; any other name
+# is passed to Signal as a string, which both PyQt and PySide accept
+_meta_types = {
+    "QString": str,
+    "int": int,
+    "bool": bool,
+    "double": float,
+    "QVariantList": list,
+    "QVariantMap": dict,
+    "PyQt_PyObject": object,
+    "PyObject": object,
+}
 
-def get_signal(tree, signal_names=None) -> list:
-    """
-    Parse abstract syntax tree, looking for Signals.
+# per-class discovered signals: (names of signals declared on the class, dict of all signals)
+_signal_cache = weakref.WeakKeyDictionary()
 
-    If `signal_name` is None, return all Signals in tree. Otherwise return
-    requested signals, if found.
 
-    The reutrn type of this function is a list of tuples of signal name and list of args.
-    If specific signals were requested but not found, en empty list is returned.
+def _meta_signals(widget_class):
     """
-    signals = []
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Assign):
-            try:
-                func_id = node.value.func.id
-            except:
-                continue
-            else:
-                if func_id == "Signal":
-                    args = [arg.id for arg in node.value.args]
-                    for target in node.targets:
-                        signal = (target.id, args)
-                        if signal_names is None or target.id in signal_names:
-                            signals.append(signal)
-    return signals
+    Return names of signals declared on `widget_class` and dict of all its signals,
+    read from the class's Qt meta-object.
+
+    Only the first overload of each signal is used.
+    """
+    meta = widget_class.staticMetaObject
+    offset, count = meta.methodOffset(), meta.methodCount()
+    own, signals = [], {}
+    # look at signals declared on this class before inherited ones, so they take precedence
+    for idx in [*range(offset, count), *range(offset)]:
+        method = meta.method(idx)
+        if method.methodType() != QMetaMethod.Signal:
+            continue
+        name = bytes(method.name()).decode()
+        if name in signals:
+            continue
+        args = [bytes(arg).decode() for arg in method.parameterTypes()]
+        signals[name] = [_meta_types.get(arg, arg) for arg in args]
+        if idx >= offset:
+            own.append(name)
+    return own, signals
 
 
 def get_signal_signature(widget_class, signal_names=None) -> list | None:
@@ -44,47 +58,192 @@ def get_signal_signature(widget_class, signal_names=None) -> list | None:
 
     If no `signal_names` given, return all Signals defined on the widget.
 
+    Signals are read from the Qt meta-object of `widget_class`, which must be a
+    QObject subclass. The result is cached for each class.
+
+    Returns list of tuples of signal name and list of args that can be passed to `Signal`.
     If specific signals are requested but not found, return None.
     """
-    # get source lines of class
-    lines, _ = inspect.getsourcelines(widget_class)
-    # parse source
-    tree = ast.parse("".join(lines))
-    # find signals
-    signals = get_signal(tree, signal_names)
+    if not isinstance(widget_class, type) or not issubclass(widget_class, QObject):
+        raise TypeError(f"widget_class should be a QObject subclass, not '{widget_class}'")
+    if (found := _signal_cache.get(widget_class)) is None:
+        found = _meta_signals(widget_class)
+        _signal_cache[widget_class] = found
+    own, all_signals = found
+    if signal_names is None:
+        signal_names = own
+    signals = [(name, list(all_signals[name])) for name in signal_names if name in all_signals]
     if len(signals) == 0:
         return None
     else:
         return signals
 
 
-def override_addWidget(widget_class, wrap_signals, bases):
+def override_addWidget(widget_class, wrap_signals, bases, coalesce=None):
     def addWidget(self, key, *args, **kwargs):
         """Create widget with `args` and `kwargs` and assign it to key `key`."""
         widget = widget_class(*args, **kwargs)
         for signal in wrap_signals:
             widget_signal = getattr(widget, signal)
-            self_signal = getattr(self, signal)
-            func = partial(getattr(self_signal, "emit"), key)
+            if coalesce is None:
+                self_signal = getattr(self, signal)
+                func = partial(getattr(self_signal, "emit"), key)
+            else:
+                func = partial(self._queueSignal, signal, key)
             widget_signal.connect(func)
         for base in bases:
             if (method := getattr(base, "addWidget", None)) is not None:
-                print(self, method, base, key)
                 return method(self, widget, key=key)
 
     return addWidget
 
 
+def make_batch_methods(coalesce, coalesce_latest) -> dict:
+    """
+    Return dict of attributes that queue wrapped signals and emit them in batches.
+
+    Emissions are flushed `coalesce` ms after the first one is queued, or on the
+    next event loop cycle if `coalesce` is 0. If `coalesce_latest` is True, only
+    the most recent args for each key are kept.
+    """
+
+    def _queueSignal(self, signal, key, *args):
+        if self._signalBatch is None:
+            self._signalBatch = {}
+            if self._signalBatchTimer is None:
+                self._signalBatchTimer = QTimer(self)
+                self._signalBatchTimer.setSingleShot(True)
+                self._signalBatchTimer.setInterval(coalesce)
+                self._signalBatchTimer.timeout.connect(self.flushSignals)
+            self._signalBatchTimer.start()
+        if (queue := self._signalBatch.get(signal)) is None:
+            queue = self._signalBatch[signal] = {} if coalesce_latest else []
+        if coalesce_latest:
+            # re-insert, so the batch is in order of most recent emission
+            queue.pop(key, None)
+            queue[key] = args
+        else:
+            queue.append((key, args))
+
+    def flushSignals(self):
+        """
+        Emit any queued wrapped signals now.
+
+        For each wrapped signal with queued emissions, `<signal>Batched` is
+        emitted with a list of `(key, args)` tuples.
+        """
+        batch, self._signalBatch = self._signalBatch, None
+        if self._signalBatchTimer is not None:
+            self._signalBatchTimer.stop()
+        if batch is None:
+            return
+        for signal, queue in batch.items():
+            if coalesce_latest:
+                queue = list(queue.items())
+            getattr(self, f"{signal}Batched").emit(queue)
+
+    return {
+        "_signalBatch": None,
+        "_signalBatchTimer": None,
+        "_queueSignal": _queueSignal,
+        "flushSignals": flushSignals,
+    }
+
+
 def override_getattr(wrap_signals, bases):
     def __getattr__(self, name):
         if name in wrap_signals:
             return self.__getattribute__(name)
-        print(self.currentWidget(), name)
-        return getattr(self.currentWidget(), name)
+        if (widget := self.currentWidget()) is None:
+            raise no_current_widget(self, name)
+        return getattr(widget, name)
 
     return __getattr__
 
 
+def no_current_widget(container, name) -> AttributeError:
+    """Return AttributeError for getting or setting `name` when `container` has no widgets."""
+    return AttributeError(f"'{type(container).__name__}' has no current widget for '{name}'")
+
+
+def forward_method(name, method, widget_class):
+    """
+    Return function that calls `method` on the current widget.
+
+    If the current widget is not a `widget_class` instance, its `name` attribute is called.
+    """
+
+    def forward(self, *args, **kwargs):
+        widget = self.currentWidget()
+        if isinstance(widget, widget_class):
+            return method(widget, *args, **kwargs)
+        if widget is None:
+            raise no_current_widget(self, name)
+        return getattr(widget, name)(*args, **kwargs)
+
+    return update_wrapper(forward, method, updated=())
+
+
+def forward_property(name, prop, widget_class):
+    """
+    Return property that gets (and sets, if possible) `prop` on the current widget.
+
+    If the current widget is not a `widget_class` instance, its `name` attribute is used.
+    """
+
+    def fget(self):
+        widget = self.currentWidget()
+        if isinstance(widget, widget_class):
+            return prop.__get__(widget)
+        if widget is None:
+            raise no_current_widget(self, name)
+        return getattr(widget, name)
+
+    def fset(self, value):
+        widget = self.currentWidget()
+        if isinstance(widget, widget_class):
+            prop.__set__(widget, value)
+        elif widget is None:
+            raise no_current_widget(self, name)
+        else:
+            setattr(widget, name, value)
+
+    return property(fget, fset if prop.fset is not None else None, doc=prop.__doc__)
+
+
+def make_forwarders(widget_class, attrs, bases) -> dict:
+    """
+    Return dict of attributes that forward public methods and properties of `widget_class`
+    to the current widget.
+
+    Names that are in `attrs` or found on any of `bases` are not forwarded.
+    """
+    forwarders = {}
+    # anything defined on a class the container also inherits from is already on the container
+    shared = {klass for base in bases for klass in base.__mro__}
+    for klass in widget_class.__mro__:
+        if klass in shared:
+            continue
+        for name, value in vars(klass).items():
+            if (
+                name.startswith("_")
+                or name in forwarders
+                or name in attrs
+                or any(hasattr(base, name) for base in bases)
+            ):
+                continue
+            if isinstance(value, property):
+                forwarders[name] = forward_property(name, value, widget_class)
+            elif inspect.isfunction(value) or (
+                inspect.ismethoddescriptor(value) and not isinstance(value, Signal)
+            ):
+                forwarders[name] = forward_method(name, getattr(widget_class, name), widget_class)
+            else:
+                # so a later class in the mro can't forward a name this class has shadowed
+                forwarders[name] = None
+    return {name: value for name, value in forwarders.items() if value is not None}
+
+
 class WrapSignalsMeta(type(QObject), type):
     """
     Metaclass for any container widget (e.g. StackedWidget).
@@ -103,23 +262,50 @@ class WrapSignalsMeta(type(QObject), type):
     a string identifier. This method is overridden to create the widgets
     (using the given `widget_class`) and connect the wrapped signals. The signature
     of the overriden `addWidget` method is `key, *args, **kwargs`.
+
+    When many contained widgets emit at once, set `coalesce` to queue the emissions
+    instead. For each wrapped signal, e.g. `valueChanged`, a `valueChangedBatched`
+    signal is emitted with a list of `(key, args)` tuples, either on the next event
+    loop cycle (`coalesce=0`) or `coalesce` ms after the first queued emission.
+    The wrapped signals themselves are not emitted in this mode. If `coalesce_latest`
+    is True, only the latest args from each key are kept in a batch. Queued signals
+    can be emitted immediately by calling `flushSignals`.
+
+    Public methods and properties of `widget_class` that the container does not
+    have are forwarded to the container's current widget. Any other attributes
+    not found on the container are looked up on the current widget. If the
+    container has no current widget, these raise AttributeError.
     """
 
-    def __new__(cls, clsname, bases, attrs, widget_class=None, wrap_signals=None):
+    def __new__(
+        cls,
+        clsname,
+        bases,
+        attrs,
+        widget_class=None,
+        wrap_signals=None,
+        coalesce=None,
+        coalesce_latest=False,
+    ):
+        if coalesce is not None and (not isinstance(coalesce, int) or coalesce < 0):
+            raise ValueError(f"'{coalesce}' not valid coalesce interval")
         if widget_class is not None:
             signals = get_signal_signature(widget_class, wrap_signals)
             if signals is not None:
                 for signal_name, signal_args in signals:
-                    signal_args.insert(0, "str")
-                    signal_args = ",".join(signal_args)
-                    signal_def = f"Signal({signal_args})"
-                    attrs[signal_name] = eval(signal_def)
+                    attrs[signal_name] = Signal(str, *signal_args)
+                    if coalesce is not None:
+                        attrs[f"{signal_name}Batched"] = Signal(list)
             if wrap_signals is None:
                 if signals is None:
                     wrap_signals = []
                 else:
                     wrap_signals = [signal[0] for signal in signals]
 
-        attrs["addWidget"] = override_addWidget(widget_class, wrap_signals, bases)
+        attrs["addWidget"] = override_addWidget(widget_class, wrap_signals, bases, coalesce)
+        if coalesce is not None:
+            attrs.update(make_batch_methods(coalesce, coalesce_latest))
         attrs["__getattr__"] = override_getattr(wrap_signals, bases)
+        if widget_class is not None:
+            attrs.update(make_forwarders(widget_class, attrs, bases))
         return type(clsname, bases, attrs)
@@ -1,21 +1,33 @@
-from .elidemixin import ElideMixin, ElideLabel
+from .elidemixin import ElideMixin, ElideLabel, ElideCache, ElideDelegate
 from .simplemixins import ClickMixin
-from .combobox import ComboBox, ComboBoxModel
+from .combobox import ComboBox, ComboBoxModel, ComboBoxItem, CompactComboBoxModel
 from .groupbox import GroupBox
 from .listselector import ListSelector
 from .timerdialog import TimerDialog
 from .spinbox import SpinBox, DoubleSpinBox
 from .stackedwidget import StackedWidget
 from .splitter import Splitter, HSplitter, VSplitter
-from .tablewidget import TableWidget
+from .tablewidget import (
+    TableWidget,
+    TableModel,
+    TableView,
+    SortFilterProxyModel,
+    SqliteTableModel,
+    SqliteTableView,
+    FormatRule,
+)
 
 __all__ = [
     "TimerDialog",
     "GroupBox",
     "ComboBox",
     "ComboBoxModel",
+    "ComboBoxItem",
+    "CompactComboBoxModel",
     "ElideMixin",
     "ElideLabel",
+    "ElideCache",
+    "ElideDelegate",
     "ClickMixin",
     "Splitter",
     "HSplitter",
@@ -24,5 +36,11 @@ __all__ = [
     "SpinBox",
     "DoubleSpinBox",
     "TableWidget",
+    "TableModel",
+    "TableView",
+    "SortFilterProxyModel",
+    "SqliteTableModel",
+    "SqliteTableView",
+    "FormatRule",
     "ListSelector",
 ]
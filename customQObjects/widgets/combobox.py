@@ -1,8 +1,25 @@
-from qtpy.QtWidgets import QComboBox
-from qtpy.QtCore import QAbstractListModel, Qt
+from qtpy.QtWidgets import QComboBox, QCompleter
+from qtpy.QtCore import QAbstractListModel, QModelIndex, QTimer, Qt, Signal
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
+import heapq
+from itertools import islice
+import re
+import time
 from typing import NamedTuple
 
 
+class ComboBoxItem(NamedTuple):
+    """
+    Item created when a row is inserted into a
+    [ComboBoxModel][customQObjects.widgets.ComboBoxModel], e.g. by `QComboBox.addItem`
+    """
+
+    name: str = ""
+    value: object = None
+
+
 class ComboBoxModel(QAbstractListModel):
     """
     [QAbstractListModel](https://doc.qt.io/qt-6/qabstractlistmodel.html)
@@ -14,38 +31,987 @@ class ComboBoxModel(QAbstractListModel):
     asked for the [Qt.DisplayRole](https://doc.qt.io/qt-6/qt.html#ItemDataRole-enum)
     and the `value` when asked for the
     [Qt.UserRole](https://doc.qt.io/qt-6/qt.html#ItemDataRole-enum).
+
+    The model keeps dicts of the first row with each name and value, so
+    [rowOfName][customQObjects.widgets.ComboBoxModel.rowOfName] and
+    [rowOfValue][customQObjects.widgets.ComboBoxModel.rowOfValue] take constant time.
+    These are updated when rows are inserted, removed or changed through the model, by counting
+    the rows with each name and value, and looking for the next row with a name or value only
+    when its first row is changed or removed. Inserting or removing rows before the end also
+    renumbers the later rows in the dicts. If the `values` list is modified in place, set
+    [values][customQObjects.widgets.ComboBoxModel.values] again to reset the model.
     """
 
     def __init__(self, values: list[NamedTuple], *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.values = values
+        self._values = values
+        self._rowsByName = None
+        self._rowsByValue = None
+        self._nameCounts = None
+        self._valueCounts = None
+        self._unhashableValues = False
+
+    @property
+    def values(self) -> list[NamedTuple]:
+        """List of items in the model"""
+        return self._values
+
+    @values.setter
+    def values(self, values: list[NamedTuple]):
+        self.beginResetModel()
+        self._values = values
+        self._invalidateRows()
+        self.endResetModel()
 
     def headerData(self):
         return None
 
     def rowCount(self, column=None):
-        return len(self.values)
+        return len(self._values)
 
     def data(self, idx, role):
         """
         Return the data at index `idx`.
 
-        If `role` is [Qt.DisplayRole](https://doc.qt.io/qt-6/qt.html#ItemDataRole-enum), return the
-        NamedTuple's `name`.
+        If `role` is [Qt.DisplayRole](https://doc.qt.io/qt-6/qt.html#ItemDataRole-enum) or
+        [Qt.EditRole](https://doc.qt.io/qt-6/qt.html#ItemDataRole-enum), return the NamedTuple's
+        `name`.
         If `role` is [Qt.UserRole](https://doc.qt.io/qt-6/qt.html#ItemDataRole-enum), return the
         NamedTuple's `value`.
         """
         if not idx.isValid():
             return None
 
-        value = self.values[idx.row()]
+        value = self._values[idx.row()]
 
-        if role == Qt.DisplayRole:
+        if role == Qt.DisplayRole or role == Qt.EditRole:
             return value.name
 
         elif role == Qt.UserRole:
             return value.value
 
+    def setData(self, idx, value, role=Qt.EditRole):
+        """
+        Set the `name` (for the Qt.DisplayRole or Qt.EditRole) or `value` (for the Qt.UserRole)
+        of the item at index `idx`.
+        """
+        if not idx.isValid():
+            return False
+        if role == Qt.DisplayRole or role == Qt.EditRole:
+            field = "name"
+        elif role == Qt.UserRole:
+            field = "value"
+        else:
+            return False
+        row = idx.row()
+        if self._rowsByName is not None:
+            names, values = self._forgetRows(row, row)
+        self._values[row] = self._values[row]._replace(**{field: value})
+        if self._rowsByName is not None:
+            self._findFirstRows(names, values, row + 1)
+            self._addRows(row, row)
+        self.dataChanged.emit(idx, idx, [role])
+        return True
+
+    def insertRows(self, row, count, parent=QModelIndex()):
+        """Insert `count` empty [ComboBoxItems][customQObjects.widgets.ComboBoxItem] at `row`"""
+        if parent.isValid() or row < 0 or row > len(self._values):
+            return False
+        self.insertValues(row, [ComboBoxItem() for _ in range(count)])
+        return True
+
+    def removeRows(self, row, count, parent=QModelIndex()):
+        if parent.isValid() or row < 0 or row + count > len(self._values):
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        if self._rowsByName is not None:
+            names, values = self._forgetRows(row, row + count - 1)
+        del self._values[row : row + count]
+        if self._rowsByName is not None:
+            self._shiftRows(row + count, -count)
+            self._findFirstRows(names, values, row)
+        self.endRemoveRows()
+        return True
+
+    def appendValues(self, values: list[NamedTuple]):
+        """Add `values` to the end of the model"""
+        self.insertValues(len(self._values), values)
+
+    def insertValues(self, row: int, values: list[NamedTuple]):
+        """Insert `values` at `row`"""
+        values = list(values)
+        if len(values) == 0:
+            return
+        self.beginInsertRows(QModelIndex(), row, row + len(values) - 1)
+        self._values[row:row] = values
+        if self._rowsByName is not None:
+            self._shiftRows(row, len(values))
+            self._addRows(row, row + len(values) - 1)
+        self.endInsertRows()
+
+    def rowOfName(self, name) -> int:
+        """Return first row with `name`, or -1 if there isn't one"""
+        self._buildRows()
+        return self._rowsByName.get(name, -1)
+
+    def rowOfValue(self, value) -> int:
+        """Return first row with `value`, or -1 if there isn't one"""
+        self._buildRows()
+        try:
+            row = self._rowsByValue.get(value, -1)
+        except TypeError:
+            row = -1
+        else:
+            if row >= 0 or not self._unhashableValues:
+                return row
+        # value or some of the values can't be hashed, so check the rows
+        for row, item in enumerate(self._values):
+            if item.value == value:
+                return row
+        return -1
+
+    def _invalidateRows(self):
+        """Clear the name and value dicts, so they will be rebuilt when next needed"""
+        self._rowsByName = None
+        self._rowsByValue = None
+        self._nameCounts = None
+        self._valueCounts = None
+        self._unhashableValues = False
+
+    def _buildRows(self):
+        """Build name and value dicts, if necessary"""
+        if self._rowsByName is None:
+            self._rowsByName = {}
+            self._rowsByValue = {}
+            self._nameCounts = {}
+            self._valueCounts = {}
+            self._addRows(0, len(self._values) - 1)
+
+    def _addRows(self, first, last):
+        """Add rows `first` to `last` (inclusive) to the name and value dicts"""
+        for row in range(first, last + 1):
+            item = self._values[row]
+            self._addKey(self._rowsByName, self._nameCounts, item.name, row)
+            try:
+                self._addKey(self._rowsByValue, self._valueCounts, item.value, row)
+            except TypeError:
+                self._unhashableValues = True
+
+    def _forgetRows(self, first, last) -> tuple[set, set]:
+        """
+        Remove rows `first` to `last` (inclusive) from the name and value dicts.
+
+        Return sets of the names and values whose first row was removed, but which are also in
+        later rows, so `_findFirstRows` can find them.
+        """
+        names, values = set(), set()
+        for row in range(first, last + 1):
+            item = self._values[row]
+            if self._forgetKey(self._rowsByName, self._nameCounts, item.name, row):
+                names.add(item.name)
+            try:
+                if self._forgetKey(self._rowsByValue, self._valueCounts, item.value, row):
+                    values.add(item.value)
+            except TypeError:
+                pass
+        # all rows of some of them may have been removed
+        names = {name for name in names if name in self._nameCounts}
+        values = {value for value in values if value in self._valueCounts}
+        return names, values
+
+    def _findFirstRows(self, names, values, start):
+        """Set the first rows of `names` and `values`, scanning forwards from row `start`"""
+        row = start
+        while len(names) > 0 or len(values) > 0:
+            item = self._values[row]
+            if item.name in names:
+                self._rowsByName[item.name] = row
+                names.discard(item.name)
+            try:
+                if item.value in values:
+                    self._rowsByValue[item.value] = row
+                    values.discard(item.value)
+            except TypeError:
+                pass
+            row += 1
+
+    def _shiftRows(self, first, delta):
+        """Add `delta` to the rows in the name and value dicts from `first` onwards"""
+        for rows in [self._rowsByName, self._rowsByValue]:
+            for key, row in rows.items():
+                if row >= first:
+                    rows[key] = row + delta
+
+    @staticmethod
+    def _addKey(rows, counts, key, row):
+        """Count `key` at `row`, making `row` its first row if it comes before the others"""
+        count = counts.get(key, 0)
+        counts[key] = count + 1
+        if count == 0 or row < rows[key]:
+            rows[key] = row
+
+    @staticmethod
+    def _forgetKey(rows, counts, key, row) -> bool:
+        """Stop counting `key` at `row`; return True if it was the first of several rows"""
+        count = counts[key] - 1
+        if count == 0:
+            del counts[key]
+            del rows[key]
+            return False
+        counts[key] = count
+        return rows[key] == row
+
+
+class CompactComboBoxModel(QAbstractListModel):
+    """
+    Read-only list model for a [ComboBox][customQObjects.widgets.ComboBox] with many items,
+    which stores the names and values in columns rather than as one object per item.
+
+    Names are stored in pages, each of which is a single string with an array of offsets.
+    Values are stored in an array if they are all ints or all floats, otherwise in a list.
+
+    `values` can be any iterable; items are taken from it `pageSize` at a time, as the popup
+    is scrolled (see [fetchMore][customQObjects.widgets.CompactComboBoxModel.fetchMore]), so
+    the combo box can be shown before `values` has been read.
+
+    Parameters
+    ----------
+    values : iterable
+        Items, which can be NamedTuples with 'name' and 'value' fields, (name, value) pairs
+        or strings (in which case the name and value are the same)
+    pageSize : int, optional
+        Number of items to load at a time. Default is 256.
+    parent : QObject, optional
+        Parent object
+    """
+
+    def __init__(self, values=(), pageSize=256, parent=None):
+        super().__init__(parent)
+        self._pageSize = pageSize
+        self._source = iter(values)
+        self._exhausted = False
+        self._namePages = []
+        self._values = array("q")
+        self._rowCount = 0
+        self._rowsByName = None
+        self._rowsByValue = None
+        self._unhashableValues = False
+        self._loadPage()
+
+    @property
+    def pageSize(self) -> int:
+        """
+        Number of items loaded at a time. This is read-only, as it is used to find the page that
+        each row is in.
+        """
+        return self._pageSize
+
+    def headerData(self, *args):
+        return None
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._rowCount
+
+    def data(self, idx, role=Qt.DisplayRole):
+        """
+        Return the data at index `idx`.
+
+        If `role` is [Qt.DisplayRole](https://doc.qt.io/qt-6/qt.html#ItemDataRole-enum) or
+        [Qt.EditRole](https://doc.qt.io/qt-6/qt.html#ItemDataRole-enum), return the item's name.
+        If `role` is [Qt.UserRole](https://doc.qt.io/qt-6/qt.html#ItemDataRole-enum), return the
+        item's value.
+        """
+        if not idx.isValid():
+            return None
+        if role == Qt.DisplayRole or role == Qt.EditRole:
+            return self.itemName(idx.row())
+        elif role == Qt.UserRole:
+            return self._values[idx.row()]
+
+    def itemName(self, row: int) -> str:
+        """Return name of item at `row`"""
+        text, offsets = self._namePages[row // self._pageSize]
+        idx = row % self._pageSize
+        return text[offsets[idx] : offsets[idx + 1]]
+
+    def itemValue(self, row: int):
+        """Return value of item at `row`"""
+        return self._values[row]
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        """Load the next `pageSize` items"""
+        if parent.isValid():
+            return
+        self._loadPage()
+
+    def fetchAll(self):
+        """Load all remaining items"""
+        while not self._exhausted:
+            self._loadPage()
+
+    def _loadPage(self):
+        """Take the next page of items from the source and add them to the model"""
+        if self._exhausted:
+            return
+        items = list(islice(self._source, self._pageSize))
+        if len(items) < self._pageSize:
+            self._exhausted = True
+            self._source = None
+        if len(items) == 0:
+            return
+
+        names = []
+        values = []
+        for item in items:
+            if isinstance(item, str):
+                name = value = item
+            elif hasattr(item, "name"):
+                name, value = item.name, item.value
+            else:
+                name, value = item
+            names.append(str(name))
+            values.append(value)
+
+        offsets = array("q", [0])
+        total = 0
+        for name in names:
+            total += len(name)
+            offsets.append(total)
+
+        first = self._rowCount
+        self.beginInsertRows(QModelIndex(), first, first + len(items) - 1)
+        self._namePages.append(("".join(names), offsets))
+        self._extendValues(values)
+        self._rowCount += len(items)
+        self._indexRows(first)
+        self.endInsertRows()
+
+    def _extendValues(self, values):
+        """Add `values`, converting the value array to a list if necessary"""
+        if isinstance(self._values, array):
+            valueType = int if self._values.typecode == "q" else float
+            if self._rowCount == 0 and len(values) > 0 and type(values[0]) is float:
+                valueType = float
+                self._values = array("d")
+            if all(type(value) is valueType for value in values):
+                try:
+                    self._values.extend(values)
+                    return
+                except OverflowError:
+                    del self._values[self._rowCount :]
+            self._values = list(self._values)
+        self._values.extend(values)
+
+    def rowOfName(self, name) -> int:
+        """
+        Return first row with `name`, or -1 if there isn't one.
+
+        If `name` has not been loaded yet, pages are loaded until it is found.
+        """
+        self._buildRows()
+        row = self._rowsByName.get(name, -1)
+        while row < 0 and not self._exhausted:
+            self._loadPage()
+            row = self._rowsByName.get(name, -1)
+        return row
+
+    def rowOfValue(self, value) -> int:
+        """
+        Return first row with `value`, or -1 if there isn't one.
+
+        If `value` has not been loaded yet, pages are loaded until it is found.
+        """
+        self._buildRows()
+        while True:
+            row = self._findValue(value)
+            if row >= 0 or self._exhausted:
+                return row
+            self._loadPage()
+
+    def _findValue(self, value) -> int:
+        """Return first loaded row with `value`, or -1"""
+        try:
+            row = self._rowsByValue.get(value, -1)
+        except TypeError:
+            row = -1
+        else:
+            if row >= 0 or not self._unhashableValues:
+                return row
+        for row, v in enumerate(self._values):
+            if v == value:
+                return row
+        return -1
+
+    def _buildRows(self):
+        """Build name and value dicts, if necessary"""
+        if self._rowsByName is None:
+            self._rowsByName = {}
+            self._rowsByValue = {}
+            self._indexRows(0)
+
+    def _indexRows(self, first):
+        """Add rows from `first` onwards to the name and value dicts, if they exist"""
+        if self._rowsByName is None:
+            return
+        for row in range(first, self._rowCount):
+            self._rowsByName.setdefault(self.itemName(row), row)
+            try:
+                self._rowsByValue.setdefault(self._values[row], row)
+            except TypeError:
+                self._unhashableValues = True
+
+
+class _SearchIndex(object):
+    """
+    Index of item names for prefix, substring and fuzzy search.
+
+    Names are lower-cased and joined into chunks of text, which are scanned for matches, so that
+    a search can be given a time budget and resumed later. For faster searches, `build` also
+    creates a list of the rows sorted by name, for prefix search, and an index of the rows
+    containing each trigram, for substring search. The index is built in slices, so that this can
+    be done when the event loop is idle; until the sorted list or trigrams are ready, those
+    searches scan the text instead.
+
+    The index is updated in place when rows are inserted, removed or renamed. If a query extends
+    the previous one and all the previous matches were found, only those matches are checked.
+
+    Parameters
+    ----------
+    count : int
+        Number of rows
+    nameAt : callable
+        Function that takes `first` and `last` row numbers and returns a list of the names of
+        those rows (inclusive). Names are read as the index is built.
+    """
+
+    maxCandidates = 5000
+    """
+    Maximum number of matches to find when scanning, or candidates to check from the trigram
+    index, before the scan is stopped or used instead
+    """
+
+    scanChunkSize = 8192
+    """Approximate number of characters in each chunk of text"""
+
+    checkRowsChunkSize = 256
+    """Number of rows to check at a time when narrowing previous results"""
+
+    checkInterval = 64
+    """Number of matches to find between checks of the time budget"""
+
+    buildSliceRows = 1024
+    """Number of rows to add at a time when building the index"""
+
+    trigramSliceRows = 256
+    """Number of rows to add at a time when building the trigram index"""
+
+    def __init__(self, count, nameAt):
+        self._count = count
+        self._nameAt = nameAt
+        self._names = []
+        self._chunkStarts = []
+        self._chunkTexts = []
+        self._chunkOffsets = []
+        self._sorted = None
+        self._trigrams = None
+        self._baseBuilder = self._buildBase()
+        self._sortBuilder = None
+        self._trigramBuilder = None
+        self._previous = None
+        self._scan = None
+        self._scores = {}
+        self._found = []
+        self._query = None
+        self._limit = 0
+        self._truncated = False
+
+    @property
+    def finished(self) -> bool:
+        """True if the last search has finished, either by finding all matches or being truncated"""
+        return self._scan is None
+
+    @property
+    def truncated(self) -> bool:
+        """
+        True if the last search was stopped after finding `maxCandidates` matches, so the
+        results may not be the best matches
+        """
+        return self._truncated
+
+    @property
+    def namesRead(self) -> bool:
+        """True if the names of all rows have been read, so the index can be updated in place"""
+        return self._baseBuilder is None
+
+    @property
+    def built(self) -> bool:
+        """True if the index, including the sorted rows and trigrams, has been built"""
+        return self.namesRead and self._sorted is not None and self._trigrams is not None
+
+    def search(self, query: str, mode="substring", limit=200, timeBudgetMs=None) -> list:
+        """
+        Return list of up to `limit` rows whose names match `query`, best matches first.
+
+        If `timeBudgetMs` is given and the names have to be scanned, stop after that time and
+        return the best matches found so far. `finished` will then be False and the search can
+        be continued with `resume`.
+
+        If the names have not all been read yet, that is finished first.
+
+        Parameters
+        ----------
+        query : str
+            Text to search for. The search is not case sensitive.
+        mode : {'prefix', 'substring', 'fuzzy'}
+            'prefix' finds names starting with `query`, in alphabetical order.
+            'substring' finds names containing `query`, with names starting with it first,
+            then in order of where `query` is found.
+            'fuzzy' finds names containing the characters of `query` in order, ranked by how
+            soon the last character is found.
+        limit : int
+            Maximum number of rows to return
+        timeBudgetMs : float, optional
+            Maximum time to spend scanning names
+        """
+        if mode not in ["prefix", "substring", "fuzzy"]:
+            msg = f"Search mode should be 'prefix', 'substring' or 'fuzzy', not '{mode}'"
+            raise ValueError(msg)
+        query = query.lower()
+        self._scan = None
+        self._scores = {}
+        self._found = []
+        self._query = (mode, query)
+        self._limit = limit
+        self._truncated = False
+        if len(query) == 0:
+            return []
+        self._readNames()
+        if mode == "prefix" and self._sorted is not None:
+            self._previous = None
+            return self._prefixSearch(query, limit)
+
+        rows = None
+        if self._previous is not None:
+            prevMode, prevQuery, prevRows = self._previous
+            if prevMode == mode and query.startswith(prevQuery):
+                rows = prevRows
+        if rows is None and mode == "substring" and len(query) >= 3:
+            rows = self._trigramCandidates(query)
+        self._previous = None
+        if rows is not None:
+            self._scan = self._checkRows(rows, query, mode)
+        else:
+            self._scan = self._scanRows(query, mode)
+        return self.resume(timeBudgetMs)
+
+    def resume(self, timeBudgetMs=None) -> list:
+        """Continue the last search and return the best matches found so far"""
+        if self._scan is not None:
+            deadline = None if timeBudgetMs is None else time.perf_counter() + timeBudgetMs / 1000
+            scores = self._scores
+            found = self._found
+            interval = self.checkInterval
+            for score in self._scan:
+                if score is not None:
+                    # matches are found in row order, so each list of rows stays sorted
+                    key, row = score
+                    rows = scores.get(key, None)
+                    if rows is None:
+                        scores[key] = [row]
+                    else:
+                        rows.append(row)
+                    found.append(row)
+                    # chunks with many matches are checked periodically as well
+                    if len(found) % interval != 0:
+                        continue
+                    if len(found) > self.maxCandidates:
+                        self._scan = None
+                        self._truncated = True
+                        break
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return self._ranked()
+            else:
+                self._scan = None
+                mode, query = self._query
+                self._previous = (mode, query, found)
+        return self._ranked()
+
+    def _ranked(self):
+        """Return best `limit` rows from the matches found so far"""
+        ranked = []
+        for key in sorted(self._scores):
+            ranked += self._scores[key]
+            if len(ranked) >= self._limit:
+                break
+        return ranked[: self._limit]
+
+    def _prefixSearch(self, query, limit):
+        names = self._names
+        first = bisect_left(self._sorted, query, key=names.__getitem__)
+        end = query[:-1] + chr(ord(query[-1]) + 1)
+        last = bisect_left(self._sorted, end, lo=first, key=names.__getitem__)
+        return self._sorted[first : min(last, first + limit)].tolist()
+
+    @staticmethod
+    def _fuzzyPattern(query):
+        """Return regex matching the characters of `query` in order"""
+        # each character is found by skipping any others, so no backtracking is needed
+        return "".join(f"[^\n{re.escape(c)}]*{re.escape(c)}" for c in query)
+
+    def _score(self, rows, query, mode) -> list:
+        """Return list of (score, row) for each of `rows` that matches `query`"""
+        names = self._names
+        if mode == "prefix":
+            return [(names[row], row) for row in rows if names[row].startswith(query)]
+        if mode == "substring":
+            scores = ((names[row].find(query), row) for row in rows)
+            return [score for score in scores if score[0] >= 0]
+        match = re.compile(self._fuzzyPattern(query)).match
+        scores = []
+        for row in rows:
+            m = match(names[row])
+            if m is not None:
+                scores.append((m.end(), row))
+        return scores
+
+    def _checkRows(self, rows, query, mode):
+        """
+        Generator that checks `rows` for `query`, yielding (score, row) for each match and None
+        after each chunk
+        """
+        chunkRows = self.checkRowsChunkSize
+        for first in range(0, len(rows), chunkRows):
+            yield from self._score(rows[first : first + chunkRows], query, mode)
+            yield None
+
+    def _scanRows(self, query, mode):
+        """
+        Generator that scans all names for `query`, yielding (score, row) for each match
+        and None after each chunk
+        """
+        names = self._names
+        if mode == "fuzzy":
+            finditer = re.compile("^" + self._fuzzyPattern(query), re.MULTILINE).finditer
+        elif mode == "prefix":
+            # each name is preceded by a newline
+            query = "\n" + query
+        chunks = zip(self._chunkStarts, self._chunkTexts, self._chunkOffsets)
+        for first, text, offsets in chunks:
+            if mode == "fuzzy":
+                for m in finditer(text):
+                    pos = m.start()
+                    yield (m.end() - pos, first + bisect_right(offsets, pos) - 1)
+            elif mode == "prefix":
+                pos = text.find(query)
+                while pos >= 0:
+                    idx = bisect_right(offsets, pos + 1) - 1
+                    yield (names[first + idx], first + idx)
+                    pos = text.find(query, offsets[idx + 1] - 1)
+            else:
+                pos = text.find(query)
+                while pos >= 0:
+                    idx = bisect_right(offsets, pos) - 1
+                    yield (pos - offsets[idx], first + idx)
+                    pos = text.find(query, offsets[idx + 1])
+            yield None
+
+    def _trigramCandidates(self, query):
+        """
+        Return rows containing the least common trigram in `query`, or None if the trigram index
+        is not ready or there are more than `maxCandidates`
+        """
+        if self._trigrams is None:
+            return None
+        smallest = None
+        for idx in range(len(query) - 2):
+            rows = self._trigrams.get(query[idx : idx + 3], None)
+            if rows is None:
+                return []
+            if smallest is None or len(rows) < len(smallest):
+                smallest = rows
+        if len(smallest) > self.maxCandidates:
+            return None
+        return smallest
+
+    def build(self, timeBudgetMs=None) -> bool:
+        """
+        Continue building the index, stopping after `timeBudgetMs` milliseconds, if given.
+        Return True if the index is complete.
+        """
+        deadline = None if timeBudgetMs is None else time.perf_counter() + timeBudgetMs / 1000
+        while (builder := self._nextBuilder()) is not None:
+            for _ in builder:
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return False
+        return True
+
+    def _nextBuilder(self):
+        """Return generator for the next part of the index to build, or None if it is complete"""
+        if self._baseBuilder is not None:
+            return self._baseBuilder
+        if self._sorted is None:
+            if self._sortBuilder is None:
+                self._sortBuilder = self._buildSorted()
+            return self._sortBuilder
+        if self._trigrams is None:
+            if self._trigramBuilder is None:
+                self._trigramBuilder = self._buildTrigrams()
+            return self._trigramBuilder
+        return None
+
+    def _readNames(self):
+        """Read the names of any rows that have not been read yet"""
+        if self._baseBuilder is not None:
+            for _ in self._baseBuilder:
+                pass
+
+    def _buildBase(self):
+        """Generator that reads the names and adds them to the text, yielding after each slice"""
+        for first in range(0, self._count, self.buildSliceRows):
+            last = min(first + self.buildSliceRows, self._count) - 1
+            names = [name.lower() for name in self._nameAt(first, last)]
+            self._names.extend(names)
+            starts, texts, offsets = self._makeChunks(first, names)
+            self._chunkStarts.extend(starts)
+            self._chunkTexts.extend(texts)
+            self._chunkOffsets.extend(offsets)
+            yield
+        self._baseBuilder = None
+
+    def _buildSorted(self):
+        """
+        Generator that sorts the rows by name, yielding after sorting each slice and after
+        merging each slice of the sorted slices
+        """
+        key = self._names.__getitem__
+        count = len(self._names)
+        step = self.buildSliceRows
+        runs = []
+        for first in range(0, count, step):
+            runs.append(sorted(range(first, min(first + step, count)), key=key))
+            yield
+        # an array of rows is much smaller, and quicker to free when the names change
+        rows = array("i")
+        merged = heapq.merge(*runs, key=key)
+        while len(rows) < count:
+            rows.extend(islice(merged, step))
+            yield
+        self._sorted = rows
+        self._sortBuilder = None
+
+    def _buildTrigrams(self):
+        """Generator that adds each name's trigrams to the index, yielding after each slice"""
+        trigrams = {}
+        names = self._names
+        step = self.trigramSliceRows
+        for first in range(0, len(names), step):
+            for row in range(first, min(first + step, len(names))):
+                self._addTrigrams(trigrams, row, names[row])
+            yield
+        self._trigrams = trigrams
+        self._trigramBuilder = None
+
+    @staticmethod
+    def _addTrigrams(trigrams, row, name):
+        for trigram in {name[idx : idx + 3] for idx in range(len(name) - 2)}:
+            rows = trigrams.get(trigram, None)
+            if rows is None:
+                trigrams[trigram] = array("i", [row])
+            else:
+                rows.append(row)
+
+    @staticmethod
+    def _removeTrigrams(trigrams, row, name):
+        for trigram in {name[idx : idx + 3] for idx in range(len(name) - 2)}:
+            rows = trigrams[trigram]
+            rows.remove(row)
+            if len(rows) == 0:
+                del trigrams[trigram]
+
+    def _makeChunks(self, firstRow, names):
+        """
+        Return lists of the first row, text and offsets of the names in each chunk of `names`,
+        the first of which is row `firstRow`
+        """
+        starts, texts, offsetArrays = [], [], []
+        idx = 0
+        while idx < len(names):
+            # each name is preceded by a newline, so prefixes can be found as well
+            offsets = array("i", [1])
+            pos = 1
+            end = idx
+            while end < len(names) and pos < self.scanChunkSize:
+                pos += len(names[end]) + 1
+                offsets.append(pos)
+                end += 1
+            starts.append(firstRow + idx)
+            texts.append("\n" + "\n".join(names[idx:end]) + "\n")
+            offsetArrays.append(offsets)
+            idx = end
+        return starts, texts, offsetArrays
+
+    def _rechunk(self, first, last, delta):
+        """
+        Rebuild the chunks containing rows `first` to `last` (numbered before the change), after
+        `delta` rows have been inserted at `first` (or removed, if `delta` is negative)
+        """
+        starts = self._chunkStarts
+        oldCount = len(self._names) - delta
+        if len(starts) == 0:
+            c0 = c1 = startRow = stopRow = 0
+        else:
+            c0 = max(0, bisect_right(starts, min(first, oldCount - 1)) - 1)
+            c1 = max(c0 + 1, bisect_right(starts, min(last, oldCount - 1)))
+            stopRow = starts[c1] if c1 < len(starts) else oldCount
+            startRow = starts[c0]
+        newStarts, texts, offsets = self._makeChunks(
+            startRow, self._names[startRow : stopRow + delta]
+        )
+        for c in range(c1, len(starts)):
+            starts[c] += delta
+        starts[c0:c1] = newStarts
+        self._chunkTexts[c0:c1] = texts
+        self._chunkOffsets[c0:c1] = offsets
+
+    def _invalidate(self, sortedRows=True, trigrams=True):
+        """
+        Stop the current search and forget the previous results, after the names have changed.
+
+        If `sortedRows` or `trigrams` are True, the sorted list or trigram index will be built
+        again.
+        """
+        self._scan = None
+        self._previous = None
+        if sortedRows:
+            self._sorted = None
+            self._sortBuilder = None
+        if trigrams:
+            self._trigrams = None
+            self._trigramBuilder = None
+
+    def _sortedPosition(self, row) -> int:
+        """Return position of `row` in the sorted rows, which are in row order for equal names"""
+        rows = self._sorted
+        key = self._names.__getitem__
+        name = self._names[row]
+        lo = bisect_left(rows, name, key=key)
+        hi = bisect_right(rows, name, lo=lo, key=key)
+        return bisect_left(rows, row, lo, hi)
+
+    def _sort(self, row):
+        """Add `row` to the sorted rows"""
+        self._sorted.insert(self._sortedPosition(row), row)
+
+    def _unsort(self, row):
+        """Remove `row` from the sorted rows"""
+        del self._sorted[self._sortedPosition(row)]
+
+    def setNames(self, first: int, names: list):
+        """Set the names of the rows from `first` onwards to `names`"""
+        names = [name.lower() for name in names]
+        last = first + len(names) - 1
+        oldNames = self._names[first : last + 1]
+        changed = [
+            (row, old, new)
+            for row, old, new in zip(range(first, last + 1), oldNames, names)
+            if old != new
+        ]
+        if len(changed) == 0:
+            return
+        many = len(changed) > self.buildSliceRows
+        self._invalidate(many or self._sorted is None, many or self._trigrams is None)
+        for row, old, new in changed:
+            if self._sorted is not None:
+                self._unsort(row)
+            if self._trigrams is not None:
+                self._removeTrigrams(self._trigrams, row, old)
+            self._names[row] = new
+            if self._sorted is not None:
+                self._sort(row)
+            if self._trigrams is not None:
+                self._addTrigrams(self._trigrams, row, new)
+        self._rechunk(first, last, 0)
+
+    def insertRows(self, first: int, names: list):
+        """Insert rows with `names` at `first`"""
+        names = [name.lower() for name in names]
+        # rows after `first` would have to be renumbered, so only appending is done in place
+        inPlace = first == len(self._names) and len(names) <= self.buildSliceRows
+        self._invalidate(not inPlace or self._sorted is None, not inPlace or self._trigrams is None)
+        self._names[first:first] = names
+        for row in range(first, first + len(names)):
+            if self._sorted is not None:
+                self._sort(row)
+            if self._trigrams is not None:
+                self._addTrigrams(self._trigrams, row, self._names[row])
+        self._rechunk(first, first, len(names))
+
+    def removeRows(self, first: int, last: int):
+        """Remove rows `first` to `last` (inclusive)"""
+        inPlace = last == len(self._names) - 1 and last - first < self.buildSliceRows
+        self._invalidate(not inPlace or self._sorted is None, not inPlace or self._trigrams is None)
+        for row in range(first, last + 1):
+            if self._sorted is not None:
+                self._unsort(row)
+            if self._trigrams is not None:
+                self._removeTrigrams(self._trigrams, row, self._names[row])
+        del self._names[first : last + 1]
+        self._rechunk(first, last, first - last - 1)
+
+
+class _FilterModel(QAbstractListModel):
+    """List model of the names of the rows matching a ComboBox filter"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._names = []
+
+    def setRows(self, rows, names):
+        """Set list of `rows` of the combo box and their `names`"""
+        self.beginResetModel()
+        self._rows = rows
+        self._names = names
+        self.endResetModel()
+
+    def sourceRow(self, row):
+        return self._rows[row]
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def data(self, idx, role=Qt.DisplayRole):
+        if not idx.isValid():
+            return None
+        if role == Qt.DisplayRole or role == Qt.EditRole:
+            return self._names[idx.row()]
+        return None
+
+
+_defaultExecutor = None
+
+
+def _getDefaultExecutor():
+    """Return thread pool used by `ComboBox.populateAsync` when no executor is given"""
+    global _defaultExecutor
+    if _defaultExecutor is None:
+        _defaultExecutor = ThreadPoolExecutor(thread_name_prefix="ComboBoxPopulate")
+    return _defaultExecutor
+
+
+def _callFactory(factory):
+    """Call `factory` and return its values as a list, so that generators can be used"""
+    return list(factory())
+
 
 class ComboBox(QComboBox):
     """
@@ -72,19 +1038,130 @@ class ComboBox(QComboBox):
         [QComboBox](https://doc.qt.io/qt-6/qcombobox.html) kwargs
     """
 
+    populateFinished = Signal()
+    """
+    Signal emitted when the values from
+    [populateAsync][customQObjects.widgets.ComboBox.populateAsync] have been set
+    """
+
+    populateFailed = Signal(object)
+    """
+    Signal emitted with the exception if the factory given to
+    [populateAsync][customQObjects.widgets.ComboBox.populateAsync] raises one
+    """
+
+    _populateDone = Signal(object)
+
     def __init__(self, *args, values: list[NamedTuple] = None, model=None, **kwargs):
         super().__init__(*args, **kwargs)
+        self._items = None
+        self._itemsSnapshot = None
+        self._searchIndex = None
+        self._filterMode = None
+        self._filterCompleter = None
+        self._populateFuture = None
+        self._populateArgs = None
+        self._populateDone.connect(self._finishPopulate)
+        self._indexTimer = QTimer(self)
+        self._indexTimer.setSingleShot(True)
+        self._indexTimer.setInterval(0)
+        self._indexTimer.timeout.connect(self._continueIndexBuild)
+        self._connectModel(self.model())
         if model is None:
             model = ComboBoxModel
+        self._modelType = model
         if values is not None:
             mdl = model(values)
             self.setModel(mdl)
         self._values = values
 
+    def setModel(self, model):
+        self._disconnectModel(self.model())
+        super().setModel(model)
+        self._connectModel(model)
+        self._invalidateItems()
+
+    def _modelSignals(self, model):
+        """Return list of model signals and the slots that update the cached items"""
+        return [
+            (model.dataChanged, self._itemsChanged),
+            (model.rowsInserted, self._itemsInserted),
+            (model.rowsRemoved, self._itemsRemoved),
+            (model.rowsMoved, self._invalidateItems),
+            (model.layoutChanged, self._invalidateItems),
+            (model.modelReset, self._invalidateItems),
+        ]
+
+    def _connectModel(self, model):
+        for signal, slot in self._modelSignals(model):
+            signal.connect(slot)
+
+    def _disconnectModel(self, model):
+        for signal, slot in self._modelSignals(model):
+            signal.disconnect(slot)
+
+    def _invalidateItems(self, *args):
+        self._items = None
+        self._itemsSnapshot = None
+        self._resetSearchIndex()
+
+    def _itemsChanged(self, topLeft, bottomRight, roles=[]):
+        if len(roles) > 0 and Qt.DisplayRole not in roles and Qt.EditRole not in roles:
+            return
+        index = self._updatableSearchIndex()
+        if self._items is None and index is None:
+            return
+        first, last = topLeft.row(), bottomRight.row()
+        names = self._itemNames(first, last)
+        if self._items is not None:
+            self._items[first : last + 1] = names
+            self._itemsSnapshot = None
+        if index is not None:
+            index.setNames(first, names)
+            self._indexTimer.start()
+
+    def _itemsInserted(self, parent, first, last):
+        index = self._updatableSearchIndex()
+        if self._items is None and index is None:
+            return
+        names = self._itemNames(first, last)
+        if self._items is not None:
+            self._items[first:first] = names
+            self._itemsSnapshot = None
+        if index is not None:
+            index.insertRows(first, names)
+            self._indexTimer.start()
+
+    def _itemsRemoved(self, parent, first, last):
+        if self._items is not None:
+            del self._items[first : last + 1]
+            self._itemsSnapshot = None
+        if (index := self._updatableSearchIndex()) is not None:
+            index.removeRows(first, last)
+            self._indexTimer.start()
+
+    def _itemNames(self, first, last) -> list:
+        """Return list of names of rows `first` to `last` (inclusive)"""
+        model = self.model()
+        if isinstance(model, ComboBoxModel):
+            return [value.name for value in model.values[first : last + 1]]
+        elif isinstance(model, CompactComboBoxModel):
+            return [model.itemName(row) for row in range(first, last + 1)]
+        return [self.itemText(row) for row in range(first, last + 1)]
+
     @property
-    def items(self):
-        """Return list of text from all items."""
-        return [self.itemText(idx) for idx in range(self.count())]
+    def items(self) -> tuple:
+        """
+        Return tuple of text from all items.
+
+        The text is read once and kept up to date as items are inserted, removed or changed, so
+        reading `items` again only makes a new tuple if the items have changed.
+        """
+        if self._itemsSnapshot is None:
+            if self._items is None:
+                self._items = [self.itemText(idx) for idx in range(self.count())]
+            self._itemsSnapshot = tuple(self._items)
+        return self._itemsSnapshot
 
     @property
     def value(self):
@@ -93,3 +1170,294 @@ class ComboBox(QComboBox):
             return self.currentText()
         else:
             return self.itemData(self.currentIndex(), Qt.UserRole)
+
+    def setCurrentName(self, name):
+        """
+        Make the first item with text `name` current. If there is no such item, do nothing.
+
+        With a [ComboBoxModel][customQObjects.widgets.ComboBoxModel] or
+        [CompactComboBoxModel][customQObjects.widgets.CompactComboBoxModel], the row is found
+        in constant time.
+        """
+        model = self.model()
+        if isinstance(model, (ComboBoxModel, CompactComboBoxModel)):
+            row = model.rowOfName(name)
+        else:
+            row = self.findText(name, Qt.MatchExactly)
+        if row >= 0:
+            self.setCurrentIndex(row)
+
+    def setCurrentValue(self, value):
+        """
+        Make the first item with `value` current. If there is no such item, do nothing.
+
+        If the combo box was not created with `values`, this is the same as
+        [setCurrentName][customQObjects.widgets.ComboBox.setCurrentName]. With a
+        [ComboBoxModel][customQObjects.widgets.ComboBoxModel] or
+        [CompactComboBoxModel][customQObjects.widgets.CompactComboBoxModel], the row is found
+        in constant time.
+        """
+        if self._values is None:
+            self.setCurrentName(value)
+            return
+        model = self.model()
+        if isinstance(model, (ComboBoxModel, CompactComboBoxModel)):
+            row = model.rowOfValue(value)
+        else:
+            row = self.findData(value, Qt.UserRole, Qt.MatchExactly)
+        if row >= 0:
+            self.setCurrentIndex(row)
+
+    def setFilterMode(self, mode, maxResults=200):
+        """
+        Filter the items as the user types.
+
+        This makes the combo box editable and shows a popup of the items that match the text
+        after each keystroke. Choosing one makes it the current item.
+
+        The items are found with an index of their names, which is built when the event loop is
+        idle and updated as items are inserted, removed or changed. If the text extends the
+        previous text, only the previous matches are checked.
+
+        Parameters
+        ----------
+        mode : {'prefix', 'substring', 'fuzzy', None}
+            See [matchingRows][customQObjects.widgets.ComboBox.matchingRows]. If None, remove
+            the filter.
+        maxResults : int, optional
+            Maximum number of items to show in the popup. Default is 200.
+        """
+        if mode not in ["prefix", "substring", "fuzzy", None]:
+            msg = f"Filter mode should be 'prefix', 'substring', 'fuzzy' or None, not '{mode}'"
+            raise ValueError(msg)
+        self._filterMode = mode
+        self._maxFilterResults = maxResults
+        if mode is None:
+            self._indexTimer.stop()
+            if self._filterCompleter is not None:
+                self.lineEdit().textEdited.disconnect(self._filterItems)
+                self.lineEdit().setCompleter(None)
+                self._filterCompleter = None
+            return
+        if self._filterCompleter is not None:
+            return
+        self.setEditable(True)
+        self.setInsertPolicy(QComboBox.NoInsert)
+        completer = QCompleter(self)
+        completer.setModel(_FilterModel(completer))
+        completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        completer.activated[QModelIndex].connect(self._filterActivated)
+        self.lineEdit().setCompleter(completer)
+        self.lineEdit().textEdited.connect(self._filterItems)
+        self._filterCompleter = completer
+        self._getSearchIndex()
+        self._indexTimer.start()
+
+    def filterMode(self):
+        """
+        Return the filter mode set by
+        [setFilterMode][customQObjects.widgets.ComboBox.setFilterMode]
+        """
+        return self._filterMode
+
+    def matchingRows(self, text, mode="substring", limit=200) -> list:
+        """
+        Return list of up to `limit` rows whose names match `text`, best matches first.
+
+        Parameters
+        ----------
+        text : str
+            Text to search for. The search is not case sensitive.
+        mode : {'prefix', 'substring', 'fuzzy'}
+            'prefix' finds names starting with `text`, in alphabetical order.
+            'substring' finds names containing `text`, with names starting with it first.
+            'fuzzy' finds names containing the characters of `text` in order, e.g. 'nwyk'
+            matches 'New York', with the most compact matches first.
+        limit : int, optional
+            Maximum number of rows to return. Default is 200.
+        """
+        return self._getSearchIndex().search(text, mode, limit)
+
+    def _getSearchIndex(self):
+        """Return search index of the item names, creating it if necessary"""
+        if self._searchIndex is None:
+            model = self.model()
+            if isinstance(model, CompactComboBoxModel):
+                model.fetchAll()
+            self._searchIndex = _SearchIndex(self.count(), self._itemNames)
+        return self._searchIndex
+
+    def _resetSearchIndex(self):
+        """Discard the search index and, if filtering, start building a new one"""
+        self._searchIndex = None
+        if self._filterMode is not None:
+            self._getSearchIndex()
+            self._indexTimer.start()
+
+    def _updatableSearchIndex(self):
+        """
+        Return the search index if it can be updated in place, or None if there isn't one.
+
+        If the index has not read all the names yet, a new one is started instead, as the rows
+        it has read may have moved.
+        """
+        if self._searchIndex is None:
+            return None
+        if not self._searchIndex.namesRead:
+            self._resetSearchIndex()
+            return None
+        return self._searchIndex
+
+    filterTimeBudgetMs = 4
+    """
+    Time (in milliseconds) to spend searching after each keystroke, when filtering with
+    [setFilterMode][customQObjects.widgets.ComboBox.setFilterMode]. If the search is not
+    finished, it continues when control returns to the event loop and the popup is updated.
+    """
+
+    def _filterItems(self, text):
+        """Show items matching `text` in the completer popup"""
+        index = self._getSearchIndex()
+        rows = index.search(text, self._filterMode, self._maxFilterResults, self.filterTimeBudgetMs)
+        self._showFilterRows(rows)
+        if not index.finished:
+            QTimer.singleShot(0, self._continueFilter)
+        elif not index.built:
+            self._indexTimer.start()
+
+    def _continueIndexBuild(self):
+        """Continue building the search index, if filtering"""
+        if self._searchIndex is None or self._filterMode is None:
+            return
+        if not self._searchIndex.build(self.filterTimeBudgetMs):
+            self._indexTimer.start()
+
+    def _continueFilter(self):
+        """Continue search started by _filterItems"""
+        if self._searchIndex is None or self._searchIndex.finished:
+            return
+        rows = self._searchIndex.resume(self.filterTimeBudgetMs)
+        self._showFilterRows(rows)
+        if not self._searchIndex.finished:
+            QTimer.singleShot(0, self._continueFilter)
+
+    def _showFilterRows(self, rows):
+        names = [self.itemText(row) for row in rows]
+        self._filterCompleter.model().setRows(rows, names)
+        if len(rows) > 0:
+            self._filterCompleter.complete()
+        else:
+            self._filterCompleter.popup().hide()
+
+    def _filterActivated(self, idx):
+        """Make the item chosen from the completer popup current"""
+        self.setCurrentIndex(self._filterCompleter.model().sourceRow(idx.row()))
+
+    def populateAsync(
+        self, factory, executor=None, placeholder: str = "Loading...", keepSelection: bool = True
+    ):
+        """
+        Set the values returned by `factory`, calling it in a background thread or process.
+
+        The combo box remains usable while `factory` runs. When it returns, its values replace
+        the current ones on the GUI thread with a single model reset (or a new model, if the
+        current one is not a [ComboBoxModel][customQObjects.widgets.ComboBoxModel]) and
+        [populateFinished][customQObjects.widgets.ComboBox.populateFinished] is emitted. If it
+        raises an exception, the values are not changed and
+        [populateFailed][customQObjects.widgets.ComboBox.populateFailed] is emitted instead.
+
+        Calling this again, or calling
+        [cancelPopulate][customQObjects.widgets.ComboBox.cancelPopulate], discards the result of
+        the previous call.
+
+        Parameters
+        ----------
+        factory : callable
+            Function that returns an iterable of NamedTuples with fields 'name' and 'value'.
+            If `executor` is a process pool, `factory` and its values must be picklable.
+        executor : concurrent.futures.Executor, optional
+            Executor to call `factory` with. If not provided, a shared thread pool is used.
+        placeholder : str, optional
+            Placeholder text to show while there is no current item. Default is "Loading...".
+        keepSelection : bool, optional
+            If True (the default), make the item with the previously current value current
+            again, if there is one.
+
+        Returns
+        -------
+        future : concurrent.futures.Future
+            Future of the list of values
+        """
+        self.cancelPopulate()
+        if executor is None:
+            executor = _getDefaultExecutor()
+        self._populateArgs = (self.placeholderText(), keepSelection)
+        self.setPlaceholderText(placeholder)
+        future = executor.submit(_callFactory, factory)
+        self._populateFuture = future
+        future.add_done_callback(self._emitPopulateDone)
+        return future
+
+    def cancelPopulate(self):
+        """
+        Stop [populateAsync][customQObjects.widgets.ComboBox.populateAsync], if it is in
+        progress.
+
+        The factory is not called if it has not started yet; otherwise its result is ignored.
+        """
+        if self._populateFuture is None:
+            return
+        future = self._populateFuture
+        self._populateFuture = None
+        future.cancel()
+        self._endPopulate()
+
+    def isPopulating(self) -> bool:
+        """Return True if values from `populateAsync` are still being loaded"""
+        return self._populateFuture is not None
+
+    def _emitPopulateDone(self, future):
+        """Pass finished `future` to the GUI thread. This is called in the executor's thread."""
+        try:
+            self._populateDone.emit(future)
+        except RuntimeError:
+            # combo box has been deleted
+            pass
+
+    def _finishPopulate(self, future):
+        """Set values from finished `future`, if it has not been cancelled or superseded"""
+        if future is not self._populateFuture:
+            return
+        self._populateFuture = None
+        keepSelection = self._endPopulate()
+        exc = future.exception()
+        if exc is not None:
+            self.populateFailed.emit(exc)
+            return
+
+        values = future.result()
+        row = -1
+        if keepSelection and self.currentIndex() >= 0:
+            # a single scan is quicker than building the model's lookup dicts
+            if self._values is None:
+                name = self.currentText()
+                row = next((n for n, item in enumerate(values) if item.name == name), -1)
+            else:
+                value = self.value
+                row = next((n for n, item in enumerate(values) if item.value == value), -1)
+        model = self.model()
+        if isinstance(model, ComboBoxModel):
+            model.values = values
+        else:
+            self.setModel(self._modelType(values))
+        self._values = values
+        if row >= 0:
+            self.setCurrentIndex(row)
+        self.populateFinished.emit()
+
+    def _endPopulate(self):
+        """Restore the placeholder text and return the populateAsync `keepSelection` arg"""
+        placeholder, keepSelection = self._populateArgs
+        self._populateArgs = None
+        self.setPlaceholderText(placeholder)
+        return keepSelection
@@ -2,11 +2,114 @@
 :class:`ElideMixin` automatically elides text.
 
 :class:`ElideLabel` is a QLabel that uses the :class:`ElideMixin`
+
+:class:`ElideDelegate` elides text in item views
+
+:class:`ElideCache` caches elided text for all :class:`ElideMixin` widgets and
+:class:`ElideDelegate` delegates
 """
 
-from qtpy.QtWidgets import QLabel
-from qtpy.QtCore import Qt
+from qtpy.QtWidgets import (
+    QApplication,
+    QLabel,
+    QStyle,
+    QStyledItemDelegate,
+    QStyleOptionViewItem,
+    QToolTip,
+)
+from qtpy.QtCore import QEvent, QTimer, Qt
 from qtpy.QtGui import QFontMetrics
+from collections import OrderedDict
+
+
+class ElideCache(object):
+    """
+    Least recently used cache of elided text, shared by
+    [ElideMixin][customQObjects.widgets.ElideMixin] widgets.
+
+    Results are keyed on the text, font, available width and elide mode, so text is only measured
+    again when one of these changes. A
+    [QFontMetrics](https://doc.qt.io/qt-6/qfontmetrics.html) is kept for each font.
+
+    Parameters
+    ----------
+    maxSize : int, optional
+        Maximum number of elided strings to keep. Default is 16384.
+    """
+
+    def __init__(self, maxSize=16384):
+        self.maxSize = maxSize
+        self._cache = OrderedDict()
+        self._metrics = {}
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self):
+        return len(self._cache)
+
+    @property
+    def hits(self) -> int:
+        """Number of times elided text was found in the cache"""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Number of times text had to be elided"""
+        return self._misses
+
+    @property
+    def hitRate(self) -> float:
+        """Fraction of lookups that were found in the cache"""
+        total = self._hits + self._misses
+        return self._hits / total if total > 0 else 0.0
+
+    def resetStats(self):
+        """Set the hit and miss counts to zero"""
+        self._hits = 0
+        self._misses = 0
+
+    def clear(self):
+        """Remove all cached text and font metrics"""
+        self._cache.clear()
+        self._metrics.clear()
+
+    def fontMetrics(self, font) -> QFontMetrics:
+        """Return cached [QFontMetrics](https://doc.qt.io/qt-6/qfontmetrics.html) for `font`"""
+        key = font.key()
+        metrics = self._metrics.get(key, None)
+        if metrics is None:
+            metrics = QFontMetrics(font)
+            self._metrics[key] = metrics
+        return metrics
+
+    def elidedText(self, text, font, mode, width) -> str:
+        """
+        Return `text` elided with `mode` to fit in `width` pixels when drawn with `font`.
+
+        Parameters
+        ----------
+        text : str
+            Text to elide
+        font : QFont
+            Font the text will be drawn with
+        mode : Qt.TextElideMode
+            Elide mode
+        width : int
+            Available width
+        """
+        key = (text, font.key(), width, mode)
+        cache = self._cache
+        elided = cache.get(key, None)
+        if elided is not None:
+            self._hits += 1
+            cache.move_to_end(key)
+            return elided
+        self._misses += 1
+        elided = self.fontMetrics(font).elidedText(text, mode, width)
+        cache[key] = elided
+        if len(cache) > self.maxSize:
+            cache.popitem(last=False)
+        return elided
 
 
 class ElideMixin(object):
@@ -21,6 +124,11 @@ class ElideMixin(object):
     widthAdjust : int, optional
         If provided, this value will be added to the widget's width when
         calling [QFontMetrics.elidedText](https://doc.qt.io/qt-6/qfontmetrics.html#elidedText)
+    elideDelay : {None, int, 'frame'}, optional
+        When to elide the text again after the widget is resized. If None (the default), this
+        is done in every `resizeEvent`. If an int, it is done once the widget has not been
+        resized for that many milliseconds. If 'frame', it is done at most once per
+        [frameInterval][customQObjects.widgets.ElideMixin.frameInterval].
     """
 
     elideModes = {
@@ -30,10 +138,21 @@ class ElideMixin(object):
         "none": Qt.ElideNone,
     }
 
-    def __init__(self, *args, elideMode="middle", widthAdjust=0, **kwargs):
+    elideCache = ElideCache()
+    """[ElideCache][customQObjects.widgets.ElideCache] shared by all instances"""
+
+    frameInterval = 16
+    """Interval (in milliseconds) between updates when `elideDelay` is 'frame'"""
+
+    def __init__(self, *args, elideMode="middle", widthAdjust=0, elideDelay=None, **kwargs):
         self._fullText = ""
         self._widthAdjust = widthAdjust
         self._elideMode = self._validateMode(elideMode)
+        self._elideDelay = self._validateDelay(elideDelay)
+        self._elideTimer = None
+        self._elidedWidth = None
+        self._isElided = False
+        self._fullWidth = None
 
         super().__init__(*args, **kwargs)
 
@@ -64,6 +183,28 @@ class ElideMixin(object):
         self._widthAdjust = value
         self._resetText()
 
+    @property
+    def elideDelay(self):
+        """Delay before eliding the text again after a resize"""
+        return self._elideDelay
+
+    @elideDelay.setter
+    def elideDelay(self, delay):
+        """Set delay before eliding the text again after a resize"""
+        self._elideDelay = self._validateDelay(delay)
+        if self._elideTimer is not None and self._elideTimer.isActive():
+            self._elideTimer.stop()
+            self._elideToWidth()
+
+    @staticmethod
+    def _validateDelay(delay):
+        """Return `delay` if it is a valid elide delay"""
+        if delay is None or delay == "frame":
+            return delay
+        if isinstance(delay, int) and delay >= 0:
+            return delay
+        raise ValueError(f"'{delay}' not valid elide delay")
+
     def _validateMode(self, mode):
         """Return requested Qt.TextElideMode"""
         if mode is None:
@@ -81,9 +222,13 @@ class ElideMixin(object):
 
     def setText(self, text):
         """Elide `text` and set it"""
+        if text != self._fullText:
+            self._fullWidth = None
         self._fullText = text
-        metrics = QFontMetrics(self.font())
-        elided = metrics.elidedText(text, self.elideMode, self.width() + self.widthAdjust)
+        width = self.width() + self.widthAdjust
+        elided = self.elideCache.elidedText(text, self.font(), self.elideMode, width)
+        self._elidedWidth = width
+        self._isElided = elided != text
         super().setText(elided)
         self.setToolTip(self._fullText)
 
@@ -92,9 +237,45 @@ class ElideMixin(object):
         self.setText(self._fullText)
 
     def resizeEvent(self, event):
-        """Override resizeEvent to update text"""
+        """Override resizeEvent to update text, immediately or after `elideDelay`"""
+        super().resizeEvent(event)
+        delay = self._elideDelay
+        if delay is None:
+            self._elideToWidth()
+            return
+        if self._elideTimer is None:
+            self._elideTimer = QTimer(self)
+            self._elideTimer.setSingleShot(True)
+            self._elideTimer.timeout.connect(self._elideToWidth)
+        if delay == "frame":
+            if not self._elideTimer.isActive():
+                self._elideTimer.start(self.frameInterval)
+        else:
+            self._elideTimer.start(delay)
+
+    def _elideToWidth(self):
+        """
+        Elide the text again for the current width, unless the width is unchanged or the full
+        text is shown and still fits
+        """
+        width = self.width() + self.widthAdjust
+        if width == self._elidedWidth:
+            return
+        if not self._isElided and self._fits(width):
+            self._elidedWidth = width
+            return
         self._resetText()
 
+    def _fits(self, width) -> bool:
+        """Return True if the full text is not elided at `width`"""
+        if self._elideMode == Qt.ElideNone:
+            return True
+        font = self.font()
+        if self._fullWidth is None or self._fullWidth[0] != font.key():
+            metrics = self.elideCache.fontMetrics(font)
+            self._fullWidth = (font.key(), metrics.horizontalAdvance(self._fullText))
+        return width >= self._fullWidth[1]
+
 
 class ElideLabel(ElideMixin, QLabel):
     """[QLabel](https://doc.qt.io/qt-5/qlabel.html) that automatically elides its text.
@@ -106,3 +287,95 @@ class ElideLabel(ElideMixin, QLabel):
         super().__init__(*args, **kwargs)
         if len(args) == 1:
             self.setText(args[0])
+
+
+class ElideDelegate(QStyledItemDelegate):
+    """
+    [QStyledItemDelegate](https://doc.qt.io/qt-6/qstyleditemdelegate.html) that elides the
+    text of items when they are painted.
+
+    This elides text in the same way as [ElideMixin][customQObjects.widgets.ElideMixin], using
+    the shared [ElideCache][customQObjects.widgets.ElideCache], without creating a widget per
+    item. Set it on a view with `setItemDelegate` or `setItemDelegateForColumn`, e.g. on a
+    [TableWidget][customQObjects.widgets.TableWidget], a `QListView` or a
+    [ComboBox][customQObjects.widgets.ComboBox] (for its popup).
+
+    If an item's text is elided and the model does not provide a
+    [Qt.ToolTipRole](https://doc.qt.io/qt-6/qt.html#ItemDataRole-enum), the full text is shown as
+    the item's tooltip.
+
+    Parameters
+    ----------
+    parent : QObject, optional
+        Parent object
+    elideMode : {'middle', 'left', 'right', 'None', Qt.TextElideMode}
+        Text elide mode, either as string or
+        [Qt.TextElideMode](https://doc.qt.io/qt-6/qt.html#TextElideMode-enum>)
+    widthAdjust : int, optional
+        If provided, this value will be added to the width available for the text when
+        calling [QFontMetrics.elidedText](https://doc.qt.io/qt-6/qfontmetrics.html#elidedText)
+    """
+
+    elideModes = ElideMixin.elideModes
+
+    elideCache = ElideMixin.elideCache
+    """[ElideCache][customQObjects.widgets.ElideCache] shared with ElideMixin"""
+
+    _validateMode = ElideMixin._validateMode
+
+    def __init__(self, parent=None, elideMode="middle", widthAdjust=0):
+        super().__init__(parent)
+        self._elideMode = self._validateMode(elideMode)
+        self._widthAdjust = widthAdjust
+
+    @property
+    def elideMode(self):
+        """Current elide mode"""
+        return self._elideMode
+
+    @elideMode.setter
+    def elideMode(self, mode):
+        """Set elide mode. The view should be updated afterwards."""
+        self._elideMode = self._validateMode(mode)
+
+    @property
+    def widthAdjust(self):
+        """Current width adjust"""
+        return self._widthAdjust
+
+    @widthAdjust.setter
+    def widthAdjust(self, value):
+        """Set width adjust. The view should be updated afterwards."""
+        self._widthAdjust = value
+
+    def paint(self, painter, option, index):
+        """Paint item at `index` with its text elided"""
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        opt.text = self._elidedText(opt)
+        opt.textElideMode = Qt.ElideNone
+        widget = opt.widget
+        style = widget.style() if widget is not None else QApplication.style()
+        style.drawControl(QStyle.CE_ItemViewItem, opt, painter, widget)
+
+    def helpEvent(self, event, view, option, index):
+        """Show the full text as a tooltip, if it is elided and the model has no tooltip"""
+        if event.type() == QEvent.ToolTip and index.data(Qt.ToolTipRole) is None:
+            opt = QStyleOptionViewItem(option)
+            self.initStyleOption(opt, index)
+            if opt.text and self._elidedText(opt) != opt.text:
+                QToolTip.showText(event.globalPos(), opt.text, view)
+                return True
+        return super().helpEvent(event, view, option, index)
+
+    def _elidedText(self, option) -> str:
+        """Return the text in the initialised style `option`, elided to fit its text rect"""
+        if not option.text:
+            return option.text
+        widget = option.widget
+        style = widget.style() if widget is not None else QApplication.style()
+        rect = style.subElementRect(QStyle.SE_ItemViewItemText, option, widget)
+        # the style leaves this margin on each side of the text
+        margin = style.pixelMetric(QStyle.PM_FocusFrameHMargin, None, widget) + 1
+        width = rect.width() - 2 * margin + self._widthAdjust
+        return self.elideCache.elidedText(option.text, option.font, self._elideMode, width)
@@ -3,8 +3,12 @@
 """
 Simple widget to show a list of values and highlight the current one.
 """
-from qtpy.QtWidgets import QVBoxLayout, QHBoxLayout, QLabel, QFrame
-from qtpy.QtCore import Qt
+from qtpy.QtWidgets import QVBoxLayout, QHBoxLayout, QLabel, QFrame, QAbstractScrollArea
+from qtpy.QtCore import Qt, QEvent, QPointF, QRect, QSize, QTimer
+from qtpy.QtGui import QPainter, QStaticText, QPalette
+from array import array
+from bisect import bisect_right
+import time
 
 
 class StyledLabel(QLabel):
@@ -36,6 +40,235 @@ class StyledLabel(QLabel):
         return s
 
 
+class _ListSelectorView(QAbstractScrollArea):
+    """
+    Scroll area that paints a list of strings and a box around the current one.
+
+    Only the visible strings are drawn. The laid-out text of each is cached as a QStaticText.
+
+    Only the first `sample_size` strings are measured when the list is laid out. The rest are
+    measured in batches when the event loop is idle, or when they are needed to find the
+    position of an item. Until all have been measured, the length of a horizontal list is
+    estimated from the average length of those that have.
+    """
+
+    padding = 6
+    """Space around each string"""
+
+    max_cache_size = 4096
+    """Maximum number of laid-out strings to keep"""
+
+    sample_size = 100
+    """Number of strings to measure when the list is laid out"""
+
+    layout_batch_size = 8
+    """Number of strings to measure between checks of the time budget"""
+
+    layout_time_budget_ms = 4
+    """Time (in milliseconds) to spend measuring strings each time the event loop is idle"""
+
+    def __init__(self, values, orientation, style=None, parent=None):
+        super().__init__(parent)
+        self._values = values
+        self._vertical = orientation == "vertical"
+        self._css_style = "" if style is None else f' style="{style}"'
+        self._static_text = {}
+        self._current_idx = 0
+        self._layout_timer = QTimer(self)
+        self._layout_timer.setSingleShot(True)
+        self._layout_timer.setInterval(0)
+        self._layout_timer.timeout.connect(self._continue_layout)
+        if self._vertical:
+            self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        else:
+            self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setFrameShape(QFrame.NoFrame)
+        self.viewport().setBackgroundRole(QPalette.Window)
+        self._layout_items()
+
+    def _layout_text(self, idx) -> QStaticText:
+        """Return new laid-out text for item `idx`"""
+        text = QStaticText(f"<p{self._css_style}>{self._values[idx]}</p>")
+        text.setTextFormat(Qt.RichText)
+        text.prepare(font=self.font())
+        return text
+
+    def _text(self, idx) -> QStaticText:
+        """Return laid-out text for item `idx`"""
+        text = self._static_text.get(idx, None)
+        if text is None:
+            if len(self._static_text) >= self.max_cache_size:
+                self._static_text.clear()
+            text = self._layout_text(idx)
+            self._static_text[idx] = text
+            self._measure(idx, text)
+        return text
+
+    def _measure(self, idx, text):
+        """
+        Grow the item size to fit `text` of item `idx`.
+
+        If this is the next item to be measured in order and the list is horizontal, add the
+        offset of the item after it.
+        """
+        size = text.size()
+        width = int(size.width()) + 2 * self.padding
+        height = int(size.height()) + 2 * self.padding
+        if idx == self._measured:
+            self._measured += 1
+            if self._offsets is not None:
+                self._offsets.append(self._offsets[-1] + width)
+        old_size = self._item_size
+        if width > old_size.width() or height > old_size.height():
+            self._item_size = old_size.expandedTo(QSize(width, height))
+            if self._vertical and height > old_size.height():
+                # every item is this height, so all the offsets have changed
+                self._update_scroll_bar()
+                self.viewport().update()
+            self.updateGeometry()
+
+    def _measure_to(self, idx):
+        """Measure items, in order, up to `idx`"""
+        if idx < self._measured:
+            return
+        for next_idx in range(self._measured, min(idx, len(self._values) - 1) + 1):
+            text = self._static_text.get(next_idx, None)
+            if text is None:
+                # measure without caching, so the visible items are not pushed out of the cache
+                text = self._layout_text(next_idx)
+            self._measure(next_idx, text)
+        if self._offsets is not None:
+            self._update_scroll_bar()
+
+    def _continue_layout(self):
+        """Measure more items, until the time budget is used up"""
+        deadline = time.perf_counter() + self.layout_time_budget_ms / 1000
+        while self._measured < len(self._values) and time.perf_counter() < deadline:
+            self._measure_to(self._measured + self.layout_batch_size - 1)
+        if self._measured < len(self._values):
+            self._layout_timer.start()
+
+    def _layout_items(self):
+        """Measure the first `sample_size` items and start measuring the rest when idle"""
+        self._static_text.clear()
+        self._item_size = QSize(0, 0)
+        self._measured = 0
+        self._offsets = None if self._vertical else array("q", [0])
+        self._measure_to(min(len(self._values), self.sample_size) - 1)
+        self._update_scroll_bar()
+        self.updateGeometry()
+        if self._measured < len(self._values):
+            self._layout_timer.start()
+
+    def _offset(self, idx) -> int:
+        """Return position of start of item `idx` along the list"""
+        if self._offsets is None:
+            return idx * self._item_size.height()
+        self._measure_to(idx - 1)
+        return self._offsets[idx]
+
+    def _extent(self, idx) -> int:
+        """Return length of item `idx` along the list"""
+        return self._offset(idx + 1) - self._offset(idx)
+
+    def _index_at(self, pos) -> int:
+        """Return index of item at `pos` along the list"""
+        if self._offsets is None:
+            return pos // max(1, self._item_size.height())
+        offsets = self._offsets
+        while offsets[-1] <= pos and self._measured < len(self._values):
+            # measure as many items as should reach `pos`, judging by those measured so far
+            average = max(1, offsets[-1] // max(1, self._measured))
+            self._measure_to(self._measured + (pos - offsets[-1]) // average)
+        return bisect_right(offsets, pos) - 1
+
+    def _total_extent(self) -> int:
+        """Return length of the list, estimated if not all items have been measured"""
+        if self._offsets is None:
+            return len(self._values) * self._item_size.height()
+        total = self._offsets[-1]
+        if self._measured < len(self._values):
+            total += (len(self._values) - self._measured) * total // max(1, self._measured)
+        return total
+
+    def _scroll_bar(self):
+        return self.verticalScrollBar() if self._vertical else self.horizontalScrollBar()
+
+    def _viewport_extent(self) -> int:
+        size = self.viewport().size()
+        return size.height() if self._vertical else size.width()
+
+    def _update_scroll_bar(self):
+        bar = self._scroll_bar()
+        extent = self._viewport_extent()
+        bar.setRange(0, max(0, self._total_extent() - extent))
+        bar.setPageStep(extent)
+        if self._offsets is None:
+            bar.setSingleStep(self._item_size.height())
+
+    def _item_rect(self, idx) -> QRect:
+        """Return rect of item `idx` in viewport coordinates"""
+        pos = self._offset(idx) - self._scroll_bar().value()
+        if self._vertical:
+            return QRect(0, pos, self.viewport().width(), self._extent(idx))
+        return QRect(pos, 0, self._extent(idx), self.viewport().height())
+
+    def set_current_index(self, idx):
+        """Move the box to item `idx`, scrolling to it if necessary"""
+        previous = self._current_idx
+        self._current_idx = idx
+        bar = self._scroll_bar()
+        start = self._offset(idx)
+        end = start + self._extent(idx)
+        if start < bar.value():
+            bar.setValue(start)
+        elif end > bar.value() + self._viewport_extent():
+            bar.setValue(end - self._viewport_extent())
+        self.viewport().update(self._item_rect(previous))
+        self.viewport().update(self._item_rect(idx))
+
+    def sizeHint(self):
+        if self._vertical:
+            length = min(len(self._values), 10) * self._item_size.height()
+            return QSize(self._item_size.width(), length)
+        return QSize(min(self._total_extent(), 600), self._item_size.height())
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.FontChange:
+            self._layout_items()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._update_scroll_bar()
+
+    def scrollContentsBy(self, dx, dy):
+        self.viewport().update()
+
+    def paintEvent(self, event):
+        if len(self._values) == 0:
+            return
+        painter = QPainter(self.viewport())
+        rect = event.rect()
+        scroll = self._scroll_bar().value()
+        if self._vertical:
+            first, last = rect.top(), rect.bottom()
+        else:
+            first, last = rect.left(), rect.right()
+        first = max(0, self._index_at(first + scroll))
+        last = min(len(self._values) - 1, self._index_at(last + scroll))
+        for idx in range(first, last + 1):
+            item_rect = self._item_rect(idx)
+            text = self._text(idx)
+            size = text.size()
+            x = item_rect.x() + (item_rect.width() - size.width()) / 2
+            y = item_rect.y() + (item_rect.height() - size.height()) / 2
+            painter.drawStaticText(QPointF(x, y), text)
+        if first <= self._current_idx <= last:
+            painter.setPen(self.palette().color(QPalette.WindowText))
+            painter.drawRect(self._item_rect(self._current_idx).adjusted(0, 0, -1, -1))
+
+
 class ListSelector(QFrame):
     """
     Widget showing a list of strings, with the current one highlighted.
@@ -48,10 +281,20 @@ class ListSelector(QFrame):
         Orientation for list of widgets.
     style : str, optional
         Html style to use for each label.
+    virtual : bool, optional
+        If True, paint the strings in a single scrollable widget, rather than creating a
+        label for each one. Only the visible strings are drawn, so this is suitable for
+        thousands of values. `labels` will then be empty. Default is False.
     """
 
     def __init__(
-        self, *args, values: list[str], orientation: str = "vertical", style=None, **kwargs
+        self,
+        *args,
+        values: list[str],
+        orientation: str = "vertical",
+        style=None,
+        virtual: bool = False,
+        **kwargs,
     ):
         super().__init__(*args, **kwargs)
 
@@ -62,11 +305,22 @@ class ListSelector(QFrame):
             raise ValueError(msg)
 
         self._current_idx = 0
+        self._values = list(values)
+        self._text_index = {}
+        for idx, value in enumerate(self._values):
+            self._text_index.setdefault(value, idx)
 
         self.labels = []
 
         self.layout = QVBoxLayout() if orientation == "vertical" else QHBoxLayout()
 
+        if virtual:
+            self._view = _ListSelectorView(self._values, orientation, style)
+            self.layout.addWidget(self._view)
+            values = []
+        else:
+            self._view = None
+
         for value in values:
             label = StyledLabel()
             label.set_css_style(style)
@@ -94,7 +348,7 @@ class ListSelector(QFrame):
     @property
     def current_text(self):
         """Text of currently highlighted label."""
-        return self.labels[self._current_idx].text()
+        return self._values[self._current_idx]
 
     @current_text.setter
     def current_text(self, text):
@@ -106,22 +360,24 @@ class ListSelector(QFrame):
 
         Raise ValueError if no label with `text` is found.
         """
-        for idx, label in enumerate(self._labels):
-            if label.text() == text:
-                self.set_current_index(idx)
-
-        msg = f"No label with text '{text}'"
-        raise ValueError(msg)
+        idx = self._text_index.get(text, None)
+        if idx is None:
+            msg = f"No label with text '{text}'"
+            raise ValueError(msg)
+        self.set_current_index(idx)
 
     def set_current_index(self, idx):
         """Highlight label at index `idx`."""
-        self.labels[self._current_idx].setFrameShape(QFrame.NoFrame)
+        if self._view is not None:
+            self._view.set_current_index(idx)
+        else:
+            self.labels[self._current_idx].setFrameShape(QFrame.NoFrame)
+            self.labels[idx].setFrameShape(QFrame.Box)
         self._current_idx = idx
-        self.labels[self._current_idx].setFrameShape(QFrame.Box)
 
     def next(self):
         """Highlight next label, looping back to beginning if at end."""
-        if self.current_index == len(self.labels) - 1:
+        if self.current_index == len(self._values) - 1:
             self.current_index = 0
         else:
             self.current_index += 1
@@ -129,6 +385,6 @@ class ListSelector(QFrame):
     def previous(self):
         """Highlight previous label, looping to end if at beginning."""
         if self.current_index == 0:
-            self.current_index = len(self.labels) - 1
+            self.current_index = len(self._values) - 1
         else:
             self.current_index -= 1
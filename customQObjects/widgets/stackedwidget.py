@@ -3,9 +3,34 @@
 """
 QStackedWidget that stores references to its pages in a dict.
 """
-from qtpy.QtWidgets import QStackedWidget, QWidget
+from qtpy.QtWidgets import QApplication, QStackedWidget, QWidget
+from qtpy.QtCore import QEvent, QTimer
+from collections import Counter, OrderedDict, deque
+import time
 from uuid import uuid4
 
+_inputEvents = {
+    QEvent.KeyPress,
+    QEvent.KeyRelease,
+    QEvent.MouseButtonPress,
+    QEvent.MouseButtonRelease,
+    QEvent.MouseButtonDblClick,
+    QEvent.Wheel,
+    QEvent.TouchBegin,
+    QEvent.TouchUpdate,
+}
+
+
+class _LazyPage(object):
+    """Factory and saved state of a page added with `StackedWidget.addLazyWidget`"""
+
+    def __init__(self, factory, saveState=None, restoreState=None):
+        self.factory = factory
+        self.saveState = saveState
+        self.restoreState = restoreState
+        self.state = None
+        self.built = False
+
 
 class StackedWidget(QStackedWidget):
     """
@@ -13,19 +38,57 @@ class StackedWidget(QStackedWidget):
     in a dict.
 
     Also can pass dict of `pages` to initialise the stack.
+
+    Pages can also be added with
+    [addLazyWidget][customQObjects.widgets.StackedWidget.addLazyWidget], in which case they are
+    only created when they are first needed. If `maxInactivePages` is given, at most that many of
+    these pages are kept when they are not current; the least recently used are deleted and
+    created again when next needed.
+
+    Pages that are likely to be shown next can be created and laid out in advance, while the
+    event loop is idle; see [setPrewarm][customQObjects.widgets.StackedWidget.setPrewarm].
     """
 
-    def __init__(self, *args, pages={}, **kwargs):
+    def __init__(self, *args, pages={}, maxInactivePages=None, **kwargs):
         super().__init__(*args, **kwargs)
 
         self._widgetDict = {}
+        self._lazyPages = {}
+        self._inactivePages = OrderedDict()
+        self._currentLazyKey = None
+        self._maxInactivePages = maxInactivePages
+
+        self._prewarmStrategy = None
+        self._prewarmKeys = []
+        self._prewarmCount = 2
+        self._prewarmTimeBudgetMs = 8
+        self._prewarmDelayMs = 200
+        self._prewarmSteps = None
+        self._prewarmKey = None
+        self._prewarmed = set()
+        self._prewarmTimer = QTimer(self)
+        self._prewarmTimer.setSingleShot(True)
+        self._prewarmTimer.timeout.connect(self._prewarmStep)
+        self._visitCounts = Counter()
+        self._switchLatencies = deque(maxlen=1000)
+
+        self.currentChanged.connect(self._pageChanged)
         for key, widget in pages.items():
             self.addWidget(widget, key)
 
     def __getitem__(self, key):
-        """Get widget identified by `key`"""
+        """
+        Get widget identified by `key`.
+
+        If it was added with [addLazyWidget][customQObjects.widgets.StackedWidget.addLazyWidget]
+        and has not been created yet, it is created now. It is not evicted to stay within
+        [maxInactivePages][customQObjects.widgets.StackedWidget.maxInactivePages] until another
+        page is created or the current page changes, so the widget returned is not deleted.
+        """
         widget = self._widgetDict.get(key, None)
         if widget is not None:
+            if key in self._lazyPages:
+                widget = self._buildPage(key)
             return widget
         else:
             raise KeyError(f"StackedWidget has no widget '{key}'")
@@ -35,7 +98,12 @@ class StackedWidget(QStackedWidget):
 
     @property
     def widgetDict(self) -> dict:
-        """Return dictionary of keys and widgets"""
+        """
+        Return dictionary of keys and widgets.
+
+        Pages added with [addLazyWidget][customQObjects.widgets.StackedWidget.addLazyWidget] that
+        have not been created are represented by an empty placeholder widget.
+        """
         return self._widgetDict
 
     @property
@@ -43,6 +111,20 @@ class StackedWidget(QStackedWidget):
         """Return list of all widgets"""
         return [self.widget(idx) for idx in range(self.count())]
 
+    @property
+    def maxInactivePages(self):
+        """
+        Maximum number of pages added with
+        [addLazyWidget][customQObjects.widgets.StackedWidget.addLazyWidget] that are kept when
+        they are not current, or None if there is no limit
+        """
+        return self._maxInactivePages
+
+    @maxInactivePages.setter
+    def maxInactivePages(self, value):
+        self._maxInactivePages = value
+        self._evictPages()
+
     def addWidget(self, widget, key=None) -> int:
         """
         Add `widget` to the stack, associated with key `key`.
@@ -69,6 +151,51 @@ class StackedWidget(QStackedWidget):
         self._widgetDict[key] = widget
         return super().insertWidget(index, widget)
 
+    def addLazyWidget(self, key, factory, saveState=None, restoreState=None) -> int:
+        """
+        Add a page that will be created by calling `factory` when it is first needed.
+
+        An empty placeholder widget is added to the stack now. The page is created when it is
+        made current (e.g. with
+        [setCurrentKey][customQObjects.widgets.StackedWidget.setCurrentKey]) or requested with
+        `stack[key]`.
+
+        If [maxInactivePages][customQObjects.widgets.StackedWidget.maxInactivePages] is set and
+        the page is evicted, `saveState` is called with the page and the value it returns is
+        passed to `restoreState`, along with the new page, when the page is created again.
+
+        Parameters
+        ----------
+        key : hashable
+            Key for the page
+        factory : callable
+            Function that takes no arguments and returns the page widget
+        saveState : callable, optional
+            Function that takes the page widget and returns its state
+        restoreState : callable, optional
+            Function that takes the new page widget and the state returned by `saveState`
+
+        Returns
+        -------
+        int
+            Index of the page
+        """
+        idx = self.addWidget(QWidget(), key)
+        self._lazyPages[key] = _LazyPage(factory, saveState, restoreState)
+        if idx == self.currentIndex():
+            # first page added is made current, but isn't created until it is shown
+            self._currentLazyKey = key
+        return idx
+
+    def isBuilt(self, key) -> bool:
+        """
+        Return False if the page for `key` was added with
+        [addLazyWidget][customQObjects.widgets.StackedWidget.addLazyWidget] and has not been
+        created (or has been evicted), otherwise True.
+        """
+        page = self._lazyPages.get(key, None)
+        return page is None or page.built
+
     def removeWidget(self, widget):
         """
         Remove `widget` from stack.
@@ -76,9 +203,15 @@ class StackedWidget(QStackedWidget):
         `widget` can be a [QWidget](https://doc.qt.io/qt-6/qwidget.html) instance or a key.
         """
         if widget in self._widgetDict:
-            widget = self._widgetDict[widget]
+            key = widget
+        else:
+            key = self.keyOf(widget)
+        widget = self._widgetDict.pop(key)
+        self._lazyPages.pop(key, None)
+        self._inactivePages.pop(key, None)
+        if key == self._currentLazyKey:
+            self._currentLazyKey = None
         super().removeWidget(widget)
-        del self._widgetDict[widget]
 
     def keyOf(self, widget):
         """Return key associated with `widget`."""
@@ -89,4 +222,283 @@ class StackedWidget(QStackedWidget):
 
     def setCurrentKey(self, key):
         """Set current widget to that identified by `key`"""
+        start = time.perf_counter()
+        cold = not self.isBuilt(key)
+        if key in self._lazyPages:
+            self._buildPage(key, current=True)
         self.setCurrentWidget(self._widgetDict[key])
+        self._recordSwitch(key, start, cold)
+
+    def setCurrentIndex(self, idx):
+        """Set current widget to that at index `idx`, creating it if necessary"""
+        start = time.perf_counter()
+        key = self.keyOf(self.widget(idx))
+        cold = not self.isBuilt(key)
+        if key in self._lazyPages:
+            self._buildPage(key, current=True)
+        super().setCurrentIndex(idx)
+        self._recordSwitch(key, start, cold)
+
+    def _recordSwitch(self, key, start, cold):
+        """Record time taken to switch to page `key`, which was started at `start`"""
+        ms = (time.perf_counter() - start) * 1000
+        self._switchLatencies.append((key, ms, cold, key in self._prewarmed))
+        self._prewarmed.discard(key)
+
+    @property
+    def switchLatencies(self) -> list:
+        """
+        List of (key, milliseconds, cold, prewarmed) for the last 1000 calls to
+        [setCurrentKey][customQObjects.widgets.StackedWidget.setCurrentKey] or
+        `setCurrentIndex`.
+
+        The time includes creating the page, if necessary, and showing it, which polishes
+        and lays it out if the stack is visible. `cold` is True if the page had to be created
+        and `prewarmed` is True if it had been prepared by
+        [setPrewarm][customQObjects.widgets.StackedWidget.setPrewarm].
+        """
+        return list(self._switchLatencies)
+
+    def switchMetrics(self) -> dict:
+        """
+        Return dict summarising
+        [switchLatencies][customQObjects.widgets.StackedWidget.switchLatencies]: 'count',
+        'meanMs', 'maxMs', 'coldCount' and 'prewarmedCount'
+        """
+        times = [ms for _, ms, _, _ in self._switchLatencies]
+        return {
+            "count": len(times),
+            "meanMs": sum(times) / len(times) if len(times) > 0 else 0.0,
+            "maxMs": max(times, default=0.0),
+            "coldCount": sum(1 for _, _, cold, _ in self._switchLatencies if cold),
+            "prewarmedCount": sum(1 for *_, prewarmed in self._switchLatencies if prewarmed),
+        }
+
+    def resetSwitchMetrics(self):
+        """Clear [switchLatencies][customQObjects.widgets.StackedWidget.switchLatencies]"""
+        self._switchLatencies.clear()
+
+    def setPrewarm(self, strategy="neighbours", keys=None, count=2, timeBudgetMs=8, delayMs=200):
+        """
+        Prepare pages that are likely to be shown next while the event loop is idle.
+
+        After the current page changes and no input has been received for `delayMs`, up to
+        `count` candidate pages are created (if they were added with
+        [addLazyWidget][customQObjects.widgets.StackedWidget.addLazyWidget]), polished and laid
+        out. This is done in steps from a timer, each lasting about `timeBudgetMs`. If a key,
+        mouse button, wheel or touch event arrives, the remaining steps wait until there has
+        been no input for `delayMs` again.
+
+        Parameters
+        ----------
+        strategy : {'neighbours', 'priority', 'frequent', None}
+            How to choose the candidate pages. 'neighbours' prepares the pages either side of
+            the current one, nearest first. 'priority' prepares pages in the order of `keys`.
+            'frequent' prepares the pages that have been made current most often.
+            If None, stop preparing pages.
+        keys : list, optional
+            Keys of pages in order of priority, for the 'priority' strategy
+        count : int, optional
+            Number of pages to prepare after each page change. Default is 2. If
+            [maxInactivePages][customQObjects.widgets.StackedWidget.maxInactivePages] is set,
+            no more than that many are prepared.
+        timeBudgetMs : int, optional
+            Time (in milliseconds) to spend in each step. Default is 8.
+        delayMs : int, optional
+            Time (in milliseconds) to wait after a page change or input before preparing
+            pages. Default is 200.
+        """
+        if strategy not in ["neighbours", "priority", "frequent", None]:
+            msg = "Prewarm strategy should be 'neighbours', 'priority', 'frequent' or None, "
+            msg += f"not '{strategy}'"
+            raise ValueError(msg)
+        if strategy == "priority" and keys is None:
+            raise ValueError("'priority' prewarm strategy requires list of keys")
+        self._prewarmStrategy = strategy
+        self._prewarmKeys = [] if keys is None else list(keys)
+        self._prewarmCount = count
+        self._prewarmTimeBudgetMs = timeBudgetMs
+        self._prewarmDelayMs = delayMs
+        if strategy is None:
+            self._stopPrewarm()
+        else:
+            self._schedulePrewarm()
+
+    def isPrewarming(self) -> bool:
+        """Return True if there are pages waiting to be prepared"""
+        return self._prewarmSteps is not None
+
+    def _prewarmCandidates(self) -> list:
+        """Return keys of pages to prepare, most likely first"""
+        currentKey = self.keyOf(self.currentWidget())
+        if self._prewarmStrategy == "neighbours":
+            idx = self.currentIndex()
+            keys = []
+            for offset in range(1, self.count()):
+                for neighbour in [idx + offset, idx - offset]:
+                    if 0 <= neighbour < self.count():
+                        keys.append(self.keyOf(self.widget(neighbour)))
+        elif self._prewarmStrategy == "priority":
+            keys = self._prewarmKeys
+        else:
+            keys = [key for key, _ in self._visitCounts.most_common()]
+        count = self._prewarmCount
+        if self._maxInactivePages is not None:
+            count = min(count, self._maxInactivePages)
+        keys = [key for key in keys if key != currentKey and key in self._widgetDict]
+        return keys[:count]
+
+    def _prewarmPages(self):
+        """Generator that prepares the candidate pages, yielding after each step"""
+        for key in self._prewarmCandidates():
+            if key not in self._widgetDict:
+                # removed since the generator started
+                continue
+            # don't evict the page while it is being prepared
+            self._prewarmKey = key
+            if key in self._lazyPages:
+                widget = self._buildPage(key)
+                yield
+            else:
+                widget = self._widgetDict[key]
+            widget.ensurePolished()
+            for num, child in enumerate(widget.findChildren(QWidget), start=1):
+                child.ensurePolished()
+                if num % 32 == 0:
+                    yield
+            layout = widget.layout()
+            if layout is not None:
+                layout.activate()
+            self._prewarmed.add(key)
+            self._prewarmKey = None
+            yield
+
+    def _schedulePrewarm(self):
+        """Start preparing pages once the event loop has been idle for the prewarm delay"""
+        if self._prewarmStrategy is None:
+            return
+        if self._prewarmSteps is None:
+            QApplication.instance().installEventFilter(self)
+        self._prewarmSteps = self._prewarmPages()
+        self._prewarmKey = None
+        self._prewarmTimer.start(self._prewarmDelayMs)
+
+    def _stopPrewarm(self):
+        if self._prewarmSteps is not None:
+            QApplication.instance().removeEventFilter(self)
+            self._prewarmSteps = None
+        self._prewarmKey = None
+        self._prewarmTimer.stop()
+
+    def _prewarmStep(self):
+        """Run prewarm steps until the time budget is used up"""
+        if self._prewarmSteps is None:
+            return
+        deadline = time.perf_counter() + self._prewarmTimeBudgetMs / 1000
+        for _ in self._prewarmSteps:
+            if time.perf_counter() >= deadline:
+                self._prewarmTimer.start(0)
+                return
+        self._stopPrewarm()
+
+    def eventFilter(self, obj, event):
+        """Postpone preparing pages when there is user input"""
+        if self._prewarmSteps is not None and event.type() in _inputEvents:
+            self._prewarmTimer.start(self._prewarmDelayMs)
+        return super().eventFilter(obj, event)
+
+    def showEvent(self, event):
+        """Create the current page, if necessary"""
+        if self._currentLazyKey is not None:
+            self._buildPage(self._currentLazyKey)
+        super().showEvent(event)
+
+    def _buildPage(self, key, current=False) -> QWidget:
+        """
+        Create the lazy page for `key`, if necessary, and return it.
+
+        If `current` is True, the page is about to be made current, so it is not added to the
+        inactive pages.
+        """
+        page = self._lazyPages[key]
+        if page.built:
+            return self._widgetDict[key]
+        widget = page.factory()
+        if page.state is not None and page.restoreState is not None:
+            page.restoreState(widget, page.state)
+        page.state = None
+        page.built = True
+        self._replacePage(key, widget)
+        if not current and key != self._currentLazyKey:
+            # the page is about to be returned, so don't evict it now
+            self._setInactive(key, keep=key)
+        return widget
+
+    def _replacePage(self, key, widget):
+        """Put `widget` in place of the page for `key`, without changing the current index"""
+        old = self._widgetDict[key]
+        idx = self.indexOf(old)
+        wasCurrent = self.currentWidget() is old
+        blocked = self.blockSignals(True)
+        try:
+            super().insertWidget(idx, widget)
+            if wasCurrent:
+                super().setCurrentWidget(widget)
+            super().removeWidget(old)
+        finally:
+            self.blockSignals(blocked)
+        self._widgetDict[key] = widget
+        return old
+
+    def _pageChanged(self, idx):
+        """Create the new current page if necessary and evict inactive pages"""
+        key = self.keyOf(self.widget(idx)) if idx >= 0 else None
+        # the new page isn't inactive, so make sure it isn't evicted for the previous page
+        self._inactivePages.pop(key, None)
+        if self._currentLazyKey is not None:
+            self._setInactive(self._currentLazyKey)
+        if key in self._lazyPages:
+            self._currentLazyKey = key
+            self._buildPage(key)
+        else:
+            self._currentLazyKey = None
+        self._evictPages()
+        if key is not None:
+            self._visitCounts[key] += 1
+        self._schedulePrewarm()
+
+    def _setInactive(self, key, keep=None):
+        """
+        Mark built lazy page `key` as the most recently used inactive page, then evict pages,
+        apart from `keep`
+        """
+        if not self._lazyPages[key].built:
+            # e.g. first page, made current when added but never shown
+            return
+        self._inactivePages[key] = None
+        self._inactivePages.move_to_end(key)
+        self._evictPages(keep)
+
+    def _evictPages(self, keep=None):
+        """
+        Delete least recently used inactive pages, until there are no more than the maximum.
+
+        Page `keep` and any page being prewarmed are not deleted, even if that leaves more than
+        the maximum.
+        """
+        if self._maxInactivePages is None:
+            return
+        protected = {keep, self._prewarmKey}
+        while len(self._inactivePages) > self._maxInactivePages:
+            key = next((key for key in self._inactivePages if key not in protected), None)
+            if key is None:
+                break
+            del self._inactivePages[key]
+            page = self._lazyPages[key]
+            widget = self._widgetDict[key]
+            if page.saveState is not None:
+                page.state = page.saveState(widget)
+            page.built = False
+            self._prewarmed.discard(key)
+            self._replacePage(key, QWidget())
+            widget.deleteLater()
@@ -2,43 +2,433 @@
 # -*- coding: utf-8 -*-
 """
 QTableWidget with convenience methods for adding a whole row at a time etc.
+
+Also provides [TableModel][customQObjects.widgets.TableModel] and
+[TableView][customQObjects.widgets.TableView], which have the same API as
+[TableWidget][customQObjects.widgets.TableWidget] but store the data in columns,
+rather than creating a QTableWidgetItem for every cell.
+
+[SqliteTableModel][customQObjects.widgets.SqliteTableModel] and
+[SqliteTableView][customQObjects.widgets.SqliteTableView] show a table from an SQLite database,
+loading rows in pages as they are needed.
 """
-from qtpy.QtWidgets import QTableWidget, QTableWidgetItem, QHeaderView
+from bisect import bisect_left
+from collections import OrderedDict
+from contextlib import contextmanager
+import csv
+from datetime import date, datetime
+from itertools import islice
+import json
+import math
+import mmap
+import os
+import random
+import re
+import sqlite3
+import struct
+import time
+import zlib
+from qtpy import QT_VERSION
+from qtpy.QtWidgets import (
+    QAbstractItemView,
+    QTableWidget,
+    QTableWidgetItem,
+    QTableWidgetSelectionRange,
+    QTableView,
+    QHeaderView,
+    QStyle,
+    QStyledItemDelegate,
+    QStyleOptionViewItem,
+)
+from qtpy.QtCore import (
+    QAbstractProxyModel,
+    QAbstractTableModel,
+    QByteArray,
+    QItemSelection,
+    QItemSelectionModel,
+    QMimeData,
+    QModelIndex,
+    QTimer,
+    Qt,
+    Signal,
+)
+from qtpy.QtGui import QFontMetrics, QPalette
 from ..gui import makeBrush
 
 
-class TableWidget(QTableWidget):
+class FormatRule(object):
+    """
+    Conditional formatting rule, for use with
+    [addFormatRule][customQObjects.widgets.TableWidget.addFormatRule].
 
-    def __init__(self, horizontalHeader=None, verticalHeader=None, resizeMode=None):
-        super().__init__()
+    The result of `condition` is cached for each value, so it is only called once for each
+    distinct value in the column. If the condition is changed by setting
+    [condition][customQObjects.widgets.FormatRule.condition], the cache is cleared.
 
-        if horizontalHeader is not None:
-            self.setColumnCount(len(horizontalHeader))
-            self.setHorizontalHeaderLabels(horizontalHeader)
+    Parameters
+    ----------
+    column : int
+        Index of column whose values are tested
+    condition : callable
+        Function that takes the cell text and returns True if the formatting should be applied.
+        If it raises a TypeError or ValueError (e.g. when converting text to a number), this is
+        treated as False.
+    foreground : {QBrush, QColor, str}, optional
+        Foreground to use when `condition` is True
+    background : {QBrush, QColor, str}, optional
+        Background to use when `condition` is True
+    font : QFont, optional
+        Font to use when `condition` is True
+    wholeRow : bool, optional
+        If True, format every cell in the row, rather than just the cell in `column`.
+        Default is False.
 
-        if verticalHeader is not None:
-            self.setVerticalHeaderLabels(verticalHeader)
+    A foreground, background or font set on an item itself (e.g. with
+    [QTableWidgetItem.setForeground](https://doc.qt.io/qt-6/qtablewidgetitem.html#setForeground))
+    takes precedence over the rule's, whether or not another item delegate has been set.
+    """
 
-        if resizeMode is not None:
-            self.setResizeMode(resizeMode)
+    maxCacheSize = 65536
+    """Maximum number of results to cache before the cache is cleared"""
 
-        self._header = horizontalHeader
+    def __init__(
+        self, column, condition, foreground=None, background=None, font=None, wholeRow=False
+    ):
+        self.column = column
+        self.foreground = makeBrush(foreground) if foreground is not None else None
+        self.background = makeBrush(background) if background is not None else None
+        self.font = font
+        self.wholeRow = wholeRow
+        self._condition = condition
+        self._results = {}
 
     @property
-    def columnCount(self):
-        return super().columnCount()
+    def condition(self):
+        """Function that takes the cell text and returns True if the formatting should be applied"""
+        return self._condition
 
-    @property
-    def rowCount(self):
-        return super().rowCount()
+    @condition.setter
+    def condition(self, condition):
+        self._condition = condition
+        self._results.clear()
+
+    def matches(self, value) -> bool:
+        """Return True if `condition` is True for `value`"""
+        result = self._results.get(value, None)
+        if result is None:
+            try:
+                result = bool(self._condition(value))
+            except (TypeError, ValueError):
+                result = False
+            if len(self._results) >= self.maxCacheSize:
+                self._results.clear()
+            self._results[value] = result
+        return result
+
+
+def _sampleRows(first, last, size):
+    """
+    Return up to `size` row numbers from `first` to `last` (inclusive): the first and last
+    thirds of `size` rows and a random sample of the rows in between.
+    """
+    count = last - first + 1
+    if count <= size:
+        return range(first, last + 1)
+    third = size // 3
+    rows = list(range(first, first + third))
+    rows += random.sample(range(first + third, last - third + 1), size - 2 * third)
+    rows += range(last - third + 1, last + 1)
+    return rows
+
+
+class _TextWidthCache(object):
+    """
+    Cache of text widths, with a QFontMetrics for each font.
+
+    If there are more than `maxSize` widths for a font, they are cleared.
+    """
+
+    maxSize = 65536
+
+    def __init__(self):
+        self._fonts = {}
+
+    def width(self, font, text) -> int:
+        """Return width of `text` in `font`"""
+        key = font.key()
+        entry = self._fonts.get(key, None)
+        if entry is None:
+            entry = (QFontMetrics(font), {})
+            self._fonts[key] = entry
+        metrics, widths = entry
+        width = widths.get(text, None)
+        if width is None:
+            if len(widths) >= self.maxSize:
+                widths.clear()
+            width = metrics.horizontalAdvance(text)
+            widths[text] = width
+        return width
+
+
+_textWidths = _TextWidthCache()
+
+
+def _forwardToDelegate(name):
+    """
+    Return method that calls `name` on a _FormatDelegate's own delegate, or on
+    QStyledItemDelegate if it doesn't have one
+    """
+
+    def forward(self, *args):
+        if self._delegate is None:
+            return getattr(QStyledItemDelegate, name)(self, *args)
+        return getattr(self._delegate, name)(*args)
+
+    forward.__name__ = name
+    return forward
+
+
+class _FormatDelegate(QStyledItemDelegate):
+    """
+    Delegate that applies a table's format rules and bands when items are painted.
+
+    If the table has a delegate of its own, e.g. an
+    [ElideDelegate][customQObjects.widgets.ElideDelegate], painting and editing are passed on
+    to it. The format's background is painted first and its foreground and font are set on the
+    style option given to the delegate.
+
+    In both cases, colours or a font set on an item itself take precedence over the formatting,
+    as a delegate applies the item's own data to the style option after it is given it.
+    """
+
+    _delegateSignals = ["commitData", "closeEditor", "sizeHintChanged"]
+
+    def __init__(self, table, delegate=None):
+        super().__init__(table)
+        self._table = table
+        self._delegate = None
+        self.setDelegate(delegate)
+
+    def delegate(self):
+        """Return the delegate that items are painted and edited with, or None"""
+        return self._delegate
+
+    def setDelegate(self, delegate):
+        """Set `delegate` to paint and edit items with, or None to use QStyledItemDelegate"""
+        if self._delegate is not None:
+            for name in self._delegateSignals:
+                getattr(self._delegate, name).disconnect(getattr(self, name))
+        self._delegate = delegate
+        if delegate is not None:
+            # the view is only connected to this delegate's signals
+            for name in self._delegateSignals:
+                getattr(delegate, name).connect(getattr(self, name))
+
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        foreground, background, font = self._table._cellStyle(index)
+        # as with a delegate of the table's own, the item's data takes precedence
+        if foreground is not None and index.data(Qt.ForegroundRole) is None:
+            option.palette.setBrush(QPalette.Text, foreground)
+        if background is not None and index.data(Qt.BackgroundRole) is None:
+            option.backgroundBrush = background
+        if font is not None:
+            # only the attributes set on the item's font take precedence, as in
+            # QStyledItemDelegate.initStyleOption
+            itemFont = index.data(Qt.FontRole)
+            option.font = font if itemFont is None else itemFont.resolve(font)
+
+    def paint(self, painter, option, index):
+        if self._delegate is None:
+            super().paint(painter, option, index)
+            return
+        foreground, background, font = self._table._cellStyle(index)
+        option = QStyleOptionViewItem(option)
+        if background is not None:
+            painter.fillRect(option.rect, background)
+        if foreground is not None:
+            option.palette.setBrush(QPalette.Text, foreground)
+        if font is not None:
+            option.font = font
+        self._delegate.paint(painter, option, index)
+
+    sizeHint = _forwardToDelegate("sizeHint")
+    createEditor = _forwardToDelegate("createEditor")
+    setEditorData = _forwardToDelegate("setEditorData")
+    setModelData = _forwardToDelegate("setModelData")
+    updateEditorGeometry = _forwardToDelegate("updateEditorGeometry")
+    destroyEditor = _forwardToDelegate("destroyEditor")
+    editorEvent = _forwardToDelegate("editorEvent")
+    helpEvent = _forwardToDelegate("helpEvent")
+
+
+class _TableMixin(object):
+    """Methods shared by [TableWidget][customQObjects.widgets.TableWidget],
+    [TableView][customQObjects.widgets.TableView] and
+    [SqliteTableView][customQObjects.widgets.SqliteTableView]"""
+
+    _formatDelegate = None
 
     @property
     def header(self):
         return self._header
 
-    def clearTable(self):
-        for idx in reversed(range(self.rowCount)):
-            self.removeRow(idx)
+    def _initFormatting(self):
+        """Create format rule state and install delegate, if not already done"""
+        if self._formatDelegate is not None:
+            return
+        self._formatRules = []
+        self._bands = None
+        self._bandSize = 1
+        self._styleCache = {}
+        # keep any delegate that has been set, e.g. an ElideDelegate, rather than replacing it
+        delegate = super().itemDelegate()
+        if type(delegate) is QStyledItemDelegate:
+            delegate = None
+        self._formatDelegate = _FormatDelegate(self, delegate)
+        super().setItemDelegate(self._formatDelegate)
+
+    def setItemDelegate(self, delegate):
+        """
+        Set the item delegate for the table.
+
+        If formatting has been set, with
+        [addFormatRule][customQObjects.widgets.TableWidget.addFormatRule] or
+        [setBanding][customQObjects.widgets.TableWidget.setBanding], the formatting is applied
+        to the items that `delegate` paints.
+        """
+        if self._formatDelegate is None:
+            super().setItemDelegate(delegate)
+        else:
+            self._formatDelegate.setDelegate(delegate)
+
+    def itemDelegate(self, *args):
+        """
+        Return the item delegate set with
+        [setItemDelegate][customQObjects.widgets.TableWidget.setItemDelegate]
+        """
+        delegate = super().itemDelegate(*args)
+        if delegate is not None and delegate is self._formatDelegate:
+            if (inner := delegate.delegate()) is not None:
+                return inner
+        return delegate
+
+    @property
+    def formatRules(self) -> list:
+        """List of [FormatRules][customQObjects.widgets.FormatRule]"""
+        if self._formatDelegate is None:
+            return []
+        return list(self._formatRules)
+
+    def addFormatRule(
+        self, columnName, condition, foreground=None, background=None, font=None, wholeRow=False
+    ) -> FormatRule:
+        """
+        Add conditional formatting rule.
+
+        The rules are applied by an item delegate when cells are painted, so the formatting is not
+        stored on the items and changing a rule does not require the table to be rebuilt.
+        Where more than one rule applies to a cell, later rules take precedence.
+        If an item delegate has been set, e.g. an
+        [ElideDelegate][customQObjects.widgets.ElideDelegate], it is kept and the formatting is
+        applied to the items it paints.
+
+        For example, to show negative values in red:
+        `table.addFormatRule("change", lambda v: float(v) < 0, foreground="red")`
+
+        See [FormatRule][customQObjects.widgets.FormatRule] for args; `columnName` is the name
+        of the column whose values are tested.
+
+        Returns the [FormatRule][customQObjects.widgets.FormatRule]. If its condition is
+        changed, call [updateFormatting][customQObjects.widgets.TableWidget.updateFormatting].
+        """
+        self._initFormatting()
+        column = self.header.index(columnName)
+        rule = FormatRule(column, condition, foreground, background, font, wholeRow)
+        self._formatRules.append(rule)
+        self.updateFormatting()
+        return rule
+
+    def removeFormatRule(self, rule: FormatRule):
+        """Remove `rule`"""
+        if self._formatDelegate is None:
+            return
+        self._formatRules.remove(rule)
+        self.updateFormatting()
+
+    def clearFormatRules(self):
+        """Remove all format rules"""
+        if self._formatDelegate is None:
+            return
+        self._formatRules.clear()
+        self.updateFormatting()
+
+    def setBanding(self, colors, size=1):
+        """
+        Set background colors for alternating bands of rows.
+
+        Parameters
+        ----------
+        colors : list, optional
+            List of [QBrush](https://doc.qt.io/qt-6/qbrush.html),
+            [QColor](https://doc.qt.io/qt-6/qcolor.html) or any valid QColor arg. These are
+            used in turn for each band. If None, remove banding.
+        size : int, optional
+            Number of rows in each band. Default is 1.
+        """
+        self._initFormatting()
+        self._bands = [makeBrush(color) for color in colors] if colors else None
+        self._bandSize = size
+        self.updateFormatting()
+
+    def updateFormatting(self):
+        """Clear cached formatting and repaint, e.g. after changing a rule's condition"""
+        if self._formatDelegate is None:
+            return
+        self._styleCache.clear()
+        self.viewport().update()
+
+    def _cellStyle(self, index):
+        """Return tuple of foreground, background and font for the cell at `index`"""
+        row = index.row()
+        col = index.column()
+        matched = []
+        for idx, rule in enumerate(self._formatRules):
+            if rule.column == col:
+                value = index.data()
+            elif rule.wholeRow:
+                value = index.sibling(row, rule.column).data()
+            else:
+                continue
+            if rule.matches(value):
+                matched.append(idx)
+        band = None
+        if self._bands is not None:
+            band = (row // self._bandSize) % len(self._bands)
+
+        key = (tuple(matched), band)
+        style = self._styleCache.get(key, None)
+        if style is None:
+            foreground = None
+            background = None if band is None else self._bands[band]
+            font = None
+            for idx in matched:
+                rule = self._formatRules[idx]
+                foreground = rule.foreground if rule.foreground is not None else foreground
+                background = rule.background if rule.background is not None else background
+                font = rule.font if rule.font is not None else font
+            style = (foreground, background, font)
+            self._styleCache[key] = style
+        return style
+
+    def _formatRow(self, values, returnType):
+        """Return `values` as list or, if `returnType` is 'dict', dict with header as keys"""
+        if returnType == "dict":
+            if self.header is None or len(self.header) != len(values):
+                msg = "Cannot return row data as dict when horizontal header items are None"
+                raise ValueError(msg)
+            return dict(zip(self.header, values))
+        return values
 
     def _parseRowKwargs(self, **kwargs):
         names = [
@@ -79,99 +469,6 @@ class TableWidget(QTableWidget):
             raise ValueError(msg)
         return value
 
-    def addRow(self, row: list, **kwargs):
-        """
-        Add row to table
-
-        Parameters
-        ----------
-        row : list, tuple
-            Sequence of strings or (icon,string) pairs from which to construct
-            [QTableWidgetItems](https://doc.qt.io/qt-6/qtablewidgetitem.html)
-        kwargs
-            Any QTableWidgetItem setter can be passed here, e.g. `toolTip='this is the tool tip'`
-            will call `setToolTip('this is the tool tip')` after creating the item.
-            `background` and `foreground` can be passed with a
-            [QBrush](https://doc.qt.io/qt-6/qbrush.html),
-            [QColor](https://doc.qt.io/qt-6/qcolor.html) or any valid QColor arg.
-        """
-        kwargs = self._parseRowKwargs(**kwargs)
-        rowNum = self.rowCount
-        self.insertRow(rowNum)
-        for col, arg in enumerate(row):
-            if isinstance(arg, (tuple, list)):
-                item = QTableWidgetItem(*arg)
-            else:
-                item = QTableWidgetItem(arg)
-            for name, values in kwargs.items():
-                # call setters with corresponding value
-                name = name[0].upper() + name[1:]
-                func = getattr(item, f"set{name}")
-                func(values[col])
-
-            self.setItem(rowNum, col, item)
-
-    def updateRow(self, idx: int, row: list, **kwargs):
-        """
-        Update data in row number `idx`
-
-        Parameters
-        ----------
-        idx : int
-            Index of row to update
-        row : list, tuple
-            Sequence of strings or (icon,string) pairs from which to construct
-            [QTableWidgetItems](https://doc.qt.io/qt-6/qtablewidgetitem.html)
-        kwargs
-            Any QTableWidgetItem setter can be passed here, e.g. `toolTip='this is the tool tip'`
-            will call `setToolTip('this is the tool tip')` on the item.
-            `background` and `foreground` can be passed with a
-            [QBrush](https://doc.qt.io/qt-6/qbrush.html),
-            [QColor](https://doc.qt.io/qt-6/qcolor.html) or any valid QColor arg.
-        """
-        for col in self.columnCount:
-            item = self.item(idx, col)
-            # update text and icon
-            if isinstance(row[col], (tuple, list)):
-                icon, text = row[col]
-                item.setIcon(icon)
-            else:
-                text = row[col]
-            item.setText(text)
-            # update any other properties
-            for name, values in kwargs.items():
-                setattr(item, f"set{name.title()}", values[col])
-
-    def rowData(self, idx, returnType="dict"):
-        row = [self.item(idx, col).text() for col in range(self.colCount)]
-        if returnType == "dict":
-            if len(self.header) != len(row):
-                msg = "Cannot return row data as dict when horizontal header items are None"
-                raise Exception(msg)
-            row = dict(zip(self.header, row))
-        return row
-
-    def columnData(self, name):
-        idx = self.header.index(name)
-        column = [self.item(row, idx) for row in range(self.rowCount)]
-        return column
-
-    def rowWhere(self, columnName, value, returnType="dict"):
-        values = []
-        col = self.header.index(columnName)
-        for row in range(self.rowCount):
-            if self.item(row, col).text() == value:
-                values = [self.item(row, idx).text() for idx in range(self.colCount)]
-                break
-        if returnType == "dict":
-            if len(self.header) != len(values):
-                msg = (
-                    "Cannot return row data as dict when horizontal header items or values are None"
-                )
-                raise ValueError(msg)
-            row = dict(zip(self.header, values))
-        return values
-
     def setResizeMode(self, mode):
         """
         Set resize mode for horizontal header
@@ -184,10 +481,17 @@ class TableWidget(QTableWidget):
             [QHeaderView.ResizeMode](https://doc.qt.io/qt-6/qheaderview.html#ResizeMode-enum)
             or corresponding string 'Interactive', 'Fixed', 'Stretch', 'ResizeToContents'
             (strings are not case sensitive).
+
+            'Sampled' is like 'ResizeToContents', but the width is estimated from the header
+            and a sample of rows, rather than by measuring every cell. When rows are added or
+            changed, only a sample of those rows is measured and the column is widened if
+            necessary. This is done after control returns to the event loop and limited to
+            [resizeTimeBudgetMs][customQObjects.widgets.TableWidget.resizeTimeBudgetMs] each
+            time. The columns can also be resized by the user.
         """
         error_msg = (
             "TableWidget resizeMode should be 'Interactive', 'Fixed', "
-            f"'Stretch' or 'ResizeToContents', not '{mode}'"
+            f"'Stretch', 'ResizeToContents' or 'Sampled', not '{mode}'"
         )
 
         modes = {
@@ -195,6 +499,7 @@ class TableWidget(QTableWidget):
             "fixed": QHeaderView.Fixed,
             "stretch": QHeaderView.Stretch,
             "resizetocontents": QHeaderView.ResizeToContents,
+            "sampled": "sampled",
         }
         if isinstance(mode, str):
             mode = modes.get(mode.lower(), None)
@@ -208,5 +513,3004 @@ class TableWidget(QTableWidget):
                     raise ValueError(error_msg)
 
         mode = self._makeRowArgs(mode)
+        sampled = []
         for idx, m in enumerate(mode):
+            if m == "sampled":
+                sampled.append(idx)
+                m = QHeaderView.Interactive
             self.horizontalHeader().setSectionResizeMode(idx, m)
+        self._setSampledColumns(sampled)
+
+    resizeSampleSize = 120
+    """
+    Maximum number of rows measured for each column with the 'Sampled'
+    [resize mode][customQObjects.widgets.TableWidget.setResizeMode]: the first and last third of
+    these and a random sample of the rest.
+    """
+
+    resizeTimeBudgetMs = 10
+    """
+    Maximum time (in milliseconds) to spend measuring columns with the 'Sampled'
+    [resize mode][customQObjects.widgets.TableWidget.setResizeMode], before returning to the
+    event loop
+    """
+
+    _resizeTimer = None
+
+    def _setSampledColumns(self, columns):
+        """Set list of columns with the 'Sampled' resize mode and schedule measuring them"""
+        if self._resizeTimer is None:
+            if len(columns) == 0:
+                return
+            self._resizeTimer = QTimer(self)
+            self._resizeTimer.setSingleShot(True)
+            self._resizeTimer.setInterval(0)
+            self._resizeTimer.timeout.connect(self._resizeSampledColumns)
+            model = self.model()
+            model.rowsInserted.connect(self._sampledRowsChanged)
+            model.dataChanged.connect(self._sampledDataChanged)
+            model.modelReset.connect(self._sampledReset)
+            model.layoutChanged.connect(self._sampledReset)
+            self.horizontalHeader().sectionCountChanged.connect(self._sampledReset)
+        self._sampledColumns = set(columns)
+        self._resizePending = {}
+        self._sampledReset()
+
+    def _sampledReset(self, *args):
+        """Schedule measuring all rows of all sampled columns"""
+        for col in self._sampledColumns:
+            self._resizePending[col] = None
+        if len(self._resizePending) > 0:
+            self._resizeTimer.start()
+
+    def _sampledRowsChanged(self, parent, first, last):
+        """Schedule measuring rows `first` to `last` of all sampled columns"""
+        self._sampledRangeChanged(self._sampledColumns, first, last)
+
+    def _sampledDataChanged(self, topLeft, bottomRight, roles=[]):
+        columns = range(topLeft.column(), bottomRight.column() + 1)
+        columns = [col for col in columns if col in self._sampledColumns]
+        self._sampledRangeChanged(columns, topLeft.row(), bottomRight.row())
+
+    def _sampledRangeChanged(self, columns, first, last):
+        for col in columns:
+            if col in self._resizePending and self._resizePending[col] is None:
+                # already measuring all rows
+                continue
+            self._resizePending.setdefault(col, []).append((first, last))
+        if len(self._resizePending) > 0:
+            self._resizeTimer.start()
+
+    def _resizeSampledColumns(self):
+        """Measure pending columns, until the time budget is used up"""
+        deadline = time.perf_counter() + self.resizeTimeBudgetMs / 1000
+        header = self.horizontalHeader()
+        while len(self._resizePending) > 0:
+            col = next(iter(self._resizePending))
+            ranges = self._resizePending.pop(col)
+            if col >= header.count():
+                continue
+            if ranges is None:
+                width = self._sampledWidth(col, 0, self.rowCount - 1)
+                width = max(width, header.sectionSizeHint(col))
+            else:
+                width = header.sectionSize(col)
+                for first, last in ranges:
+                    width = max(width, self._sampledWidth(col, first, last))
+            if width != header.sectionSize(col):
+                header.resizeSection(col, width)
+            if time.perf_counter() >= deadline:
+                break
+        if len(self._resizePending) > 0:
+            self._resizeTimer.start()
+
+    def _sampledWidth(self, col, first, last) -> int:
+        """Return width needed for a sample of rows `first` to `last` of column `col`"""
+        if last < first:
+            return 0
+        model = self.model()
+        defaultFont = self.font()
+        margin = 2 * (self.style().pixelMetric(QStyle.PM_FocusFrameHMargin, None, self) + 1)
+        iconWidth = self.iconSize().width() if self.iconSize().isValid() else 0
+        width = 0
+        for row in _sampleRows(first, last, self.resizeSampleSize):
+            index = model.index(row, col)
+            text = index.data()
+            if text is None:
+                continue
+            font = index.data(Qt.FontRole)
+            w = _textWidths.width(font if font is not None else defaultFont, str(text))
+            if index.data(Qt.DecorationRole) is not None:
+                w += max(iconWidth, self.style().pixelMetric(QStyle.PM_SmallIconSize)) + margin
+            width = max(width, w + margin)
+        return width
+
+
+def _longestIncreasingSubsequence(values: list) -> list:
+    """Return a longest strictly increasing subsequence of `values`"""
+    tails = []
+    tailIndices = []
+    previous = [-1] * len(values)
+    for idx, value in enumerate(values):
+        pos = bisect_left(tails, value)
+        if pos == len(tails):
+            tails.append(value)
+            tailIndices.append(idx)
+        else:
+            tails[pos] = value
+            tailIndices[pos] = idx
+        previous[idx] = tailIndices[pos - 1] if pos > 0 else -1
+    result = []
+    idx = tailIndices[-1] if len(tailIndices) > 0 else -1
+    while idx >= 0:
+        result.append(values[idx])
+        idx = previous[idx]
+    return result[::-1]
+
+
+def _runs(values: list) -> list:
+    """Return list of (start, count) for each run of consecutive integers in sorted `values`"""
+    runs = []
+    for value in values:
+        if len(runs) > 0 and runs[-1][0] + runs[-1][1] == value:
+            runs[-1][1] += 1
+        else:
+            runs.append([value, 1])
+    return [tuple(run) for run in runs]
+
+
+def _textKey(value):
+    """Sort key for 'str' columns"""
+    return "" if value is None else str(value)
+
+
+_digits = re.compile(r"(\d+)")
+
+
+def _naturalKey(value):
+    """Sort key for 'natural' columns, so that e.g. 'item2' comes before 'item10'"""
+    parts = _digits.split(_textKey(value).lower())
+    parts[1::2] = map(int, parts[1::2])
+    return parts
+
+
+def _numericKey(value):
+    """Sort key for 'numeric' columns. Values that are not numbers are sorted last."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.inf
+
+
+def _dateKey(value):
+    """
+    Sort key for 'date' columns, from a date, datetime or ISO format string.
+    Values that are not dates are sorted last.
+    """
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    try:
+        return datetime.fromisoformat(str(value)).replace(tzinfo=None)
+    except ValueError:
+        return datetime.max
+
+
+_keyFunctions = {"str": _textKey, "natural": _naturalKey, "numeric": _numericKey, "date": _dateKey}
+
+
+def _keyFunction(columnType):
+    """Return sort key function for `columnType`, which can be a name or callable"""
+    if callable(columnType):
+        return columnType
+    keyFunction = _keyFunctions.get(columnType, None)
+    if keyFunction is None:
+        msg = f"Column type should be one of {list(_keyFunctions)} or callable, not '{columnType}'"
+        raise ValueError(msg)
+    return keyFunction
+
+
+def _makeSortKeys(values, columnType) -> list:
+    """Return list of sort keys for `values`"""
+    keyFunction = _keyFunction(columnType)
+    if keyFunction is _numericKey:
+        # converting the whole column at once is much faster, so try that first
+        try:
+            return list(map(float, values))
+        except (TypeError, ValueError):
+            pass
+    return list(map(keyFunction, values))
+
+
+def _insertPosition(count, keyAt, key, descending=False) -> int:
+    """
+    Return position at which to insert `key` into sorted rows, after any rows with the same key.
+
+    `keyAt(i)` should return the key of row `i` and `count` is the number of rows.
+    """
+    lo, hi = 0, count
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if (keyAt(mid) < key) if descending else (key < keyAt(mid)):
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+def _filterFunction(predicate):
+    """Return `predicate`, wrapped so that TypeError and ValueError are treated as False"""
+
+    def func(value):
+        try:
+            return bool(predicate(value))
+        except (TypeError, ValueError):
+            return False
+
+    return func
+
+
+def _filterMask(columns, predicates) -> list:
+    """
+    Return list of bools, which is True for every row where all `predicates` are True.
+
+    `columns` is a list of columns of values, one for each predicate.
+    """
+    if len(columns) == 1:
+        return list(map(predicates[0], columns[0]))
+    return [
+        all(predicate(value) for predicate, value in zip(predicates, rowValues))
+        for rowValues in zip(*columns)
+    ]
+
+
+@contextmanager
+def _openStream(pathOrStream, mode, encoding):
+    """Open `pathOrStream` if it is a path, otherwise yield the stream as it is"""
+    if isinstance(pathOrStream, (str, os.PathLike)):
+        with open(pathOrStream, mode, encoding=encoding, newline="") as stream:
+            yield stream
+    else:
+        yield pathOrStream
+
+
+def _csvDelimiter(pathOrStream, delimiter):
+    """Return `delimiter` or, if it is None, tab for .tsv and .tab files and comma otherwise"""
+    if delimiter is not None:
+        return delimiter
+    if isinstance(pathOrStream, (str, os.PathLike)):
+        ext = os.path.splitext(pathOrStream)[1].lower()
+        if ext in [".tsv", ".tab"]:
+            return "\t"
+    return ","
+
+
+def _qtMinorVersion() -> str:
+    """
+    Return major and minor version of Qt, which determine the QDataStream encoding of
+    snapshot payloads
+    """
+    return ".".join(QT_VERSION.split(".")[:2])
+
+
+_snapshotMagic = b"CQOTWSNP"
+_snapshotVersion = 1
+# magic, format version, metadata length, payload length, payload crc32
+_snapshotHeader = struct.Struct("<8sIIQI")
+
+
+def _mergeRowSpans(spans) -> list:
+    """
+    Return list of (firstRow, lastRow, firstColumn, lastColumn) rectangles covering `spans`,
+    a dict of row number and (firstColumn, lastColumn), where consecutive rows with the
+    same columns are merged.
+    """
+    rects = []
+    for row in sorted(spans):
+        firstCol, lastCol = spans[row]
+        if len(rects) > 0:
+            first, last, prevFirstCol, prevLastCol = rects[-1]
+            if last == row - 1 and prevFirstCol == firstCol and prevLastCol == lastCol:
+                rects[-1] = (first, row, firstCol, lastCol)
+                continue
+        rects.append((row, row, firstCol, lastCol))
+    return rects
+
+
+class _ColumnIndex(object):
+    """
+    Hash index of the items in a column of a [TableWidget][customQObjects.widgets.TableWidget].
+
+    Maps text to the list of items with that text. Items are stored rather than row numbers, as
+    an item's row is still correct after rows are inserted, removed or sorted.
+    QTableWidgetItems are not hashable, so the reverse mapping is keyed by `id(item)`; this is
+    safe as the index holds a reference to every item in it.
+    """
+
+    def __init__(self, unique=False):
+        self.unique = unique
+        self._items = {}
+        self._values = {}
+
+    def get(self, value) -> list:
+        """Return list of items with text `value`"""
+        return self._items.get(value, [])
+
+    def contains(self, value) -> bool:
+        return value in self._items
+
+    def set(self, item, value):
+        """Set `item`'s entry in the index to `value`"""
+        old = self._values.get(id(item), None)
+        if old == value:
+            return
+        if old is not None:
+            self._remove(item, old)
+        self._values[id(item)] = value
+        self._items.setdefault(value, []).append(item)
+
+    def discard(self, item):
+        """Remove `item` from the index, if present"""
+        value = self._values.pop(id(item), None)
+        if value is not None:
+            self._remove(item, value)
+
+    def _remove(self, item, value):
+        items = self._items[value]
+        items.remove(item)
+        if len(items) == 0:
+            del self._items[value]
+
+    def clear(self):
+        self._items.clear()
+        self._values.clear()
+
+
+class TableWidget(_TableMixin, QTableWidget):
+
+    extendProgress = Signal(int)
+    """
+    Signal emitted with the number of rows added so far, after each step of
+    [extend][customQObjects.widgets.TableWidget.extend]
+    """
+
+    extendFinished = Signal(int)
+    """
+    Signal emitted with the total number of rows added when
+    [extend][customQObjects.widgets.TableWidget.extend] finishes or is cancelled
+    """
+
+    def __init__(self, horizontalHeader=None, verticalHeader=None, resizeMode=None):
+        super().__init__()
+
+        if horizontalHeader is not None:
+            self.setColumnCount(len(horizontalHeader))
+            self.setHorizontalHeaderLabels(horizontalHeader)
+
+        if verticalHeader is not None:
+            self.setVerticalHeaderLabels(verticalHeader)
+
+        if resizeMode is not None:
+            self.setResizeMode(resizeMode)
+
+        self._header = horizontalHeader
+        self._indexes = {}
+        self.itemChanged.connect(self._updateIndexes)
+        model = self.model()
+        model.rowsAboutToBeRemoved.connect(self._rowsAboutToBeRemoved)
+        model.columnsInserted.connect(self._columnsInserted)
+        model.columnsAboutToBeRemoved.connect(self._columnsAboutToBeRemoved)
+        self._replaceCache = None
+        self._columnTypes = {}
+        self._typedSorting = False
+        self._filters = {}
+
+        self._extendIter = None
+        self._extendArgs = None
+        self._extendCount = 0
+        self._extendTimer = QTimer(self)
+        self._extendTimer.setSingleShot(True)
+        self._extendTimer.setInterval(0)
+        self._extendTimer.timeout.connect(self._extendStep)
+
+    @property
+    def columnCount(self):
+        return super().columnCount()
+
+    @property
+    def rowCount(self):
+        return super().rowCount()
+
+    def clearTable(self):
+        self.setRowCount(0)
+
+    def createColumnIndex(self, columnName, unique=False):
+        """
+        Create a hash index on column `columnName`.
+
+        The index is kept up to date when rows are added, updated or removed, when items are
+        set, taken or edited, and when columns are inserted or removed.
+        [rowWhere][customQObjects.widgets.TableWidget.rowWhere] and
+        [rowsWhere][customQObjects.widgets.TableWidget.rowsWhere] will then look up rows in this
+        column in constant time, rather than checking every row.
+
+        Parameters
+        ----------
+        columnName : str
+            Name of column to index
+        unique : bool, optional
+            If True, raise ValueError when adding or updating a row would result in duplicate
+            values in this column. Default is False.
+        """
+        col = self.header.index(columnName)
+        index = _ColumnIndex(unique=unique)
+        for row in range(self.rowCount):
+            item = self.item(row, col)
+            if item is None:
+                continue
+            text = item.text()
+            if unique and index.contains(text):
+                raise ValueError(f"Column '{columnName}' has duplicate value '{text}'")
+            index.set(item, text)
+        self._indexes[col] = index
+
+    def dropColumnIndex(self, columnName):
+        """
+        Remove index on column `columnName` created with
+        [createColumnIndex][customQObjects.widgets.TableWidget.createColumnIndex], if there is one.
+        """
+        col = self.header.index(columnName)
+        self._indexes.pop(col, None)
+
+    def _updateIndexes(self, item):
+        """Update index entry for `item`, if its column is indexed"""
+        if len(self._indexes) == 0:
+            return
+        index = self._indexes.get(item.column(), None)
+        if index is not None:
+            index.set(item, item.text())
+
+    def _unindexRows(self, first, last):
+        """Remove items in rows `first` to `last` (inclusive) from the indexes"""
+        for col, index in self._indexes.items():
+            for row in range(first, last + 1):
+                item = self.item(row, col)
+                if item is not None:
+                    index.discard(item)
+
+    def _checkUnique(self, rows, replacing=None):
+        """
+        Raise ValueError if `rows` would add duplicate values to a unique index.
+
+        If `replacing` is given, it is the row number whose values `rows` will replace.
+        """
+        for col, index in self._indexes.items():
+            if not index.unique:
+                continue
+            seen = set()
+            for row in rows:
+                value = self._itemText(row[col])
+                existing = [item.row() for item in index.get(value)]
+                if value in seen or (len(existing) > 0 and existing != [replacing]):
+                    msg = f"Column '{self.header[col]}' already has a row with value '{value}'"
+                    raise ValueError(msg)
+                seen.add(value)
+
+    def _rowsAboutToBeRemoved(self, parent, first, last):
+        """Remove items in rows that are about to be removed from the indexes"""
+        if len(self._indexes) == 0:
+            return
+        if first == 0 and last == self.rowCount - 1:
+            for index in self._indexes.values():
+                index.clear()
+        else:
+            self._unindexRows(first, last)
+
+    def _columnsInserted(self, parent, first, last):
+        """Shift column numbers of indexes, types and filters after inserted columns"""
+        self._shiftColumns(first, last - first + 1)
+
+    def _columnsAboutToBeRemoved(self, parent, first, last):
+        """Drop indexes, types and filters on removed columns and shift those after them"""
+        for columns in [self._indexes, self._columnTypes, self._filters]:
+            for col in range(first, last + 1):
+                columns.pop(col, None)
+        self._shiftColumns(last + 1, first - last - 1)
+
+    def _shiftColumns(self, first, delta):
+        """Add `delta` to column numbers >= `first` in the dicts that are keyed by column"""
+        for name in ["_indexes", "_columnTypes", "_filters"]:
+            columns = getattr(self, name)
+            if any(col >= first for col in columns):
+                shifted = {col + delta if col >= first else col: v for col, v in columns.items()}
+                setattr(self, name, shifted)
+
+    def setItem(self, row: int, column: int, item: QTableWidgetItem):
+        """Set item at `row`, `column`, replacing (and deleting) any existing item there"""
+        index = self._indexes.get(column, None)
+        if index is not None and (old := self.item(row, column)) is not None:
+            index.discard(old)
+        super().setItem(row, column, item)
+        if index is not None and item is not None:
+            index.set(item, item.text())
+
+    def takeItem(self, row: int, column: int) -> QTableWidgetItem:
+        """Remove item at `row`, `column` from the table, without deleting it, and return it"""
+        item = super().takeItem(row, column)
+        index = self._indexes.get(column, None)
+        if index is not None and item is not None:
+            index.discard(item)
+        return item
+
+    def clear(self):
+        """Remove all items, including the headers"""
+        self._discardPendingUpdates()
+        for index in self._indexes.values():
+            index.clear()
+        super().clear()
+
+    def clearContents(self):
+        """Remove all items, apart from the headers"""
+        self._discardPendingUpdates()
+        for index in self._indexes.values():
+            index.clear()
+        super().clearContents()
+
+    def addRow(self, row: list, **kwargs):
+        """
+        Add row to table
+
+        Parameters
+        ----------
+        row : list, tuple
+            Sequence of strings or (icon,string) pairs from which to construct
+            [QTableWidgetItems](https://doc.qt.io/qt-6/qtablewidgetitem.html)
+        kwargs
+            Any QTableWidgetItem setter can be passed here, e.g. `toolTip='this is the tool tip'`
+            will call `setToolTip('this is the tool tip')` after creating the item.
+            `background` and `foreground` can be passed with a
+            [QBrush](https://doc.qt.io/qt-6/qbrush.html),
+            [QColor](https://doc.qt.io/qt-6/qcolor.html) or any valid QColor arg.
+        """
+        self.insertRows(self.rowCount, [row], **kwargs)
+
+    def addRows(self, rows: list, **kwargs):
+        """
+        Add multiple rows to the end of the table
+
+        This is about 2x faster than calling
+        [addRow][customQObjects.widgets.TableWidget.addRow] for each row, or 3x if `kwargs` are
+        given. Most of the remaining time is spent creating a QTableWidgetItem for each cell, so
+        for many thousands of rows, use a [TableView][customQObjects.widgets.TableView], whose
+        [addRows][customQObjects.widgets.TableView.addRows] is 20-30x faster than the
+        `addRow` loop. `benchmarks/addrows.py` compares them.
+        See [insertRows][customQObjects.widgets.TableWidget.insertRows].
+
+        Parameters
+        ----------
+        rows : list
+            List of rows, where each row is a sequence of strings or (icon,string) pairs
+        kwargs
+            Any QTableWidgetItem setter, as for [addRow][customQObjects.widgets.TableWidget.addRow].
+            These are applied to every row.
+        """
+        self.insertRows(self.rowCount, rows, **kwargs)
+
+    def insertRows(self, idx: int, rows: list, **kwargs):
+        """
+        Insert multiple rows into the table, starting at row number `idx`
+
+        The table is resized once, then filled with sorting, updates and model signals suspended,
+        so the view is only notified once for the whole batch. `kwargs` are parsed once and
+        applied to every row.
+
+        Parameters
+        ----------
+        idx : int
+            Row number at which to insert the first row
+        rows : list
+            List of rows, where each row is a sequence of strings or (icon,string) pairs
+        kwargs
+            Any QTableWidgetItem setter, as for [addRow][customQObjects.widgets.TableWidget.addRow].
+            These are applied to every row.
+        """
+        if not isinstance(rows, list):
+            rows = list(rows)
+        if len(rows) == 0:
+            return
+        kwargs = self._parseRowKwargs(**kwargs)
+        selected = kwargs.pop("selected", None)
+        self._checkUnique(rows)
+        if len(rows) == 1:
+            self._insertRow(idx, rows[0], kwargs, selected)
+        else:
+            self._insertRows(idx, rows, kwargs, selected)
+
+    def _insertRow(self, idx, row, kwargs, selected):
+        """Insert single `row` at `idx`, leaving sorting enabled"""
+        if self._typedSorting:
+            idx = self._sortedPosition(row)
+        self.insertRow(idx)
+        columns = list(range(len(row)))
+        if self.isSortingEnabled():
+            # setting the item in the sort column moves the row, so set that one last
+            sortColumn = self.horizontalHeader().sortIndicatorSection()
+            if sortColumn in columns:
+                columns.remove(sortColumn)
+                columns.append(sortColumn)
+        items = []
+        for col in columns:
+            item = self._makeItem(row[col])
+            for name, values in kwargs.items():
+                self._setItemValue(item, name, values[col])
+            super().setItem(idx, col, item)
+            items.append((col, item))
+            if col in self._indexes:
+                self._indexes[col].set(item, item.text())
+        if selected is not None:
+            for col, item in items:
+                item.setSelected(selected[col])
+        if len(self._filters) > 0:
+            # the row may have been moved by setting the item in the sort column
+            row = items[-1][1].row() if len(items) > 0 else idx
+            self._applyFilters(row, row)
+
+    def _insertRows(self, idx, rows, kwargs, selected):
+        """Insert `rows` at `idx`, with sorting, updates and model signals suspended"""
+        prototypes = self._makePrototypes(kwargs)
+        model = self.model()
+        last = idx + len(rows) - 1
+        with self._suspendUpdates():
+            model.insertRows(idx, len(rows))
+            model.blockSignals(True)
+            try:
+                for rowNum, row in enumerate(rows, start=idx):
+                    for col, arg in enumerate(row):
+                        super().setItem(rowNum, col, self._makeItem(arg, prototypes, col))
+            finally:
+                model.blockSignals(False)
+            for col, index in self._indexes.items():
+                for rowNum in range(idx, last + 1):
+                    item = self.item(rowNum, col)
+                    index.set(item, item.text())
+            model.dataChanged.emit(model.index(idx, 0), model.index(last, self.columnCount - 1))
+            if selected is not None:
+                for col, value in enumerate(selected):
+                    self.setRangeSelected(QTableWidgetSelectionRange(idx, col, last, col), value)
+            if len(self._filters) > 0:
+                self._applyFilters(idx, last)
+
+    @staticmethod
+    def _makeItem(arg, prototypes=None, col=0):
+        """
+        Return new QTableWidgetItem from `arg`, which can be a string or (icon, string) pair.
+
+        If `prototypes` are given, the item is cloned from `prototypes[col]`.
+        """
+        if prototypes is None:
+            if isinstance(arg, (tuple, list)):
+                return QTableWidgetItem(*arg)
+            return QTableWidgetItem(arg)
+        item = prototypes[col].clone()
+        if isinstance(arg, (tuple, list)):
+            icon, arg = arg
+            item.setIcon(icon)
+        item.setText(arg)
+        return item
+
+    @staticmethod
+    def _itemText(arg):
+        """Return text from `arg`, which can be a string or (icon, string) pair"""
+        if isinstance(arg, (tuple, list)):
+            return arg[1]
+        return arg
+
+    @staticmethod
+    def _setItemValue(item, name, value):
+        """Call the setter for property `name` on `item` with `value`"""
+        if name == "data":
+            item.setData(Qt.UserRole, value)
+        else:
+            func = getattr(item, f"set{name[0].upper()}{name[1:]}")
+            func(value)
+
+    def _makePrototypes(self, kwargs):
+        """
+        Return list with a QTableWidgetItem for each column, with the setters in `kwargs` called.
+
+        New items can then be cloned from these. If `kwargs` is empty, return None.
+        """
+        if len(kwargs) == 0:
+            return None
+        prototypes = [QTableWidgetItem() for _ in range(self.columnCount)]
+        for name, values in kwargs.items():
+            for item, value in zip(prototypes, values):
+                self._setItemValue(item, name, value)
+        return prototypes
+
+    @contextmanager
+    def _suspendUpdates(self):
+        """
+        Context manager that disables sorting and updates.
+
+        The previous state is restored on exit; if sorting was enabled, the table is sorted once.
+        """
+        sortingEnabled = self.isSortingEnabled()
+        updatesEnabled = self.updatesEnabled()
+        self.setSortingEnabled(False)
+        self.setUpdatesEnabled(False)
+        try:
+            yield
+        finally:
+            self.setUpdatesEnabled(updatesEnabled)
+            self.setSortingEnabled(sortingEnabled)
+
+    def setColumnType(self, columnName, columnType):
+        """
+        Set how values in column `columnName` are sorted.
+
+        Once a column has a type, [sortItems][customQObjects.widgets.TableWidget.sortItems] (and
+        clicking on the header, if sorting is enabled) sorts it by keys computed once for each
+        row, rather than by comparing the items' text.
+
+        Parameters
+        ----------
+        columnName : str
+            Name of column
+        columnType : {'str', 'natural', 'numeric', 'date', callable}
+            See [setColumnType][customQObjects.widgets.SortFilterProxyModel.setColumnType].
+        """
+        col = self.header.index(columnName)
+        _keyFunction(columnType)
+        sorting = self.isSortingEnabled()
+        self._columnTypes[col] = columnType
+        if sorting:
+            # re-enable sorting, so that typed sorting is used
+            self.setSortingEnabled(True)
+
+    def setSortingEnabled(self, enable: bool):
+        """
+        Enable or disable sorting when a header section is clicked.
+
+        If any column has a type set with
+        [setColumnType][customQObjects.widgets.TableWidget.setColumnType], the rows are sorted by
+        [sortItems][customQObjects.widgets.TableWidget.sortItems] and new rows added by
+        [addRow][customQObjects.widgets.TableWidget.addRow] are inserted in sorted order.
+        """
+        header = self.horizontalHeader()
+        if self._typedSorting:
+            header.sortIndicatorChanged.disconnect(self.sortItems)
+            self._typedSorting = False
+        if enable and len(self._columnTypes) > 0:
+            super().setSortingEnabled(False)
+            header.setSortIndicatorShown(True)
+            header.setSectionsClickable(True)
+            header.sortIndicatorChanged.connect(self.sortItems)
+            self._typedSorting = True
+            self.sortItems(header.sortIndicatorSection(), header.sortIndicatorOrder())
+        else:
+            super().setSortingEnabled(enable)
+
+    def isSortingEnabled(self) -> bool:
+        return self._typedSorting or super().isSortingEnabled()
+
+    def sortItems(self, column: int, order=Qt.AscendingOrder):
+        """
+        Sort rows by `column`.
+
+        If `column` has a type, set with
+        [setColumnType][customQObjects.widgets.TableWidget.setColumnType], the sort key for each
+        row is computed once, the order is found with a single call to `sorted` and the items are
+        then moved to their new rows. Selection is preserved.
+        Otherwise, the items are sorted by text, as by QTableWidget.
+
+        Any pending [deferred updates][customQObjects.widgets.TableWidget.updateRow] are applied
+        first.
+        """
+        # so that rows are sorted by their new values
+        self.flushUpdates()
+        if column not in self._columnTypes:
+            super().sortItems(column, order)
+            if len(self._filters) > 0:
+                self._applyFilters(0, self.rowCount - 1)
+            return
+        keys = _makeSortKeys(self._columnText(column), self._columnTypes[column])
+        reverse = order == Qt.DescendingOrder
+        rows = sorted(range(self.rowCount), key=keys.__getitem__, reverse=reverse)
+        self._permuteRows(rows)
+
+    def _columnText(self, column, first=0, last=None) -> list:
+        """Return list of text in `column`, from row `first` to `last` (inclusive)"""
+        if last is None:
+            last = self.rowCount - 1
+        items = map(self.item, range(first, last + 1), [column] * (last + 1 - first))
+        return [item.text() if item is not None else "" for item in items]
+
+    def _permuteRows(self, rows):
+        """
+        Reorder rows so that new row `i` is old row `rows[i]`.
+
+        The rows are moved by QTableWidget's own sort, with each item in the first column
+        temporarily given its new row number as its display data. The model therefore emits
+        `layoutAboutToBeChanged` and `layoutChanged` and updates persistent indexes, so selection,
+        the current index, editors and proxy models follow the rows.
+        """
+        # pending updates are keyed by row number, so apply them before the rows move
+        self.flushUpdates()
+        if rows == list(range(len(rows))):
+            return
+        newRow = [0] * len(rows)
+        for new, old in enumerate(rows):
+            newRow[old] = new
+
+        model = self.model()
+        updatesEnabled = self.updatesEnabled()
+        self.setUpdatesEnabled(False)
+        # display data of the items in column 0, or None for empty cells, by old row
+        saved = []
+        # items are taken out while their data is set, as setting the data of an item in the
+        # table looks up its position, which is a linear search if the rows have been sorted.
+        # This bypasses the index updates in setItem and takeItem, as the text is restored after.
+        takeItem = super().takeItem
+        setItem = super().setItem
+        model.blockSignals(True)
+        try:
+            for row, new in enumerate(newRow):
+                item = takeItem(row, 0)
+                if item is None:
+                    # QTableWidget would put rows without an item last
+                    item = QTableWidgetItem()
+                    saved.append(None)
+                else:
+                    saved.append(item.data(Qt.DisplayRole))
+                item.setData(Qt.DisplayRole, new)
+                setItem(row, 0, item)
+        finally:
+            model.blockSignals(False)
+        # QTableWidget.sortItems also sets the sort indicator, which would sort again
+        header = self.horizontalHeader()
+        sortColumn, sortOrder = header.sortIndicatorSection(), header.sortIndicatorOrder()
+        header.blockSignals(True)
+        try:
+            super().sortItems(0, Qt.AscendingOrder)
+            header.setSortIndicator(sortColumn, sortOrder)
+        finally:
+            header.blockSignals(False)
+        model.blockSignals(True)
+        try:
+            for row, old in enumerate(rows):
+                item = takeItem(row, 0)
+                if saved[old] is not None:
+                    item.setData(Qt.DisplayRole, saved[old])
+                    setItem(row, 0, item)
+        finally:
+            model.blockSignals(False)
+        model.dataChanged.emit(model.index(0, 0), model.index(len(rows) - 1, 0))
+
+        if len(self._filters) > 0:
+            self._applyFilters(0, self.rowCount - 1)
+        self.setUpdatesEnabled(updatesEnabled)
+
+    def _sortedPosition(self, row) -> int:
+        """Return position at which to insert `row`, when typed sorting is enabled"""
+        header = self.horizontalHeader()
+        col = header.sortIndicatorSection()
+        if col < 0 or col >= len(row):
+            return self.rowCount
+        keyFunction = _keyFunction(self._columnTypes.get(col, "str"))
+
+        def keyAt(idx):
+            item = self.item(idx, col)
+            return keyFunction(item.text() if item is not None else "")
+
+        key = keyFunction(self._itemText(row[col]))
+        descending = header.sortIndicatorOrder() == Qt.DescendingOrder
+        return _insertPosition(self.rowCount, keyAt, key, descending)
+
+    def setFilter(self, columnName, predicate):
+        """
+        Only show rows where `predicate` returns True for the text in column `columnName`.
+
+        If there are filters on several columns, all must be True for a row to be shown.
+        The filters are applied to all columns in one pass and other rows are hidden. They are
+        also applied to rows that are added or updated later.
+        If `predicate` raises a TypeError or ValueError, this is treated as False.
+        If `predicate` is None, remove the filter on `columnName`.
+        """
+        col = self.header.index(columnName)
+        if predicate is None:
+            self._filters.pop(col, None)
+        else:
+            self._filters[col] = _filterFunction(predicate)
+        self._applyFilters(0, self.rowCount - 1)
+
+    def clearFilters(self):
+        """Remove all filters, showing all rows"""
+        self._filters.clear()
+        self._applyFilters(0, self.rowCount - 1)
+
+    def _applyFilters(self, first, last):
+        """Show or hide rows `first` to `last` (inclusive), according to the filters"""
+        if last < first:
+            return
+        rows = range(first, last + 1)
+        if len(self._filters) > 0:
+            columns = [self._columnText(col, first, last) for col in self._filters]
+            mask = _filterMask(columns, list(self._filters.values()))
+        else:
+            mask = [True] * len(rows)
+        for row, visible in zip(rows, mask):
+            if self.isRowHidden(row) == visible:
+                self.setRowHidden(row, not visible)
+
+    @property
+    def isExtending(self) -> bool:
+        """Return True if [extend][customQObjects.widgets.TableWidget.extend] is in progress"""
+        return self._extendIter is not None
+
+    def extend(self, iterable, chunkSize: int = 1000, timeBudgetMs: int = 16, **kwargs):
+        """
+        Add rows from `iterable` without blocking the event loop.
+
+        Rows are taken from `iterable` in chunks of `chunkSize` and each chunk is added with
+        [addRows][customQObjects.widgets.TableWidget.addRows]. Chunks are added until
+        `timeBudgetMs` has elapsed, then control returns to the event loop until the next step.
+
+        [extendProgress][customQObjects.widgets.TableWidget.extendProgress] is emitted after each
+        step and [extendFinished][customQObjects.widgets.TableWidget.extendFinished] when
+        `iterable` is exhausted or [cancelExtend][customQObjects.widgets.TableWidget.cancelExtend]
+        is called.
+
+        Parameters
+        ----------
+        iterable : iterable
+            Iterable of rows, e.g. a generator or database cursor
+        chunkSize : int, optional
+            Number of rows to add at a time. Must be positive. Default is 1000.
+        timeBudgetMs : int, optional
+            Time (in milliseconds) to spend adding rows before returning to the event loop.
+            Must be positive. Default is 16.
+        kwargs
+            Any QTableWidgetItem setter, as for [addRow][customQObjects.widgets.TableWidget.addRow].
+            These are applied to every row.
+        """
+        if self._extendIter is not None:
+            raise RuntimeError("TableWidget is already extending")
+        if chunkSize <= 0:
+            raise ValueError(f"chunkSize should be positive, not {chunkSize}")
+        if timeBudgetMs <= 0:
+            raise ValueError(f"timeBudgetMs should be positive, not {timeBudgetMs}")
+        self._extendIter = iter(iterable)
+        self._extendArgs = (chunkSize, timeBudgetMs, kwargs)
+        self._extendCount = 0
+        self._extendTimer.start()
+
+    def cancelExtend(self):
+        """Stop [extend][customQObjects.widgets.TableWidget.extend], if it is in progress."""
+        if self._extendIter is None:
+            return
+        self._extendTimer.stop()
+        self._finishExtend()
+
+    def _extendStep(self):
+        """Add chunks of rows until the time budget is used up or the iterable is exhausted"""
+        if self._extendIter is None:
+            return
+        chunkSize, timeBudgetMs, kwargs = self._extendArgs
+        deadline = time.perf_counter() + timeBudgetMs / 1000
+        exhausted = False
+        try:
+            while True:
+                chunk = list(islice(self._extendIter, chunkSize))
+                if len(chunk) > 0:
+                    self.addRows(chunk, **kwargs)
+                    self._extendCount += len(chunk)
+                if len(chunk) < chunkSize:
+                    exhausted = True
+                    break
+                if time.perf_counter() >= deadline:
+                    break
+        except Exception:
+            self._finishExtend()
+            raise
+        self.extendProgress.emit(self._extendCount)
+        if exhausted:
+            self._finishExtend()
+        elif self._extendIter is not None:
+            # not cancelled by a slot connected to extendProgress
+            self._extendTimer.start()
+
+    def _finishExtend(self):
+        """Reset extend state and emit extendFinished"""
+        self._extendIter = None
+        self._extendArgs = None
+        self.extendFinished.emit(self._extendCount)
+
+    def updateRow(self, idx: int, row: list, deferred=False, **kwargs):
+        """
+        Update data in row number `idx`
+
+        Parameters
+        ----------
+        idx : int
+            Index of row to update
+        row : list, tuple
+            Sequence of strings or (icon,string) pairs from which to construct
+            [QTableWidgetItems](https://doc.qt.io/qt-6/qtablewidgetitem.html)
+        deferred : bool, optional
+            If True, don't change the items now, but buffer the update and apply all buffered
+            updates together every
+            [liveUpdateInterval][customQObjects.widgets.TableWidget.liveUpdateInterval] ms.
+            Only the latest value for each cell is kept, so this is suitable for rows that are
+            updated many times per second. Default is False.
+        kwargs
+            Any QTableWidgetItem setter can be passed here, e.g. `toolTip='this is the tool tip'`
+            will call `setToolTip('this is the tool tip')` on the item.
+            `background` and `foreground` can be passed with a
+            [QBrush](https://doc.qt.io/qt-6/qbrush.html),
+            [QColor](https://doc.qt.io/qt-6/qcolor.html) or any valid QColor arg.
+        """
+        self._checkUnique([row], replacing=idx)
+        kwargs = self._parseRowKwargs(**kwargs)
+        if deferred:
+            self._deferUpdate(idx, row, kwargs)
+            return
+        selected = kwargs.pop("selected", None)
+        for col in range(self.columnCount):
+            item = self.item(idx, col)
+            # update text and icon
+            if isinstance(row[col], (tuple, list)):
+                icon, text = row[col]
+                item.setIcon(icon)
+            else:
+                text = row[col]
+            item.setText(text)
+            # update any other properties
+            for name, values in kwargs.items():
+                self._setItemValue(item, name, values[col])
+            if selected is not None:
+                item.setSelected(selected[col])
+            if col in self._indexes:
+                self._indexes[col].set(item, text)
+        if len(self._filters) > 0:
+            self._applyFilters(idx, idx)
+
+    liveUpdateInterval = 16
+    """
+    Time (in milliseconds) between applying updates made with
+    [updateRow(..., deferred=True)][customQObjects.widgets.TableWidget.updateRow]
+    """
+
+    _flushTimer = None
+
+    def _initLiveUpdates(self):
+        """Create deferred update state, if not already done"""
+        if self._flushTimer is not None:
+            return
+        self._pendingUpdates = {}
+        self._mergedUpdateCount = 0
+        self._droppedUpdateCount = 0
+        self._flushTimer = QTimer(self)
+        self._flushTimer.setSingleShot(True)
+        self._flushTimer.timeout.connect(self.flushUpdates)
+        # apply pending updates before rows move, so that they are applied to the right rows
+        model = self.model()
+        model.rowsAboutToBeRemoved.connect(self._flushBeforeRemove)
+        for signal in [
+            model.rowsAboutToBeInserted,
+            model.rowsAboutToBeMoved,
+            model.columnsAboutToBeInserted,
+            model.columnsAboutToBeRemoved,
+            model.layoutAboutToBeChanged,
+            model.modelAboutToBeReset,
+        ]:
+            signal.connect(self.flushUpdates)
+
+    @property
+    def mergedUpdateCount(self) -> int:
+        """
+        Number of deferred updates to a row that already had an update pending, so they were
+        applied together
+        """
+        return 0 if self._flushTimer is None else self._mergedUpdateCount
+
+    @property
+    def droppedUpdateCount(self) -> int:
+        """Number of deferred cell values that were replaced by a newer value before being shown"""
+        return 0 if self._flushTimer is None else self._droppedUpdateCount
+
+    def resetUpdateCounts(self):
+        """
+        Set [mergedUpdateCount][customQObjects.widgets.TableWidget.mergedUpdateCount] and
+        [droppedUpdateCount][customQObjects.widgets.TableWidget.droppedUpdateCount] to 0
+        """
+        self._mergedUpdateCount = 0
+        self._droppedUpdateCount = 0
+
+    def _deferUpdate(self, idx, row, kwargs):
+        """Buffer update of row `idx`, to be applied by flushUpdates"""
+        self._initLiveUpdates()
+        if (idx, 0) in self._pendingUpdates:
+            self._mergedUpdateCount += 1
+        for col in range(self.columnCount):
+            if isinstance(row[col], (tuple, list)):
+                icon, text = row[col]
+                new = {"icon": icon, "text": text}
+            else:
+                new = {"text": row[col]}
+            for name, columnValues in kwargs.items():
+                new[name] = columnValues[col]
+            values = self._pendingUpdates.setdefault((idx, col), {})
+            self._droppedUpdateCount += len(values.keys() & new.keys())
+            values.update(new)
+        if not self._flushTimer.isActive():
+            self._flushTimer.start(self.liveUpdateInterval)
+
+    def _discardPendingUpdates(self, first=0, last=None):
+        """Discard deferred updates to rows `first` to `last` (inclusive), or all rows"""
+        if self._flushTimer is None or len(self._pendingUpdates) == 0:
+            return
+        if last is None:
+            self._pendingUpdates.clear()
+        else:
+            pending = self._pendingUpdates.items()
+            self._pendingUpdates = {key: v for key, v in pending if not first <= key[0] <= last}
+
+    def _flushBeforeRemove(self, parent, first, last):
+        """
+        Apply pending updates before rows `first` to `last` are removed.
+
+        Updates to the rows being removed are discarded, as their items are about to be deleted
+        (and have already been removed from the indexes).
+        """
+        self._discardPendingUpdates(first, last)
+        self.flushUpdates()
+
+    def flushUpdates(self, *args):
+        """
+        Apply all updates buffered by
+        [updateRow(..., deferred=True)][customQObjects.widgets.TableWidget.updateRow] now.
+
+        Items are updated with model signals blocked, then `dataChanged` is emitted once for
+        each rectangle of changed cells.
+        """
+        if self._flushTimer is None or len(self._pendingUpdates) == 0:
+            return
+        self._flushTimer.stop()
+        pending = self._pendingUpdates
+        self._pendingUpdates = {}
+
+        header = self.horizontalHeader()
+        sortColumn = header.sortIndicatorSection() if self.isSortingEnabled() else -1
+        sortItems = []
+        changed = {}
+        model = self.model()
+        model.blockSignals(True)
+        try:
+            for (row, col), values in pending.items():
+                item = self.item(row, col)
+                if item is None:
+                    continue
+                if col == sortColumn:
+                    # changing the sort column may move the row, so this is done after
+                    sortItems.append((item, values))
+                    continue
+                for name, value in values.items():
+                    self._setItemValue(item, name, value)
+                if col in self._indexes:
+                    self._indexes[col].set(item, item.text())
+                first, last = changed.get(row, (col, col))
+                changed[row] = (min(first, col), max(last, col))
+        finally:
+            model.blockSignals(False)
+        for first, last, firstCol, lastCol in _mergeRowSpans(changed):
+            model.dataChanged.emit(model.index(first, firstCol), model.index(last, lastCol))
+
+        if len(sortItems) > 0:
+            for item, values in sortItems:
+                for name, value in values.items():
+                    self._setItemValue(item, name, value)
+                if sortColumn in self._indexes:
+                    self._indexes[sortColumn].set(item, item.text())
+            if self._typedSorting:
+                self.sortItems(sortColumn, header.sortIndicatorOrder())
+            if len(self._filters) > 0:
+                # rows may have moved, so filter them all
+                self._applyFilters(0, self.rowCount - 1)
+        elif len(self._filters) > 0:
+            for first, count in _runs(sorted(changed)):
+                self._applyFilters(first, first + count - 1)
+
+    def replaceData(self, rows: list, key: str, **kwargs):
+        """
+        Replace the contents of the table with `rows`, only applying what has changed.
+
+        Rows are matched to the current rows by their value in column `key`. Rows whose key is
+        no longer present are removed, new rows are inserted, and only cells whose text has
+        changed are updated, with one `dataChanged` range per run of changed rows. If sorting
+        is disabled, the rows end up in the order of `rows`, with the fewest possible rows moved.
+
+        Items that are kept (or moved) keep their other properties (e.g. tool tips) and
+        selection, and the view stays scrolled to the same row.
+        Any pending [deferred updates][customQObjects.widgets.TableWidget.updateRow] are applied
+        first.
+
+        Parameters
+        ----------
+        rows : list
+            List of rows, where each row is a sequence of strings or (icon,string) pairs
+        key : str
+            Name of column whose values identify the rows. These must be unique.
+        kwargs
+            Any QTableWidgetItem setter, as for [addRow][customQObjects.widgets.TableWidget.addRow].
+            These are applied to new rows only.
+        """
+        rows = list(rows)
+        col = self.header.index(key)
+        # pending updates are keyed by row number, so apply them before any rows move
+        self.flushUpdates()
+        newKeys = [self._itemText(row[col]) for row in rows]
+        if len(set(newKeys)) != len(newKeys):
+            raise ValueError(f"Values in column '{key}' must be unique")
+        numCols = self.columnCount
+        for row in rows:
+            if len(row) != numCols:
+                raise ValueError(f"List of {numCols} values needed, got {row}")
+
+        sorting = self.isSortingEnabled()
+        cache = self._replaceCache
+        if cache is not None and cache[0] == col and not sorting:
+            # table is unchanged since the last call, so don't need to read the items
+            _, curKeys, curValues = cache
+        else:
+            curKeys = self._columnText(col)
+            curValues = None
+        curRows = {k: row for row, k in enumerate(curKeys)}
+        if len(curRows) != len(curKeys):
+            raise ValueError(f"Current values in column '{key}' are not unique")
+
+        topRow = self.rowAt(0)
+        anchorItem = self.item(topRow, col) if topRow >= 0 else None
+        newKeySet = set(newKeys)
+
+        # existing rows that stay where they are; any others are removed or moved
+        oldRows = [curRows[k] for k in newKeys if k in curRows]
+        if sorting or all(a < b for a, b in zip(oldRows, oldRows[1:])):
+            keep = set(oldRows)
+        else:
+            keep = set(_longestIncreasingSubsequence(oldRows))
+
+        kwargs = self._parseRowKwargs(**kwargs)
+        kwargs.pop("selected", None)
+        prototypes = self._makePrototypes(kwargs)
+        model = self.model()
+
+        with self._suspendUpdates():
+            self._updateChangedCells(rows, newKeys, curRows, curValues, keep)
+
+            # take items from rows that are moving, then remove all rows that are not kept
+            remove = [row for row in range(len(curKeys)) if row not in keep]
+            for row in remove:
+                self._unindexRows(row, row)
+            moving = set(oldRows)
+            moved = {}
+            model.blockSignals(True)
+            try:
+                for row in remove:
+                    if row in moving:
+                        items = [self.item(row, c) for c in range(numCols)]
+                        selected = [item is not None and item.isSelected() for item in items]
+                        for c in range(numCols):
+                            super().takeItem(row, c)
+                        moved[curKeys[row]] = (items, selected)
+            finally:
+                model.blockSignals(False)
+            for start, count in reversed(_runs(remove)):
+                model.removeRows(start, count)
+
+            # insert new and moved rows
+            if sorting:
+                new = [idx for idx, k in enumerate(newKeys) if k not in curRows]
+                runs = [(self.rowCount, new)] if len(new) > 0 else []
+            else:
+                runs = []
+                for idx, k in enumerate(newKeys):
+                    if k in curRows and curRows[k] in keep:
+                        continue
+                    if len(runs) > 0 and runs[-1][0] + len(runs[-1][1]) == idx:
+                        runs[-1][1].append(idx)
+                    else:
+                        runs.append((idx, [idx]))
+            for start, indices in runs:
+                newRows = [rows[idx] for idx in indices]
+                items = [moved.get(newKeys[idx], None) for idx in indices]
+                self._insertReplacementRows(start, newRows, items, prototypes)
+
+        # keep the same row at the top of the view
+        if anchorItem is not None and curKeys[topRow] in newKeySet:
+            self.scrollTo(model.index(anchorItem.row(), 0), QAbstractItemView.PositionAtTop)
+
+        if len(self._filters) > 0:
+            self._applyFilters(0, self.rowCount - 1)
+        if not sorting:
+            self._setReplaceCache(col, newKeys, rows)
+
+    def _setReplaceCache(self, col, keys, rows):
+        """
+        Store keys and values from [replaceData][customQObjects.widgets.TableWidget.replaceData].
+
+        These are discarded as soon as the model changes, so if they still exist on the next
+        call, the items do not need to be read. (This is unrelated to
+        [saveSnapshot][customQObjects.widgets.TableWidget.saveSnapshot].)
+        """
+        self._clearReplaceCache()
+        self._replaceCache = (col, keys, {k: tuple(row) for k, row in zip(keys, rows)})
+        model = self.model()
+        for signal in self._replaceCacheSignals(model):
+            signal.connect(self._clearReplaceCache)
+
+    def _clearReplaceCache(self, *args):
+        """Discard keys and values stored by the last replaceData call"""
+        if self._replaceCache is None:
+            return
+        self._replaceCache = None
+        model = self.model()
+        for signal in self._replaceCacheSignals(model):
+            signal.disconnect(self._clearReplaceCache)
+
+    @staticmethod
+    def _replaceCacheSignals(model):
+        return [
+            model.dataChanged,
+            model.rowsInserted,
+            model.rowsRemoved,
+            model.rowsMoved,
+            model.layoutChanged,
+            model.modelReset,
+        ]
+
+    def _updateChangedCells(self, rows, newKeys, curRows, curValues, keep):
+        """
+        Set text of cells in rows that are kept where it differs from `rows`.
+
+        If `curValues` is given, rows whose values have not changed are skipped without reading
+        the items.
+        """
+        model = self.model()
+        changed = []
+        model.blockSignals(True)
+        try:
+            for row, k in zip(rows, newKeys):
+                rowNum = curRows.get(k, None)
+                if rowNum is None or rowNum not in keep:
+                    continue
+                if curValues is not None and curValues[k] == tuple(row):
+                    continue
+                first = None
+                for c, arg in enumerate(row):
+                    item = self.item(rowNum, c)
+                    if item is None:
+                        # empty cell
+                        item = self._makeItem(arg)
+                        text = item.text()
+                        super().setItem(rowNum, c, item)
+                    elif isinstance(arg, (tuple, list)):
+                        icon, text = arg
+                        item.setIcon(icon)
+                        item.setText(text)
+                    elif item.text() == arg:
+                        continue
+                    else:
+                        text = arg
+                        item.setText(text)
+                    if c in self._indexes:
+                        self._indexes[c].set(item, text)
+                    if first is None:
+                        first = c
+                    last = c
+                if first is not None:
+                    changed.append((rowNum, first, last))
+        finally:
+            model.blockSignals(False)
+
+        # merge consecutive rows with the same changed columns into one range
+        changed.sort()
+        ranges = []
+        for rowNum, first, last in changed:
+            if len(ranges) > 0:
+                prevFirstRow, prevLastRow, prevFirst, prevLast = ranges[-1]
+                if prevLastRow + 1 == rowNum and (prevFirst, prevLast) == (first, last):
+                    ranges[-1][1] = rowNum
+                    continue
+            ranges.append([rowNum, rowNum, first, last])
+        for firstRow, lastRow, first, last in ranges:
+            model.dataChanged.emit(model.index(firstRow, first), model.index(lastRow, last))
+
+    def _insertReplacementRows(self, idx, rows, movedItems, prototypes):
+        """
+        Insert `rows` at `idx`.
+
+        `movedItems` has an entry for each row, which is either None or a tuple of the items
+        taken from the row's previous position and whether each was selected. These items are
+        reused, rather than creating new ones.
+        """
+        model = self.model()
+        numCols = self.columnCount
+        last = idx + len(rows) - 1
+        model.insertRows(idx, len(rows))
+        reselect = []
+        model.blockSignals(True)
+        try:
+            for rowNum, (row, moved) in enumerate(zip(rows, movedItems), start=idx):
+                for c, arg in enumerate(row):
+                    if moved is None:
+                        item = self._makeItem(arg, prototypes, c)
+                    elif moved[0][c] is None:
+                        # empty cell
+                        item = self._makeItem(arg)
+                    else:
+                        items, selected = moved
+                        item = items[c]
+                        if isinstance(arg, (tuple, list)):
+                            icon, arg = arg
+                            item.setIcon(icon)
+                        item.setText(arg)
+                        if selected[c]:
+                            reselect.append(item)
+                    super().setItem(rowNum, c, item)
+        finally:
+            model.blockSignals(False)
+        for c, index in self._indexes.items():
+            for rowNum in range(idx, last + 1):
+                item = self.item(rowNum, c)
+                index.set(item, item.text())
+        model.dataChanged.emit(model.index(idx, 0), model.index(last, numCols - 1))
+        for item in reselect:
+            item.setSelected(True)
+
+    def rowData(self, idx, returnType="dict"):
+        """
+        Return text in row `idx`, as dict with the header as keys or, if `returnType` is
+        'list', as list.
+        """
+        row = [self.item(idx, col).text() for col in range(self.columnCount)]
+        return self._formatRow(row, returnType)
+
+    def columnData(self, name):
+        """
+        Return list of [QTableWidgetItems](https://doc.qt.io/qt-6/qtablewidgetitem.html) in
+        column `name`
+        """
+        idx = self.header.index(name)
+        column = [self.item(row, idx) for row in range(self.rowCount)]
+        return column
+
+    def _findRows(self, col, value) -> list:
+        """Return sorted list of numbers of rows where column `col` has text `value`"""
+        index = self._indexes.get(col, None)
+        if index is not None:
+            return sorted(item.row() for item in index.get(value))
+        rows = []
+        for row in range(self.rowCount):
+            item = self.item(row, col)
+            if item is not None and item.text() == value:
+                rows.append(row)
+        return rows
+
+    def rowWhere(self, columnName, value, returnType="dict"):
+        """
+        Return data from first row where column `columnName` has value `value`.
+
+        If `columnName` has an index (see
+        [createColumnIndex][customQObjects.widgets.TableWidget.createColumnIndex]), this will be
+        used to find the row. If no row is found, an empty dict or list is returned.
+        """
+        col = self.header.index(columnName)
+        index = self._indexes.get(col, None)
+        if index is not None:
+            rows = [item.row() for item in index.get(value)]
+            rows = [min(rows)] if len(rows) > 0 else []
+        else:
+            rows = []
+            for row in range(self.rowCount):
+                item = self.item(row, col)
+                if item is not None and item.text() == value:
+                    rows = [row]
+                    break
+        if len(rows) == 0:
+            return {} if returnType == "dict" else []
+        return self.rowData(rows[0], returnType)
+
+    def rowsWhere(self, columnName, value, returnType="dict") -> list:
+        """
+        Return list of data from all rows where column `columnName` has value `value`.
+
+        See [rowWhere][customQObjects.widgets.TableWidget.rowWhere].
+        """
+        col = self.header.index(columnName)
+        return [self.rowData(row, returnType) for row in self._findRows(col, value)]
+
+    def toCsv(self, pathOrStream, delimiter=None, header=True, chunkSize=1000, encoding="utf-8"):
+        """
+        Write the text of every cell to a CSV or TSV file.
+
+        Rows are read from the table and written `chunkSize` at a time, so only one chunk of
+        text is held in memory at once.
+
+        Parameters
+        ----------
+        pathOrStream : {str, os.PathLike, file object}
+            Path of file to write or text stream opened with `newline=""`
+        delimiter : str, optional
+            Field delimiter. If not given, tab is used for files ending in '.tsv' or '.tab'
+            and comma otherwise.
+        header : bool, optional
+            If True (the default), write the header as the first line
+        chunkSize : int, optional
+            Number of rows to write at a time. Default is 1000.
+        encoding : str, optional
+            Encoding used when `pathOrStream` is a path. Default is 'utf-8'.
+        """
+        delimiter = _csvDelimiter(pathOrStream, delimiter)
+        numCols = self.columnCount
+        with _openStream(pathOrStream, "w", encoding) as stream:
+            writer = csv.writer(stream, delimiter=delimiter)
+            if header and self.header is not None:
+                writer.writerow(self.header)
+            for first in range(0, self.rowCount, chunkSize):
+                last = min(first + chunkSize, self.rowCount) - 1
+                columns = [self._columnText(col, first, last) for col in range(numCols)]
+                writer.writerows(zip(*columns))
+
+    def fromCsv(
+        self, pathOrStream, delimiter=None, header=True, chunkSize=1000, encoding="utf-8", **kwargs
+    ) -> int:
+        """
+        Add rows from a CSV or TSV file.
+
+        The file is read `chunkSize` rows at a time and each chunk is added with
+        [addRows][customQObjects.widgets.TableWidget.addRows], so only one chunk of the file is
+        held in memory at once. To add the rows without blocking the event loop, pass a
+        `csv.reader` to [extend][customQObjects.widgets.TableWidget.extend] instead.
+
+        If `header` is True, the first line is the header. If the table has no columns, its
+        header is set from the file; otherwise the file's header must match it.
+
+        Parameters
+        ----------
+        pathOrStream : {str, os.PathLike, file object}
+            Path of file to read or text stream opened with `newline=""`
+        delimiter : str, optional
+            Field delimiter. If not given, tab is used for files ending in '.tsv' or '.tab'
+            and comma otherwise.
+        header : bool, optional
+            If True (the default), the first line is the header
+        chunkSize : int, optional
+            Number of rows to add at a time. Default is 1000.
+        encoding : str, optional
+            Encoding used when `pathOrStream` is a path. Default is 'utf-8'.
+        kwargs
+            Any QTableWidgetItem setter, as for [addRow][customQObjects.widgets.TableWidget.addRow].
+            These are applied to every row.
+
+        Returns
+        -------
+        int
+            Number of rows added
+        """
+        delimiter = _csvDelimiter(pathOrStream, delimiter)
+        count = 0
+        with _openStream(pathOrStream, "r", encoding) as stream:
+            reader = csv.reader(stream, delimiter=delimiter)
+            if header:
+                names = next(reader, None)
+                if names is None:
+                    return 0
+                if self.columnCount == 0:
+                    self.setColumnCount(len(names))
+                    self.setHorizontalHeaderLabels(names)
+                    self._header = names
+                elif self.header is not None and list(self.header) != names:
+                    msg = f"CSV header {names} does not match table header {self.header}"
+                    raise ValueError(msg)
+            while True:
+                chunk = list(islice(reader, chunkSize))
+                if len(chunk) == 0:
+                    break
+                if self.columnCount == 0:
+                    self.setColumnCount(len(chunk[0]))
+                for rowNum, row in enumerate(chunk, start=count + 1):
+                    if len(row) != self.columnCount:
+                        msg = f"Row {rowNum}: {self.columnCount} values needed, got {row}"
+                        raise ValueError(msg)
+                self.addRows(chunk, **kwargs)
+                count += len(chunk)
+                if len(chunk) < chunkSize:
+                    break
+        return count
+
+    def saveSnapshot(self, path, version=None):
+        """
+        Save the table to a binary snapshot file, which can be loaded quickly with
+        [restoreSnapshot][customQObjects.widgets.TableWidget.restoreSnapshot].
+
+        The snapshot holds every item's data for all roles (text, icon, tooltip, brushes,
+        `Qt.UserRole` data etc.), the header, column widths and sort state. Item flags are not
+        saved. Role data must be types that Qt can serialise, i.e. not arbitrary Python objects.
+
+        The items are encoded by Qt itself, in the `application/x-qabstractitemmodeldatalist`
+        format of
+        [QAbstractItemModel.mimeData](https://doc.qt.io/qt-6/qabstractitemmodel.html#mimeData)
+        (the row, column and a map of role to QVariant for each item, written with
+        [QDataStream](https://doc.qt.io/qt-6/qdatastream.html)), so that the table can be
+        saved and restored without looping over the items in Python. This format is internal
+        to Qt and the QDataStream encoding can change between Qt versions, so the Qt version is
+        saved as well and the snapshot is only restored with the same major and minor version.
+
+        Parameters
+        ----------
+        path : {str, os.PathLike}
+            Path of file to write
+        version : str, optional
+            Version of the source data, e.g. a hash or modification time. The snapshot is only
+            restored if the same `version` is given to `restoreSnapshot`.
+        """
+        model = self.model()
+        numRows, numCols = self.rowCount, self.columnCount
+        if numRows > 0 and numCols > 0:
+            indexes = QItemSelection(
+                model.index(0, 0), model.index(numRows - 1, numCols - 1)
+            ).indexes()
+            mimeData = model.mimeData(indexes)
+            payload = bytes(mimeData.data(model.mimeTypes()[0]))
+        else:
+            payload = b""
+        header = self.horizontalHeader()
+        meta = {
+            "version": version,
+            "qtVersion": _qtMinorVersion(),
+            "rows": numRows,
+            "columns": numCols,
+            "header": None if self.header is None else list(self.header),
+            "columnWidths": [self.columnWidth(col) for col in range(numCols)],
+            "sortingEnabled": self.isSortingEnabled(),
+            "sortColumn": header.sortIndicatorSection(),
+            "sortOrder": int(header.sortIndicatorOrder()),
+        }
+        meta = json.dumps(meta).encode("utf-8")
+        fileHeader = _snapshotHeader.pack(
+            _snapshotMagic, _snapshotVersion, len(meta), len(payload), zlib.crc32(payload)
+        )
+        with open(path, "wb") as fileobj:
+            fileobj.write(fileHeader)
+            fileobj.write(meta)
+            fileobj.write(payload)
+
+    def restoreSnapshot(self, path, version=None) -> bool:
+        """
+        Replace the table's contents with a snapshot saved by
+        [saveSnapshot][customQObjects.widgets.TableWidget.saveSnapshot].
+
+        The file is memory-mapped, and the items are created and filled by Qt in one bulk step,
+        with updates and model signals suspended. The items' data is copied once, from the
+        mapped file to Qt.
+
+        If the file does not exist, is not a snapshot from a compatible version of this class,
+        is corrupt, or was saved with a different `version`, header or Qt version, the table is
+        not changed and False is returned, so the table should be built from the source data
+        instead. If the snapshot is restored, any pending
+        [deferred updates][customQObjects.widgets.TableWidget.updateRow] are discarded.
+
+        Parameters
+        ----------
+        path : {str, os.PathLike}
+            Path of snapshot file
+        version : str, optional
+            Version of the source data, which must match the `version` given to `saveSnapshot`
+
+        Returns
+        -------
+        bool
+            True if the snapshot was restored
+        """
+        try:
+            fileobj = open(path, "rb")
+        except OSError:
+            return False
+        with fileobj:
+            try:
+                buffer = mmap.mmap(fileobj.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                # e.g. empty file
+                return False
+            with buffer, memoryview(buffer) as view:
+                meta, payload = self._readSnapshot(view, version)
+                if meta is None:
+                    return False
+                # the payload is a view of the mapped file, so it must be released before
+                # the file is closed
+                with payload:
+                    self._restoreSnapshot(meta, payload)
+        return True
+
+    def _readSnapshot(self, buffer, version):
+        """
+        Return metadata and payload from snapshot `buffer`, or (None, None) if it is
+        incompatible or stale
+        """
+        if len(buffer) < _snapshotHeader.size:
+            return None, None
+        magic, formatVersion, metaSize, payloadSize, crc = _snapshotHeader.unpack_from(buffer)
+        if magic != _snapshotMagic or formatVersion != _snapshotVersion:
+            return None, None
+        start = _snapshotHeader.size
+        if len(buffer) != start + metaSize + payloadSize:
+            return None, None
+        try:
+            meta = json.loads(str(buffer[start : start + metaSize], "utf-8"))
+        except ValueError:
+            return None, None
+        if meta["version"] != version or meta.get("qtVersion") != _qtMinorVersion():
+            return None, None
+        if self.header is not None and meta["header"] != list(self.header):
+            return None, None
+        payload = buffer[start + metaSize :]
+        if zlib.crc32(payload) != crc:
+            payload.release()
+            return None, None
+        return meta, payload
+
+    def _restoreSnapshot(self, meta, payload):
+        """Fill the table from snapshot `meta` and `payload`"""
+        numRows, numCols = meta["rows"], meta["columns"]
+        model = self.model()
+        header = self.horizontalHeader()
+        self.cancelExtend()
+        # pending updates are to rows that are about to be replaced
+        self._discardPendingUpdates()
+        self.setSortingEnabled(False)
+        with self._suspendUpdates():
+            self.setRowCount(0)
+            self.setColumnCount(numCols)
+            if meta["header"] is not None:
+                self.setHorizontalHeaderLabels(meta["header"])
+                self._header = meta["header"]
+            self.setRowCount(numRows)
+            if numRows > 0 and numCols > 0:
+                mimeData = QMimeData()
+                # fromRawData copies the payload straight from the mapped file
+                mimeData.setData(model.mimeTypes()[0], QByteArray.fromRawData(payload))
+                model.blockSignals(True)
+                try:
+                    # dropping on an item sets the data of existing cells, rather than inserting
+                    # rows; QTableWidget would always insert, so call the base class directly
+                    QAbstractTableModel.dropMimeData(
+                        model, mimeData, Qt.CopyAction, -1, -1, model.index(0, 0)
+                    )
+                finally:
+                    model.blockSignals(False)
+                model.dataChanged.emit(model.index(0, 0), model.index(numRows - 1, numCols - 1))
+            for col, width in enumerate(meta["columnWidths"]):
+                self.setColumnWidth(col, width)
+            for col, index in self._indexes.items():
+                for rowNum in range(numRows):
+                    item = self.item(rowNum, col)
+                    if item is not None:
+                        index.set(item, item.text())
+            # rows were saved in sorted order, so enable sorting without a sort column, which
+            # doesn't move them, then set the column without sorting again
+            order = Qt.SortOrder(meta["sortOrder"])
+            header.setSortIndicator(-1, order)
+        self._clearReplaceCache()
+        self.setSortingEnabled(meta["sortingEnabled"])
+        header.blockSignals(True)
+        try:
+            header.setSortIndicator(meta["sortColumn"], order)
+        finally:
+            header.blockSignals(False)
+        if len(self._filters) > 0 and numRows > 0:
+            self._applyFilters(0, numRows - 1)
+
+
+class TableModel(QAbstractTableModel):
+    """
+    [QAbstractTableModel](https://doc.qt.io/qt-6/qabstracttablemodel.html) that stores its data
+    in columns.
+
+    Each column is a list of cell values. Item data for other roles (e.g. `background` or
+    `toolTip`) is only stored once that role has been used.
+    [data][customQObjects.widgets.TableModel.data] is computed from these lists when the view
+    asks for it, so no object is created per cell.
+
+    Parameters
+    ----------
+    horizontalHeader : list[str], optional
+        Column names
+    verticalHeader : list[str], optional
+        Row names. If not provided, rows will be numbered from 1.
+    parent : QObject, optional
+        Parent object
+    """
+
+    roles = {
+        "background": Qt.BackgroundRole,
+        "checkState": Qt.CheckStateRole,
+        "data": Qt.UserRole,
+        "font": Qt.FontRole,
+        "foreground": Qt.ForegroundRole,
+        "icon": Qt.DecorationRole,
+        "sizeHint": Qt.SizeHintRole,
+        "statusTip": Qt.StatusTipRole,
+        "textAlignment": Qt.TextAlignmentRole,
+        "toolTip": Qt.ToolTipRole,
+        "whatsThis": Qt.WhatsThisRole,
+    }
+    """Item role for each kwarg accepted by [addRow][customQObjects.widgets.TableModel.addRow]"""
+
+    defaultFlags = (
+        Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable | Qt.ItemIsUserCheckable
+    )
+    """Flags returned for any item that has not had `flags` set"""
+
+    def __init__(self, horizontalHeader=None, verticalHeader=None, parent=None):
+        super().__init__(parent)
+        self._header = list(horizontalHeader) if horizontalHeader is not None else []
+        self._verticalHeader = verticalHeader
+        self._columns = [[] for _ in self._header]
+        self._roleData = {}
+        self._roleNames = {role: name for name, role in self.roles.items()}
+        self._rowCount = 0
+
+    @property
+    def header(self):
+        return self._header
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._rowCount
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._columns)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            if section < len(self._header):
+                return self._header[section]
+        elif self._verticalHeader is not None:
+            if section < len(self._verticalHeader):
+                return self._verticalHeader[section]
+        else:
+            return str(section + 1)
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        """
+        Return the data at `index`.
+
+        For the [Qt.DisplayRole](https://doc.qt.io/qt-6/qt.html#ItemDataRole-enum), the cell value
+        is returned as a string. For any other role, return the value given when the row was
+        added or updated, or None.
+        """
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole or role == Qt.EditRole:
+            value = self._columns[index.column()][index.row()]
+            if value is None or isinstance(value, str):
+                return value
+            return str(value)
+        name = self._roleNames.get(role, None)
+        if name is None or name not in self._roleData:
+            return None
+        return self._roleData[name][index.column()][index.row()]
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid():
+            return False
+        if role == Qt.DisplayRole or role == Qt.EditRole:
+            self._columns[index.column()][index.row()] = value
+        else:
+            name = self._roleNames.get(role, None)
+            if name is None:
+                return False
+            self._roleColumns(name)[index.column()][index.row()] = value
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        if "flags" in self._roleData:
+            flags = self._roleData["flags"][index.column()][index.row()]
+            if flags is not None:
+                return flags
+        return self.defaultFlags
+
+    def _roleColumns(self, name):
+        """Return list of columns for role `name`, creating it if necessary"""
+        if name not in self._roleData:
+            self._roleData[name] = [[None] * self._rowCount for _ in self._columns]
+        return self._roleData[name]
+
+    def _parseRowKwargs(self, **kwargs):
+        """Return dict of role name and list of values for each column"""
+        d = {}
+        for name, value in kwargs.items():
+            if name != "flags" and name not in self.roles:
+                raise ValueError(f"TableModel has no item role '{name}'")
+            if not isinstance(value, (list, tuple)):
+                if name in ["background", "foreground"]:
+                    value = makeBrush(value)
+                value = [value] * len(self._columns)
+            elif name in ["background", "foreground"]:
+                value = [makeBrush(v) for v in value]
+            if len(value) != len(self._columns):
+                msg = f"List of {len(self._columns)} values needed, got {value}"
+                raise ValueError(msg)
+            d[name] = value
+        return d
+
+    def _splitRow(self, row):
+        """Return list of text and list of icons (or None, if there are no icons) from `row`"""
+        icons = None
+        values = list(row)
+        for col, arg in enumerate(values):
+            if isinstance(arg, (tuple, list)):
+                if icons is None:
+                    icons = [None] * len(values)
+                icons[col], values[col] = arg
+        return values, icons
+
+    def addRow(self, row: list, **kwargs):
+        """
+        Add row to the model
+
+        Parameters
+        ----------
+        row : list, tuple
+            Sequence of values or (icon, value) pairs
+        kwargs
+            Item data for any of the [roles][customQObjects.widgets.TableModel.roles], or `flags`.
+            Values can be given as a single value for the whole row or a list with one value
+            per column.
+        """
+        self.addRows([row], **kwargs)
+
+    def addRows(self, rows: list, **kwargs):
+        """
+        Add multiple rows to the model, with a single insert notification
+
+        Parameters
+        ----------
+        rows : list
+            List of rows, where each row is a sequence of values or (icon, value) pairs
+        kwargs
+            Item data, as for [addRow][customQObjects.widgets.TableModel.addRow].
+            These are applied to every row.
+        """
+        if not isinstance(rows, list):
+            rows = list(rows)
+        if len(rows) == 0:
+            return
+        if len(self._columns) == 0:
+            self._columns = [[] for _ in rows[0]]
+        numCols = len(self._columns)
+        for row in rows:
+            if len(row) != numCols:
+                msg = f"List of {numCols} values needed, got {row}"
+                raise ValueError(msg)
+        kwargs = self._parseRowKwargs(**kwargs)
+
+        numRows = len(rows)
+        newColumns = [list(column) for column in zip(*rows)]
+        icons = None
+        for col, column in enumerate(newColumns):
+            for idx, arg in enumerate(column):
+                if isinstance(arg, (tuple, list)):
+                    if icons is None:
+                        defaultIcons = kwargs.get("icon", [None] * numCols)
+                        icons = [[icon] * numRows for icon in defaultIcons]
+                    icons[col][idx], column[idx] = arg
+        for name in kwargs:
+            self._roleColumns(name)
+        if icons is not None:
+            self._roleColumns("icon")
+
+        rowNum = self._rowCount
+        self.beginInsertRows(QModelIndex(), rowNum, rowNum + numRows - 1)
+        for column, values in zip(self._columns, newColumns):
+            column.extend(values)
+        for name, columns in self._roleData.items():
+            if name == "icon" and icons is not None:
+                for column, values in zip(columns, icons):
+                    column.extend(values)
+                continue
+            roleValues = kwargs.get(name, [None] * numCols)
+            for column, value in zip(columns, roleValues):
+                column.extend([value] * numRows)
+        self._rowCount += numRows
+        self.endInsertRows()
+
+    def updateRow(self, idx: int, row: list, **kwargs):
+        """
+        Update data in row number `idx`
+
+        See [addRow][customQObjects.widgets.TableModel.addRow] for args.
+        """
+        values, icons = self._splitRow(row)
+        kwargs = self._parseRowKwargs(**kwargs)
+        if icons is not None:
+            kwargs["icon"] = icons
+        for column, value in zip(self._columns, values):
+            column[idx] = value
+        for name, roleValues in kwargs.items():
+            for column, value in zip(self._roleColumns(name), roleValues):
+                column[idx] = value
+        self.dataChanged.emit(self.index(idx, 0), self.index(idx, len(self._columns) - 1))
+
+    def insertRows(self, row, count, parent=QModelIndex()):
+        if parent.isValid() or row < 0 or row > self._rowCount:
+            return False
+        self.beginInsertRows(parent, row, row + count - 1)
+        for column in self._columns:
+            column[row:row] = [""] * count
+        for columns in self._roleData.values():
+            for column in columns:
+                column[row:row] = [None] * count
+        self._rowCount += count
+        self.endInsertRows()
+        return True
+
+    def removeRows(self, row, count, parent=QModelIndex()):
+        if parent.isValid() or row < 0 or row + count > self._rowCount:
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        for column in self._columns:
+            del column[row : row + count]
+        for columns in self._roleData.values():
+            for column in columns:
+                del column[row : row + count]
+        self._rowCount -= count
+        self.endRemoveRows()
+        return True
+
+    def clear(self):
+        """Remove all rows"""
+        self.beginResetModel()
+        self._columns = [[] for _ in self._columns]
+        self._roleData = {}
+        self._rowCount = 0
+        self.endResetModel()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Sort rows by `column`"""
+        if column < 0 or column >= len(self._columns):
+            return
+        values = self._columns[column]
+        reverse = order == Qt.DescendingOrder
+        try:
+            rows = sorted(range(self._rowCount), key=values.__getitem__, reverse=reverse)
+        except TypeError:
+            rows = sorted(range(self._rowCount), key=lambda i: str(values[i]), reverse=reverse)
+        self._permuteRows(rows)
+
+    def _permuteRows(self, rows):
+        """Reorder rows so that new row `i` is old row `rows[i]`"""
+        self.layoutAboutToBeChanged.emit()
+        self._columns = [[column[i] for i in rows] for column in self._columns]
+        for name, columns in self._roleData.items():
+            self._roleData[name] = [[column[i] for i in rows] for column in columns]
+        newRow = [0] * len(rows)
+        for new, old in enumerate(rows):
+            newRow[old] = new
+        oldIndexes = self.persistentIndexList()
+        newIndexes = [self.index(newRow[idx.row()], idx.column()) for idx in oldIndexes]
+        self.changePersistentIndexList(oldIndexes, newIndexes)
+        self.layoutChanged.emit()
+
+    def rowData(self, idx: int) -> list:
+        """Return list of values in row `idx`"""
+        return [column[idx] for column in self._columns]
+
+    def columnData(self, idx: int) -> list:
+        """Return list of values in column `idx`"""
+        return list(self._columns[idx])
+
+    def findRow(self, column: int, value) -> int:
+        """Return index of first row where `column` is `value`, or -1 if not found"""
+        try:
+            return self._columns[column].index(value)
+        except ValueError:
+            return -1
+
+    def findRows(self, column: int, value) -> list:
+        """Return list of indices of all rows where `column` is `value`"""
+        return [idx for idx, v in enumerate(self._columns[column]) if v == value]
+
+
+class SortFilterProxyModel(QAbstractProxyModel):
+    """
+    Proxy model that sorts and filters the rows of its source model, using precomputed sort keys.
+
+    Each column can be given a type with
+    [setColumnType][customQObjects.widgets.SortFilterProxyModel.setColumnType], so that numbers
+    and dates are sorted by value, rather than as text. The sort key for every row of a column
+    is computed once and cached, so the rows can then be sorted with a single call to `sorted`,
+    without calling back into the model for every comparison.
+
+    Filters are applied in one pass over the columns they test, to find the rows to show.
+
+    When the source model is a [TableModel][customQObjects.widgets.TableModel], values are read
+    directly from its columns. Otherwise, the display text is used.
+
+    Parameters
+    ----------
+    sourceModel : QAbstractItemModel, optional
+        Model to sort and filter
+    parent : QObject, optional
+        Parent object
+    """
+
+    maxIncrementalRows = 64
+    """
+    If no more than this many rows are appended to the source model while sorted, they are
+    inserted in place; otherwise, the proxy is re-sorted.
+    """
+
+    def __init__(self, sourceModel=None, parent=None):
+        super().__init__(parent)
+        self._columnTypes = {}
+        self._keys = {}
+        self._filters = {}
+        self._sortColumn = -1
+        self._sortOrder = Qt.AscendingOrder
+        self._rows = []
+        self._proxyRows = None
+        self._resetting = False
+        if sourceModel is not None:
+            self.setSourceModel(sourceModel)
+
+    def _sourceSignals(self, model):
+        """Return list of signal, slot pairs connected to the source model"""
+        return [
+            (model.dataChanged, self._sourceDataChanged),
+            (model.headerDataChanged, self.headerDataChanged),
+            (model.rowsAboutToBeInserted, self._sourceRowsAboutToBeInserted),
+            (model.rowsInserted, self._sourceRowsInserted),
+            (model.rowsAboutToBeRemoved, self._beginSourceChange),
+            (model.rowsRemoved, self._endSourceChange),
+            (model.rowsAboutToBeMoved, self._beginSourceChange),
+            (model.rowsMoved, self._endSourceChange),
+            (model.columnsAboutToBeInserted, self._beginSourceChange),
+            (model.columnsInserted, self._endSourceChange),
+            (model.columnsAboutToBeRemoved, self._beginSourceChange),
+            (model.columnsRemoved, self._endSourceChange),
+            (model.layoutAboutToBeChanged, self._beginSourceChange),
+            (model.layoutChanged, self._endSourceChange),
+            (model.modelAboutToBeReset, self._beginSourceChange),
+            (model.modelReset, self._endSourceChange),
+        ]
+
+    def setSourceModel(self, model):
+        old = self.sourceModel()
+        if old is not None:
+            for signal, slot in self._sourceSignals(old):
+                signal.disconnect(slot)
+        self.beginResetModel()
+        super().setSourceModel(model)
+        for signal, slot in self._sourceSignals(model):
+            signal.connect(slot)
+        self._keys.clear()
+        self._rebuild()
+        self.endResetModel()
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or row < 0 or row >= len(self._rows):
+            return QModelIndex()
+        if column < 0 or column >= self.columnCount():
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QModelIndex()):
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid() or self.sourceModel() is None:
+            return 0
+        return self.sourceModel().columnCount()
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        source = self.sourceModel()
+        if source is None:
+            return None
+        if orientation == Qt.Vertical:
+            if section < 0 or section >= len(self._rows):
+                return None
+            section = self._rows[section]
+        return source.headerData(section, orientation, role)
+
+    def mapToSource(self, proxyIndex):
+        if not proxyIndex.isValid():
+            return QModelIndex()
+        return self.sourceModel().index(self._rows[proxyIndex.row()], proxyIndex.column())
+
+    def mapFromSource(self, sourceIndex):
+        if not sourceIndex.isValid():
+            return QModelIndex()
+        row = self.proxyRow(sourceIndex.row())
+        if row < 0:
+            return QModelIndex()
+        return self.index(row, sourceIndex.column())
+
+    def sourceRow(self, row: int) -> int:
+        """Return source model row shown at `row`"""
+        return self._rows[row]
+
+    def sourceRows(self) -> list:
+        """Return list of source model rows, in the order they are shown"""
+        return list(self._rows)
+
+    def proxyRow(self, sourceRow: int) -> int:
+        """Return row at which `sourceRow` is shown, or -1 if it is filtered out"""
+        if self._proxyRows is None:
+            self._proxyRows = [-1] * self.sourceModel().rowCount()
+            for row, source in enumerate(self._rows):
+                self._proxyRows[source] = row
+        return self._proxyRows[sourceRow]
+
+    def setColumnType(self, column: int, columnType):
+        """
+        Set how values in `column` are sorted.
+
+        Parameters
+        ----------
+        column : int
+            Column index
+        columnType : {'str', 'natural', 'numeric', 'date', callable}
+            'str' sorts values as text, which is the default.
+            'natural' sorts text with any numbers in it compared by value, e.g. 'item2' before
+            'item10'.
+            'numeric' and 'date' sort values as numbers and dates; values that cannot be
+            converted (dates should be in ISO format) are sorted last.
+            Alternatively, pass a function that takes a value and returns its sort key.
+        """
+        _keyFunction(columnType)
+        self._columnTypes[column] = columnType
+        self._keys.pop(column, None)
+        if column == self._sortColumn:
+            self.sort(self._sortColumn, self._sortOrder)
+
+    def columnType(self, column: int):
+        """
+        Return type of `column`.
+        See [setColumnType][customQObjects.widgets.SortFilterProxyModel.setColumnType].
+        """
+        return self._columnTypes.get(column, "str")
+
+    def setFilter(self, column: int, predicate):
+        """
+        Only show rows where `predicate` returns True for the value in `column`.
+
+        If there are filters on several columns, all must be True for a row to be shown.
+        If `predicate` raises a TypeError or ValueError, this is treated as False.
+        If `predicate` is None, remove the filter on `column`.
+        """
+        if predicate is None:
+            self._filters.pop(column, None)
+        else:
+            self._filters[column] = _filterFunction(predicate)
+        self.beginResetModel()
+        self._rebuild()
+        self.endResetModel()
+
+    def clearFilters(self):
+        """Remove all filters"""
+        self._filters.clear()
+        self.beginResetModel()
+        self._rebuild()
+        self.endResetModel()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Sort rows by `column`. If `column` is -1, restore the source model order."""
+        self._sortColumn = column
+        self._sortOrder = order
+        self._resort()
+
+    def _resort(self):
+        """Sort rows, updating persistent indexes"""
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        sourceIndexes = [(self._rows[idx.row()], idx.column()) for idx in persistent]
+        self._sortRows()
+        newIndexes = [self.index(self.proxyRow(row), col) for row, col in sourceIndexes]
+        self.changePersistentIndexList(persistent, newIndexes)
+        self.layoutChanged.emit()
+
+    def _columnValues(self, column, start=0, stop=None) -> list:
+        """Return list of values in `column` of the source model, from row `start` to `stop`"""
+        source = self.sourceModel()
+        if isinstance(source, TableModel):
+            return source._columns[column][start:stop]
+        if stop is None:
+            stop = source.rowCount()
+        index = source.index
+        return [index(row, column).data() for row in range(start, stop)]
+
+    def _sortKeys(self, column) -> list:
+        """Return list of sort keys for every source row in `column`"""
+        keys = self._keys.get(column, None)
+        if keys is None:
+            keys = _makeSortKeys(self._columnValues(column), self.columnType(column))
+            self._keys[column] = keys
+        return keys
+
+    def _acceptedRows(self, start, stop) -> list:
+        """Return list of source rows from `start` to `stop` that pass the filters"""
+        if len(self._filters) == 0:
+            return list(range(start, stop))
+        columns = [self._columnValues(column, start, stop) for column in self._filters]
+        mask = _filterMask(columns, list(self._filters.values()))
+        return [row for row, accepted in enumerate(mask, start=start) if accepted]
+
+    def _sortRows(self):
+        """Sort `_rows` in place"""
+        self._proxyRows = None
+        if self._sortColumn < 0 or self._sortColumn >= self.columnCount():
+            self._rows.sort()
+            return
+        keys = self._sortKeys(self._sortColumn)
+        self._rows.sort(key=keys.__getitem__, reverse=self._sortOrder == Qt.DescendingOrder)
+
+    def _rebuild(self):
+        """Filter and sort all rows"""
+        source = self.sourceModel()
+        self._rows = [] if source is None else self._acceptedRows(0, source.rowCount())
+        self._sortRows()
+
+    def _beginSourceChange(self, *args):
+        if not self._resetting:
+            self._resetting = True
+            self.beginResetModel()
+
+    def _endSourceChange(self, *args):
+        if self._resetting:
+            self._keys.clear()
+            self._rebuild()
+            self._resetting = False
+            self.endResetModel()
+
+    def _sourceRowsAboutToBeInserted(self, parent, first, last):
+        if first != self.sourceModel().rowCount():
+            # rows inserted before the end change the source row numbers, so reset
+            self._beginSourceChange()
+
+    def _sourceRowsInserted(self, parent, first, last):
+        if self._resetting:
+            self._endSourceChange()
+            return
+        for column, keys in self._keys.items():
+            values = self._columnValues(column, first, last + 1)
+            keys.extend(_makeSortKeys(values, self.columnType(column)))
+        self._proxyRows = None
+        rows = self._acceptedRows(first, last + 1)
+        if len(rows) == 0:
+            return
+        if self._sortColumn < 0:
+            start = len(self._rows)
+            self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+            self._rows.extend(rows)
+            self.endInsertRows()
+        elif len(rows) <= self.maxIncrementalRows:
+            keys = self._sortKeys(self._sortColumn)
+            descending = self._sortOrder == Qt.DescendingOrder
+            keyAt = lambda i: keys[self._rows[i]]
+            for row in rows:
+                pos = _insertPosition(len(self._rows), keyAt, keys[row], descending)
+                self.beginInsertRows(QModelIndex(), pos, pos)
+                self._rows.insert(pos, row)
+                self.endInsertRows()
+        else:
+            start = len(self._rows)
+            self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+            self._rows.extend(rows)
+            self.endInsertRows()
+            self._resort()
+
+    def _sourceDataChanged(self, topLeft, bottomRight, roles=[]):
+        if self._resetting:
+            return
+        first, last = topLeft.row(), bottomRight.row()
+        columns = range(topLeft.column(), bottomRight.column() + 1)
+        textChanged = len(roles) == 0 or Qt.DisplayRole in roles or Qt.EditRole in roles
+        if textChanged:
+            for column in columns:
+                keys = self._keys.get(column, None)
+                if keys is not None:
+                    values = self._columnValues(column, first, last + 1)
+                    keys[first : last + 1] = _makeSortKeys(values, self.columnType(column))
+            if any(col in self._filters for col in columns):
+                self.beginResetModel()
+                self._rebuild()
+                self.endResetModel()
+                return
+            if self._sortColumn in columns:
+                self._resort()
+                return
+        proxyRows = [self.proxyRow(row) for row in range(first, last + 1)]
+        proxyRows = [row for row in proxyRows if row >= 0]
+        if len(proxyRows) > 0:
+            self.dataChanged.emit(
+                self.index(min(proxyRows), columns[0]),
+                self.index(max(proxyRows), columns[-1]),
+                roles,
+            )
+
+
+class TableView(_TableMixin, QTableView):
+    """
+    [QTableView](https://doc.qt.io/qt-6/qtableview.html) with a
+    [TableModel][customQObjects.widgets.TableModel].
+
+    This has the same API as [TableWidget][customQObjects.widgets.TableWidget], but as the model
+    stores the data in columns, it can hold many more rows.
+
+    The model is shown through a
+    [SortFilterProxyModel][customQObjects.widgets.SortFilterProxyModel], so columns can be sorted
+    by type (see [setColumnType][customQObjects.widgets.TableView.setColumnType]) and rows can be
+    filtered (see [setFilter][customQObjects.widgets.TableView.setFilter]). Row numbers passed to
+    and returned from the methods here are rows as shown in the view.
+
+    As there are no items, the values stored in the model are returned, rather than text and
+    [QTableWidgetItems](https://doc.qt.io/qt-6/qtablewidgetitem.html):
+    [rowData][customQObjects.widgets.TableView.rowData],
+    [rowWhere][customQObjects.widgets.TableView.rowWhere] and
+    [rowsWhere][customQObjects.widgets.TableView.rowsWhere] return the values as they were
+    added, which are only text if strings were added, and
+    [columnData][customQObjects.widgets.TableView.columnData] returns a list of values, rather
+    than items. Use `str(value)` for the text shown in the view.
+
+    Parameters
+    ----------
+    horizontalHeader : list[str], optional
+        Column names
+    verticalHeader : list[str], optional
+        Row names
+    resizeMode : {list, QHeaderView.ResizeMode, str}, optional
+        See [setResizeMode][customQObjects.widgets.TableView.setResizeMode]
+    model : TableModel, optional
+        Model to use. If not provided, a new [TableModel][customQObjects.widgets.TableModel] is
+        created.
+    """
+
+    def __init__(self, horizontalHeader=None, verticalHeader=None, resizeMode=None, model=None):
+        super().__init__()
+
+        if model is None:
+            model = TableModel(horizontalHeader, verticalHeader, parent=self)
+        self._sourceModel = model
+        self.setModel(SortFilterProxyModel(model, parent=self))
+
+        if resizeMode is not None:
+            self.setResizeMode(resizeMode)
+
+        self._header = model.header
+
+    def sourceModel(self) -> TableModel:
+        """Return the [TableModel][customQObjects.widgets.TableModel]"""
+        return self._sourceModel
+
+    @property
+    def columnCount(self):
+        return self._sourceModel.columnCount()
+
+    @property
+    def rowCount(self):
+        return self.model().rowCount()
+
+    def clearTable(self):
+        self._sourceModel.clear()
+
+    def removeRow(self, idx: int):
+        """Remove row `idx`"""
+        self._sourceModel.removeRow(self.model().sourceRow(idx))
+
+    def addRow(self, row: list, **kwargs):
+        """
+        Add row to table
+
+        Parameters
+        ----------
+        row : list, tuple
+            Sequence of values or (icon, value) pairs
+        kwargs
+            Any QTableWidgetItem setter name can be passed here, e.g.
+            `toolTip='this is the tool tip'`, and the value will be returned by the model for the
+            corresponding role.
+            `background` and `foreground` can be passed with a
+            [QBrush](https://doc.qt.io/qt-6/qbrush.html),
+            [QColor](https://doc.qt.io/qt-6/qcolor.html) or any valid QColor arg.
+        """
+        self.addRows([row], **kwargs)
+
+    def addRows(self, rows: list, **kwargs):
+        """
+        Add multiple rows to the end of the table
+
+        See [addRow][customQObjects.widgets.TableView.addRow] for kwargs, which are applied to
+        every row.
+        """
+        selected = kwargs.pop("selected", None)
+        first = self._sourceModel.rowCount()
+        self._sourceModel.addRows(rows, **kwargs)
+        if selected is not None:
+            self._selectRows(range(first, self._sourceModel.rowCount()), selected)
+
+    def updateRow(self, idx: int, row: list, **kwargs):
+        """
+        Update data in row number `idx`
+
+        See [addRow][customQObjects.widgets.TableView.addRow] for args.
+        """
+        selected = kwargs.pop("selected", None)
+        sourceRow = self.model().sourceRow(idx)
+        self._sourceModel.updateRow(sourceRow, row, **kwargs)
+        if selected is not None:
+            self._selectRows([sourceRow], selected)
+
+    def _selectRows(self, sourceRows, selected):
+        """Select or deselect items in `sourceRows` of the source model"""
+        proxy = self.model()
+        rows = sorted(row for row in map(proxy.proxyRow, sourceRows) if row >= 0)
+        selectionModel = self.selectionModel()
+        for col, value in enumerate(self._makeRowArgs(selected)):
+            selection = QItemSelection()
+            for first, count in _runs(rows):
+                selection.select(proxy.index(first, col), proxy.index(first + count - 1, col))
+            flag = QItemSelectionModel.Select if value else QItemSelectionModel.Deselect
+            selectionModel.select(selection, flag)
+
+    def setColumnType(self, columnName, columnType):
+        """
+        Set how values in column `columnName` are sorted.
+
+        See [setColumnType][customQObjects.widgets.SortFilterProxyModel.setColumnType].
+        """
+        self.model().setColumnType(self.header.index(columnName), columnType)
+
+    def setFilter(self, columnName, predicate):
+        """
+        Only show rows where `predicate` returns True for the value in column `columnName`.
+
+        See [setFilter][customQObjects.widgets.SortFilterProxyModel.setFilter].
+        """
+        self.model().setFilter(self.header.index(columnName), predicate)
+
+    def clearFilters(self):
+        """Remove all filters"""
+        self.model().clearFilters()
+
+    def rowData(self, idx, returnType="dict"):
+        """
+        Return values in row `idx`, as dict with the header as keys or, if `returnType` is
+        'list', as list.
+
+        Unlike [TableWidget.rowData][customQObjects.widgets.TableWidget.rowData], these are the
+        values as they were added, not necessarily text.
+        """
+        values = self._sourceModel.rowData(self.model().sourceRow(idx))
+        return self._formatRow(values, returnType)
+
+    def columnData(self, name):
+        """
+        Return list of values in column `name`, in the order shown in the view.
+
+        Unlike [TableWidget.columnData][customQObjects.widgets.TableWidget.columnData], this
+        returns the values as they were added, rather than items.
+        """
+        idx = self.header.index(name)
+        values = self._sourceModel.columnData(idx)
+        return [values[row] for row in self.model().sourceRows()]
+
+    def _findRows(self, columnName, value) -> list:
+        """Return sorted list of rows shown in the view where `columnName` has `value`"""
+        col = self.header.index(columnName)
+        proxy = self.model()
+        rows = map(proxy.proxyRow, self._sourceModel.findRows(col, value))
+        return sorted(row for row in rows if row >= 0)
+
+    def rowWhere(self, columnName, value, returnType="dict"):
+        """
+        Return data from first row where column `columnName` has value `value`.
+
+        If no row is found, an empty dict or list is returned.
+        """
+        rows = self._findRows(columnName, value)
+        if len(rows) == 0:
+            return {} if returnType == "dict" else []
+        return self.rowData(rows[0], returnType)
+
+    def rowsWhere(self, columnName, value, returnType="dict") -> list:
+        """Return list of data from all rows where column `columnName` has value `value`."""
+        return [self.rowData(idx, returnType) for idx in self._findRows(columnName, value)]
+
+
+def _quote(name: str) -> str:
+    """Return `name` quoted as an SQL identifier"""
+    name = name.replace('"', '""')
+    return f'"{name}"'
+
+
+class SqliteTableModel(QAbstractTableModel):
+    """
+    Read-only [QAbstractTableModel](https://doc.qt.io/qt-6/qabstracttablemodel.html) that shows a
+    table from an SQLite database.
+
+    Rows are loaded in pages through
+    [canFetchMore](https://doc.qt.io/qt-6/qabstractitemmodel.html#canFetchMore) and
+    [fetchMore](https://doc.qt.io/qt-6/qabstractitemmodel.html#fetchMore), so views only load
+    rows as they are scrolled to. At most `maxPages` pages are kept in memory; when a page that
+    has been dropped is needed again, it is queried again.
+
+    Pages are queried by the value of the `orderBy` column (and the `rowid`) of the last row
+    on the previous page, rather than with `OFFSET`, so the cost of loading a page does not
+    depend on how far into the table it is. The `orderBy` column should therefore be indexed.
+    When rows are ordered by a column that contains NULLs, e.g. with
+    [sort](https://doc.qt.io/qt-6/qabstractitemmodel.html#sort), the NULLs come after all other
+    values in ascending order and before them in descending order.
+
+    Parameters
+    ----------
+    connection : {sqlite3.Connection, str, os.PathLike}
+        Database connection or path to database file
+    table : str
+        Name of table
+    columns : list[str], optional
+        Columns to show. If not provided, all columns in the table are shown.
+    where : str, optional
+        SQL expression to filter rows, e.g. `"level = ?"`
+    params : tuple, optional
+        Parameters for the `where` expression
+    orderBy : str, optional
+        Column to order rows by. Default is "rowid".
+    pageSize : int, optional
+        Number of rows per page. Default is 256.
+    maxPages : int, optional
+        Maximum number of pages to keep in memory. Default is 64.
+    parent : QObject, optional
+        Parent object
+    """
+
+    def __init__(
+        self,
+        connection,
+        table: str,
+        columns: list[str] = None,
+        where: str = None,
+        params: tuple = (),
+        orderBy: str = "rowid",
+        pageSize: int = 256,
+        maxPages: int = 64,
+        parent=None,
+    ):
+        super().__init__(parent)
+        if isinstance(connection, (str, os.PathLike)):
+            connection = sqlite3.connect(connection)
+        self._connection = connection
+        self._table = table
+        self._where = where
+        self._params = tuple(params)
+        self._pageSize = pageSize
+        self._maxPages = maxPages
+
+        if columns is None:
+            cursor = connection.execute(f"SELECT * FROM {_quote(table)} LIMIT 0")
+            columns = [description[0] for description in cursor.description]
+        self._header = list(columns)
+
+        self._defaultOrderBy = orderBy
+        self._setOrder(orderBy, Qt.AscendingOrder)
+        self._resetPages()
+
+    @property
+    def header(self):
+        return self._header
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        return self._connection
+
+    def _setOrder(self, orderBy, order):
+        """Set the key columns and direction used to query pages"""
+        self._keys = [orderBy] if orderBy == "rowid" else [orderBy, "rowid"]
+        self._descending = order == Qt.DescendingOrder
+
+    def _resetPages(self):
+        """Clear the page cache and the loaded rows"""
+        self._pages = OrderedDict()
+        # key of the last row on the previous page, for each page loaded so far
+        self._bounds = [None]
+        self._rowCount = 0
+        self._atEnd = False
+
+    def _select(self, columns, conditions=None, params=None, limit=None):
+        """Return SELECT statement and params from `columns` and `conditions` and `where`"""
+        sql = f"SELECT {', '.join(columns)} FROM {_quote(self._table)}"
+        allConditions = []
+        allParams = []
+        if self._where is not None:
+            allConditions.append(f"({self._where})")
+            allParams += self._params
+        if conditions is not None:
+            allConditions += conditions
+            allParams += params
+        if len(allConditions) > 0:
+            sql += " WHERE " + " AND ".join(allConditions)
+        direction = "DESC" if self._descending else "ASC"
+        terms = [f"{_quote(key)} {direction}" for key in self._keys]
+        if len(self._keys) > 1:
+            # SQLite orders NULLs first, so put them last, to match the keyset condition
+            terms.insert(0, f"{_quote(self._keys[0])} IS NULL {direction}")
+        sql += " ORDER BY " + ", ".join(terms)
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return sql, allParams
+
+    def _queryPage(self, page: int) -> list:
+        """Query rows in `page`. The last values in each row are the keys."""
+        columns = [_quote(name) for name in self._header + self._keys]
+        bound = self._bounds[page]
+        if bound is None:
+            sql, params = self._select(columns, limit=self._pageSize)
+        else:
+            condition, params = self._keysetCondition(bound)
+            sql, params = self._select(columns, [condition], params, limit=self._pageSize)
+        return self._connection.execute(sql, params).fetchall()
+
+    def _keysetCondition(self, bound) -> tuple[str, list]:
+        """
+        Return SQL condition and params for the rows after `bound`, the keys of the last row on
+        the previous page
+        """
+        op = "<" if self._descending else ">"
+        if len(self._keys) == 1:
+            return f"{_quote(self._keys[0])} {op} ?", list(bound)
+        # rows are ordered by (column IS NULL, column, rowid), reversed if descending, and
+        # comparisons with NULL are never true, so NULLs have to be handled separately
+        column = _quote(self._keys[0])
+        value, rowid = bound
+        if value is None:
+            if self._descending:
+                return f"({column} IS NOT NULL OR rowid < ?)", [rowid]
+            return f"({column} IS NULL AND rowid > ?)", [rowid]
+        condition = f"({column}, rowid) {op} (?, ?)"
+        if not self._descending:
+            condition = f"({column} IS NULL OR {condition})"
+        return condition, [value, rowid]
+
+    def _page(self, page: int) -> list:
+        """Return rows in `page`, from the cache if possible"""
+        rows = self._pages.get(page, None)
+        if rows is not None:
+            self._pages.move_to_end(page)
+            return rows
+        rows = self._queryPage(page)
+        self._cachePage(page, rows)
+        return rows
+
+    def _cachePage(self, page, rows):
+        """Add `rows` to page cache, removing least recently used pages if necessary"""
+        self._pages[page] = rows
+        while len(self._pages) > self._maxPages:
+            self._pages.popitem(last=False)
+
+    def rowCount(self, parent=QModelIndex()):
+        """Return the number of rows loaded so far"""
+        if parent.isValid():
+            return 0
+        return self._rowCount
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._header)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return not self._atEnd
+
+    def fetchMore(self, parent=QModelIndex()):
+        """Load the next page of rows"""
+        if parent.isValid() or self._atEnd:
+            return
+        page = len(self._bounds) - 1
+        rows = self._queryPage(page)
+        if len(rows) < self._pageSize:
+            self._atEnd = True
+        if len(rows) == 0:
+            return
+        numKeys = len(self._keys)
+        self.beginInsertRows(QModelIndex(), self._rowCount, self._rowCount + len(rows) - 1)
+        self._cachePage(page, rows)
+        self._bounds.append(rows[-1][-numKeys:])
+        self._rowCount += len(rows)
+        self.endInsertRows()
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            if section < len(self._header):
+                return self._header[section]
+            return None
+        return str(section + 1)
+
+    def data(self, index, role=Qt.DisplayRole):
+        """
+        Return the data at `index`.
+
+        For the [Qt.DisplayRole](https://doc.qt.io/qt-6/qt.html#ItemDataRole-enum), the value is
+        returned as a string. For the
+        [Qt.EditRole](https://doc.qt.io/qt-6/qt.html#ItemDataRole-enum), the value is returned as
+        it was stored in the database.
+        """
+        if not index.isValid():
+            return None
+        if role != Qt.DisplayRole and role != Qt.EditRole:
+            return None
+        value = self.rowData(index.row())[index.column()]
+        if role == Qt.DisplayRole and value is not None:
+            return str(value)
+        return value
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsSelectable | Qt.ItemIsEnabled
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Order rows by `column`. If `column` is -1, use the `orderBy` column."""
+        orderBy = self._defaultOrderBy if column < 0 else self._header[column]
+        self.beginResetModel()
+        self._setOrder(orderBy, order)
+        self._resetPages()
+        self.endResetModel()
+
+    def refresh(self):
+        """Drop all loaded rows, so they are queried again"""
+        self.beginResetModel()
+        self._resetPages()
+        self.endResetModel()
+
+    def rowData(self, idx: int) -> list:
+        """Return list of values in row `idx`. The row must already have been loaded."""
+        if idx < 0 or idx >= self._rowCount:
+            raise IndexError(f"Row {idx} has not been loaded")
+        row = self._page(idx // self._pageSize)[idx % self._pageSize]
+        return list(row[: len(self._header)])
+
+    def columnData(self, idx: int) -> list:
+        """Return list of all values in column `idx`, including rows that have not been loaded"""
+        sql, params = self._select([_quote(self._header[idx])])
+        return [row[0] for row in self._connection.execute(sql, params)]
+
+    def findRows(self, column: int, value, limit: int = None) -> list:
+        """
+        Return list of rows where `column` is `value`, including rows that have not been loaded.
+
+        This is an SQL query, so will use an index on `column` if there is one (see
+        [createColumnIndex][customQObjects.widgets.SqliteTableModel.createColumnIndex]).
+        """
+        columns = [_quote(name) for name in self._header]
+        condition = f"{_quote(self._header[column])} = ?"
+        sql, params = self._select(columns, [condition], [value], limit=limit)
+        return [list(row) for row in self._connection.execute(sql, params)]
+
+    def createColumnIndex(self, columnName: str, unique: bool = False):
+        """
+        Create an index on `columnName` in the database, if it doesn't already exist.
+
+        This is not called `createIndex`, as that would hide the
+        [QAbstractItemModel](https://doc.qt.io/qt-6/qabstractitemmodel.html#createIndex) method.
+        """
+        name = _quote(f"idx_{self._table}_{columnName}")
+        kind = "UNIQUE INDEX" if unique else "INDEX"
+        sql = (
+            f"CREATE {kind} IF NOT EXISTS {name} "
+            f"ON {_quote(self._table)} ({_quote(columnName)})"
+        )
+        self._connection.execute(sql)
+        self._connection.commit()
+
+
+class SqliteTableView(_TableMixin, QTableView):
+    """
+    [QTableView](https://doc.qt.io/qt-6/qtableview.html) with a
+    [SqliteTableModel][customQObjects.widgets.SqliteTableModel].
+
+    Rows are loaded as the table is scrolled, so this can show tables with many millions of rows.
+    [rowWhere][customQObjects.widgets.SqliteTableView.rowWhere] and
+    [rowsWhere][customQObjects.widgets.SqliteTableView.rowsWhere] query the database, so will
+    find rows that have not been loaded yet.
+
+    Parameters
+    ----------
+    connection : {sqlite3.Connection, str, os.PathLike}, optional
+        Database connection or path to database file
+    table : str, optional
+        Name of table
+    resizeMode : {list, QHeaderView.ResizeMode, str}, optional
+        See [setResizeMode][customQObjects.widgets.SqliteTableView.setResizeMode]
+    model : SqliteTableModel, optional
+        Model to use. If not provided, a new
+        [SqliteTableModel][customQObjects.widgets.SqliteTableModel] is created from `connection`,
+        `table` and `kwargs`.
+    kwargs
+        [SqliteTableModel][customQObjects.widgets.SqliteTableModel] kwargs
+    """
+
+    def __init__(self, connection=None, table=None, resizeMode=None, model=None, **kwargs):
+        super().__init__()
+
+        if model is None:
+            model = SqliteTableModel(connection, table, parent=self, **kwargs)
+        self.setModel(model)
+
+        if resizeMode is not None:
+            self.setResizeMode(resizeMode)
+
+        self._header = model.header
+
+    @property
+    def columnCount(self):
+        return self.model().columnCount()
+
+    @property
+    def rowCount(self):
+        """Number of rows loaded so far"""
+        return self.model().rowCount()
+
+    def refresh(self):
+        """Reload rows from the database"""
+        self.model().refresh()
+
+    def createColumnIndex(self, columnName, unique=False):
+        """
+        Create an index on `columnName` in the database, so that
+        [rowWhere][customQObjects.widgets.SqliteTableView.rowWhere] can use it.
+        """
+        self.model().createColumnIndex(columnName, unique=unique)
+
+    def rowData(self, idx, returnType="dict"):
+        return self._formatRow(self.model().rowData(idx), returnType)
+
+    def columnData(self, name):
+        idx = self.header.index(name)
+        return self.model().columnData(idx)
+
+    def rowWhere(self, columnName, value, returnType="dict"):
+        """
+        Return data from first row where column `columnName` has value `value`.
+
+        If no row is found, an empty dict or list is returned.
+        """
+        col = self.header.index(columnName)
+        rows = self.model().findRows(col, value, limit=1)
+        if len(rows) == 0:
+            return {} if returnType == "dict" else []
+        return self._formatRow(rows[0], returnType)
+
+    def rowsWhere(self, columnName, value, returnType="dict") -> list:
+        """Return list of data from all rows where column `columnName` has value `value`."""
+        col = self.header.index(columnName)
+        return [self._formatRow(row, returnType) for row in self.model().findRows(col, value)]
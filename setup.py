@@ -18,5 +18,6 @@ setup(name='CustomPyQtObjects',
       description='A repo of convenience classes for PyQt/PySide objects.',
       author='Keziah Milligan',
       packages = find_packages(),
-      install_requires = ["QtPy"]
+      install_requires = ["QtPy"],
+      python_requires = ">=3.10"
      )
\ No newline at end of file
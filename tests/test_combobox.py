@@ -0,0 +1,204 @@
+import random
+import pytest
+from qtpy.QtCore import Qt
+from customQObjects.widgets import ComboBox, CompactComboBoxModel
+from customQObjects.widgets.combobox import ComboBoxItem, ComboBoxModel, _SearchIndex
+
+SYLLABLES = ["an", "ber", "co", "dra", "el", "fin", "gar", "hol", "is", "ka", "lo", "mer"]
+
+
+def makeName(rng):
+    return " ".join(
+        "".join(rng.choices(SYLLABLES, k=rng.randint(1, 3))).capitalize()
+        for _ in range(rng.randint(1, 2))
+    )
+
+
+def fuzzyEnd(name, query):
+    """Return index after the last character of `query` found in order in `name`, or -1"""
+    pos = 0
+    for c in query:
+        pos = name.find(c, pos)
+        if pos < 0:
+            return -1
+        pos += 1
+    return pos
+
+
+def expected(names, query, mode, limit=200):
+    query = query.lower()
+    names = [name.lower() for name in names]
+    if mode == "prefix":
+        scores = [(name, row) for row, name in enumerate(names) if name.startswith(query)]
+    elif mode == "substring":
+        scores = [(name.find(query), row) for row, name in enumerate(names) if query in name]
+    else:
+        scores = [(fuzzyEnd(name, query), row) for row, name in enumerate(names)]
+        scores = [score for score in scores if score[0] >= 0]
+    return [row for _, row in sorted(scores)[:limit]]
+
+
+@pytest.fixture
+def names():
+    rng = random.Random(3)
+    return [makeName(rng) for _ in range(2000)]
+
+
+@pytest.fixture
+def combo(qapp, names):
+    combo = ComboBox(values=[ComboBoxItem(name, row) for row, name in enumerate(names)])
+    yield combo
+    combo.deleteLater()
+
+
+QUERIES = [("prefix", "ber"), ("substring", "an"), ("substring", "garis"), ("fuzzy", "bkl")]
+
+
+@pytest.mark.parametrize("build", [False, True])
+@pytest.mark.parametrize("mode,query", QUERIES)
+def test_search(names, mode, query, build):
+    index = _SearchIndex(len(names), lambda first, last: names[first : last + 1])
+    if build:
+        index.build()
+    # search each prefix of the query, as when typing, so previous results are narrowed
+    for k in range(1, len(query) + 1):
+        assert index.search(query[:k], mode, limit=50) == expected(names, query[:k], mode, 50)
+        assert index.finished
+
+
+def test_search_time_budget(names):
+    index = _SearchIndex(len(names), lambda first, last: names[first : last + 1])
+    index.scanChunkSize = 64
+    index.search("a", "fuzzy", timeBudgetMs=0)
+    assert not index.finished
+    while not index.finished:
+        rows = index.resume(timeBudgetMs=0)
+    assert rows == expected(names, "a", "fuzzy")
+
+
+def test_search_truncated(names):
+    index = _SearchIndex(len(names), lambda first, last: names[first : last + 1])
+    index.maxCandidates = 100
+    rows = index.search("a", "substring", limit=10)
+    assert index.finished
+    assert index.truncated
+    assert len(rows) == 10
+    index.search("garis", "substring")
+    assert not index.truncated
+
+
+def test_filter_mode_builds_index_when_idle(combo, names):
+    combo.setFilterMode("substring")
+    index = combo._searchIndex
+    assert not index.namesRead
+    while not index.built:
+        combo._continueIndexBuild()
+    assert combo.matchingRows("ber", "substring") == expected(names, "ber", "substring")
+
+
+@pytest.mark.parametrize("build", [False, True])
+def test_index_updated(combo, names, build):
+    combo.setFilterMode("substring")
+    index = combo._searchIndex
+    if build:
+        index.build()
+    model = combo.model()
+    model.setData(model.index(5), "Zzz new name")
+    names[5] = "Zzz new name"
+    model.appendValues([ComboBoxItem("Appended zzz", -1)])
+    names.append("Appended zzz")
+    model.insertValues(10, [ComboBoxItem("Inserted zzz", -2)])
+    names.insert(10, "Inserted zzz")
+    model.removeRows(100, 3)
+    del names[100:103]
+    combo.removeItem(combo.count() - 1)
+    names.pop()
+    index = combo._searchIndex
+    for mode, query in QUERIES + [("substring", "zzz"), ("prefix", "zzz")]:
+        assert combo.matchingRows(query, mode) == expected(names, query, mode)
+    if build:
+        assert index.build()
+        for mode, query in QUERIES + [("substring", "zzz")]:
+            assert combo.matchingRows(query, mode) == expected(names, query, mode)
+
+
+def test_filter_items(combo, names):
+    combo.setFilterMode("fuzzy", maxResults=20)
+    combo._filterItems("bkl")
+    filterModel = combo._filterCompleter.model()
+    rows = [filterModel.sourceRow(row) for row in range(filterModel.rowCount())]
+    assert rows == expected(names, "bkl", "fuzzy", 20)
+
+
+def firstRow(values, field, key):
+    return next((row for row, item in enumerate(values) if getattr(item, field) == key), -1)
+
+
+def test_model_rows_updated(qapp):
+    rng = random.Random(1)
+
+    def makeItem():
+        return ComboBoxItem(
+            rng.choice("abcdef"), rng.choice([rng.randrange(6), str(rng.randrange(3)), [1]])
+        )
+
+    model = ComboBoxModel([makeItem() for _ in range(30)])
+    for _ in range(500):
+        op = rng.randrange(4)
+        if op == 0:
+            row = rng.randrange(model.rowCount())
+            if rng.random() < 0.5:
+                model.setData(model.index(row), rng.choice("abcdefg"))
+            else:
+                model.setData(model.index(row), rng.randrange(6), Qt.UserRole)
+        elif op == 1:
+            row = rng.randrange(model.rowCount() + 1)
+            model.insertValues(row, [makeItem() for _ in range(rng.randrange(1, 4))])
+        elif op == 2 and model.rowCount() > 5:
+            row = rng.randrange(model.rowCount() - 3)
+            model.removeRows(row, rng.randrange(1, 4))
+        else:
+            model.appendValues([makeItem()])
+        for name in "abcdefg":
+            assert model.rowOfName(name) == firstRow(model.values, "name", name)
+        for value in list(range(6)) + ["0", "1", [1]]:
+            assert model.rowOfValue(value) == firstRow(model.values, "value", value)
+
+
+def test_items(combo, names):
+    items = combo.items
+    assert items == tuple(names)
+    assert combo.items is items
+    model = combo.model()
+    model.setData(model.index(3), "changed")
+    model.insertValues(1, [ComboBoxItem("inserted", -1)])
+    model.removeRows(10, 2)
+    combo.addItem("added")
+    names[3] = "changed"
+    names.insert(1, "inserted")
+    del names[10:12]
+    names.append("added")
+    assert combo.items == tuple(names)
+
+
+def test_items_standard_model(qapp):
+    combo = ComboBox()
+    combo.addItems(["a", "b", "c"])
+    assert combo.items == ("a", "b", "c")
+    combo.setItemText(1, "x")
+    combo.insertItem(0, "y")
+    combo.removeItem(3)
+    assert combo.items == ("y", "a", "x")
+    combo.deleteLater()
+
+
+def test_compact_model_page_size(qapp):
+    names = [f"item{i}" for i in range(10)]
+    model = CompactComboBoxModel(((name, i) for i, name in enumerate(names)), pageSize=4)
+    assert model.rowCount() == 4
+    with pytest.raises(AttributeError):
+        model.pageSize = 3
+    model.fetchAll()
+    assert model.pageSize == 4
+    assert [model.itemName(row) for row in range(model.rowCount())] == names
+    assert [model.itemValue(row) for row in range(model.rowCount())] == list(range(10))
@@ -0,0 +1,59 @@
+import pytest
+from customQObjects.widgets import ListSelector
+
+
+def measured_extents(view, count):
+    """Return the extent of each of the first `count` items, measured from scratch"""
+    return [int(view._layout_text(idx).size().width()) + 2 * view.padding for idx in range(count)]
+
+
+@pytest.fixture
+def values():
+    return [f"value {'x' * (i % 7)} {i}" for i in range(1000)]
+
+
+def test_horizontal_lazy_layout(qapp, values):
+    selector = ListSelector(values=values, orientation="horizontal", virtual=True)
+    view = selector._view
+    assert view._measured == view.sample_size
+    assert len(view._offsets) == view.sample_size + 1
+    # the length is estimated until all items are measured
+    assert view._total_extent() > view._offsets[-1]
+
+    selector.set_current_index(500)
+    assert view._measured == 501
+    extents = measured_extents(view, len(values))
+    assert list(view._offsets) == [sum(extents[:idx]) for idx in range(502)]
+    assert view._index_at(view._offsets[300] + 1) == 300
+
+    selector.set_current_index(0)
+    selector.previous()
+    assert selector.current_index == 999
+    assert view._measured == len(values)
+    assert view._total_extent() == sum(extents)
+    selector.deleteLater()
+
+
+@pytest.mark.parametrize("orientation", ["horizontal", "vertical"])
+def test_layout_when_idle(qapp, values, orientation):
+    selector = ListSelector(values=values, orientation=orientation, virtual=True)
+    view = selector._view
+    assert view._layout_timer.isActive()
+    while view._layout_timer.isActive():
+        view._layout_timer.stop()
+        view._continue_layout()
+    assert view._measured == len(values)
+    selector.deleteLater()
+
+
+def test_vertical_width_grows(qapp, values):
+    values[600] = "amuchlongervaluethananyoftheothers"
+    selector = ListSelector(values=values, orientation="vertical", virtual=True)
+    view = selector._view
+    width = view.sizeHint().width()
+    selector.set_current_text(values[600])
+    assert selector.current_index == 600
+    view._text(600)
+    assert view.sizeHint().width() > width
+    assert view._item_size.width() == measured_extents(view, 601)[600]
+    selector.deleteLater()
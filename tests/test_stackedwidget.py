@@ -0,0 +1,156 @@
+import pytest
+from qtpy.QtCore import QCoreApplication, QEvent
+from qtpy.QtWidgets import QLineEdit
+from customQObjects.widgets import StackedWidget
+
+
+class Factory(object):
+    """Factory for lazy pages that records the pages it has made"""
+
+    def __init__(self, text=""):
+        self.text = text
+        self.pages = []
+
+    def __call__(self):
+        page = QLineEdit(self.text)
+        self.pages.append(page)
+        return page
+
+
+@pytest.fixture
+def stack(qapp):
+    stack = StackedWidget()
+    yield stack
+    stack.deleteLater()
+
+
+@pytest.fixture
+def factories(stack):
+    factories = {key: Factory(key) for key in "abcd"}
+    for key, factory in factories.items():
+        stack.addLazyWidget(key, factory, saveState=QLineEdit.text, restoreState=QLineEdit.setText)
+    return factories
+
+
+def test_lazy_pages_created_when_needed(stack, factories):
+    assert stack.count() == 4
+    assert not any(stack.isBuilt(key) for key in "abcd")
+    stack.setCurrentKey("c")
+    assert stack.isBuilt("c")
+    assert stack.currentWidget() is factories["c"].pages[0]
+    assert stack.keyOf(stack.currentWidget()) == "c"
+    assert stack.currentIndex() == 2
+    stack.setCurrentIndex(1)
+    assert stack.currentWidget() is factories["b"].pages[0]
+    assert stack["d"] is factories["d"].pages[0]
+    assert stack.currentIndex() == 1
+    assert not stack.isBuilt("a")
+    # pages are only created once
+    stack.setCurrentKey("c")
+    assert len(factories["c"].pages) == 1
+
+
+def test_lazy_first_page_created_when_shown(stack, factories):
+    assert stack.currentIndex() == 0
+    assert not stack.isBuilt("a")
+    stack.show()
+    assert stack.isBuilt("a")
+    assert stack.currentWidget() is factories["a"].pages[0]
+
+
+def test_lazy_pages_evicted(stack, factories):
+    stack.maxInactivePages = 1
+    stack.setCurrentKey("a")
+    stack.currentWidget().setText("edited")
+    stack.setCurrentKey("b")
+    stack.setCurrentKey("c")
+    # 'a' was least recently used, so evicted, with its state saved
+    assert not stack.isBuilt("a")
+    assert stack.isBuilt("b")
+    assert stack.isBuilt("c")
+    stack.setCurrentKey("a")
+    assert len(factories["a"].pages) == 2
+    assert stack.currentWidget().text() == "edited"
+    assert not stack.isBuilt("b")
+    assert stack.switchMetrics()["coldCount"] == 4
+
+
+def test_lazy_current_page_not_evicted(stack, factories):
+    stack.setCurrentKey("b")
+    stack.maxInactivePages = 0
+    assert stack.isBuilt("b")
+    assert stack.currentWidget() is factories["b"].pages[0]
+
+
+def deletePending():
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+
+def test_lazy_page_returned_at_limit(stack, factories):
+    stack.maxInactivePages = 0
+    stack.setCurrentKey("b")
+    page = stack["a"]
+    deletePending()
+    # the page is kept until it has been handed out
+    assert stack.isBuilt("a")
+    assert page.text() == "a"
+    assert stack["a"] is page
+    stack.setCurrentKey("c")
+    assert not stack.isBuilt("a")
+    assert not stack.isBuilt("b")
+
+
+def test_prewarm_page_not_evicted(stack, factories):
+    stack.maxInactivePages = 1
+    stack.setPrewarm("priority", keys=["b"], timeBudgetMs=0, delayMs=0)
+    stack.setCurrentKey("a")
+    stack._prewarmStep()
+    assert stack.isBuilt("b")
+    # building another page between prewarm steps doesn't evict the page being prepared
+    stack["c"]
+    deletePending()
+    assert stack.isBuilt("b")
+    while stack.isPrewarming():
+        stack._prewarmStep()
+    stack.setCurrentKey("b")
+    assert stack.switchLatencies[-1][2:] == (False, True)
+
+
+def test_remove_lazy_pages(stack, factories):
+    stack.maxInactivePages = 1
+    stack.setCurrentKey("b")
+    stack.setCurrentKey("a")
+    stack.removeWidget("b")
+    stack.removeWidget("a")
+    stack.removeWidget("c")
+    assert "a" not in stack
+    assert stack.count() == 1
+    assert stack.currentWidget() is stack["d"]
+    stack.setCurrentKey("d")
+    assert stack.currentWidget() is factories["d"].pages[0]
+    with pytest.raises(KeyError):
+        stack["a"]
+
+
+def test_prewarm_neighbours(stack, factories):
+    stack.setPrewarm("neighbours", count=2, delayMs=0)
+    stack.setCurrentKey("b")
+    while stack.isPrewarming():
+        stack._prewarmStep()
+    assert stack.isBuilt("a")
+    assert stack.isBuilt("c")
+    assert not stack.isBuilt("d")
+    stack.setCurrentKey("c")
+    assert stack.switchLatencies[-1][2:] == (False, True)
+
+
+def test_prewarm_removed_page(stack, factories):
+    stack.setPrewarm("priority", keys=["d", "c"], delayMs=0)
+    stack.setCurrentKey("a")
+    stack.removeWidget("d")
+    while stack.isPrewarming():
+        stack._prewarmStep()
+    assert stack.isBuilt("c")
+    assert factories["d"].pages == []
+    with pytest.raises(ValueError):
+        stack.setPrewarm("unknown")
@@ -0,0 +1,619 @@
+import io
+import sqlite3
+import pytest
+from qtpy.QtCore import QModelIndex, QPersistentModelIndex, Qt
+from qtpy.QtGui import QColor, QFont
+from qtpy.QtWidgets import QHeaderView, QLineEdit, QStyleOptionViewItem, QTableWidgetItem
+from customQObjects.widgets import tablewidget
+from customQObjects.widgets import ElideDelegate, SqliteTableModel, SqliteTableView
+from customQObjects.widgets import TableView, TableWidget
+
+
+@pytest.fixture
+def table(qapp):
+    table = TableWidget(horizontalHeader=["id", "name"])
+    table.addRows([[str(i), f"name{i}"] for i in range(5)])
+    table.createColumnIndex("id", unique=True)
+    yield table
+    table.deleteLater()
+
+
+def test_deferred_update_then_remove_row(table):
+    table.updateRow(2, ["2", "new"], deferred=True)
+    table.updateRow(3, ["3", "new"], deferred=True)
+    table.removeRow(2)
+    assert table.rowWhere("id", "2") == {}
+    assert table.rowWhere("id", "3") == {"id": "3", "name": "new"}
+
+
+def test_deferred_update_then_set_row_count(table):
+    table.updateRow(4, ["4", "new"], deferred=True)
+    table.setRowCount(3)
+    assert table.rowWhere("id", "4") == {}
+    table.flushUpdates()
+    assert table.rowCount == 3
+
+
+@pytest.mark.parametrize("method", ["clear", "clearContents"])
+def test_deferred_update_then_clear(table, method):
+    table.updateRow(1, ["1", "new"], deferred=True)
+    getattr(table, method)()
+    table.flushUpdates()
+    assert table.rowWhere("id", "1") == {}
+
+
+def tableRows(table):
+    return [table.rowData(row, returnType="list") for row in range(table.rowCount)]
+
+
+@pytest.mark.parametrize("columnType", [None, "str"])
+def test_deferred_update_then_sort(qapp, columnType):
+    table = TableWidget(horizontalHeader=["name", "value"])
+    table.addRows([["c", "3"], ["a", "1"], ["b", "2"]])
+    table.updateRow(0, ["c", "30"], deferred=True)
+    table.updateRow(2, ["d", "2"], deferred=True)
+    if columnType is not None:
+        table.setColumnType("name", columnType)
+    table.sortItems(0)
+    table.flushUpdates()
+    assert tableRows(table) == [["a", "1"], ["c", "30"], ["d", "2"]]
+    table.deleteLater()
+
+
+def test_deferred_update_then_replace_data(table):
+    table.updateRow(1, ["1", "new"], deferred=True)
+    table.replaceData([[str(i), f"name{i}"] for i in reversed(range(4))], "id")
+    table.flushUpdates()
+    assert tableRows(table) == [["3", "name3"], ["2", "name2"], ["1", "name1"], ["0", "name0"]]
+
+
+def test_deferred_update_then_restore_snapshot(table, tmp_path):
+    path = tmp_path / "table.snap"
+    table.saveSnapshot(path)
+    table.updateRow(1, ["1", "new"], deferred=True)
+    assert table.restoreSnapshot(path)
+    table.flushUpdates()
+    assert tableRows(table) == [[str(i), f"name{i}"] for i in range(5)]
+
+
+def test_index_set_item(table):
+    table.setItem(1, 0, QTableWidgetItem("new"))
+    assert table.rowWhere("id", "1") == {}
+    assert table.rowWhere("id", "new") == {"id": "new", "name": "name1"}
+
+
+def test_index_take_item(table):
+    item = table.takeItem(1, 0)
+    assert item.text() == "1"
+    assert table.rowWhere("id", "1") == {}
+    table.setItem(4, 0, item)
+    assert table.rowWhere("id", "1") == {"id": "1", "name": "name4"}
+    assert table.rowWhere("id", "4") == {}
+
+
+def test_index_model_remove_rows(table):
+    table.model().removeRows(1, 2)
+    assert table.rowWhere("id", "1") == {}
+    assert table.rowWhere("id", "3") == {"id": "3", "name": "name3"}
+    table.clearTable()
+    assert table.rowWhere("id", "0") == {}
+
+
+def test_index_insert_column(table):
+    table.insertColumn(0)
+    table._header = ["new", "id", "name"]
+    # values in the new column are not in the index, which has moved with its column
+    for row in range(table.rowCount):
+        table.setItem(row, 0, QTableWidgetItem("2"))
+    assert table.rowsWhere("id", "2") == [{"new": "2", "id": "2", "name": "name2"}]
+    assert len(table.rowsWhere("new", "2")) == 5
+    table.setItem(3, 1, QTableWidgetItem("three"))
+    assert table.rowWhere("id", "three") == {"new": "2", "id": "three", "name": "name3"}
+
+
+def test_index_remove_column(table):
+    table.createColumnIndex("name")
+    table.removeColumn(0)
+    table._header = ["name"]
+    assert table.rowWhere("name", "name3") == {"name": "name3"}
+    table.setColumnCount(0)
+    assert table._indexes == {}
+
+
+def test_index_sort(table):
+    table.setSortingEnabled(True)
+    table.sortItems(0, Qt.DescendingOrder)
+    assert table.rowWhere("id", "0") == {"id": "0", "name": "name0"}
+    assert table.item(4, 0).text() == "0"
+
+
+@pytest.fixture
+def numbers(qapp):
+    table = TableWidget(horizontalHeader=["name", "value"])
+    table.addRows([["c", "10"], ["a", "9"], ["d", "-1"], ["b", "100"]])
+    yield table
+    table.deleteLater()
+
+
+def test_typed_sort(numbers):
+    numbers.setColumnType("value", "numeric")
+    numbers.createColumnIndex("name")
+    numbers.setCurrentCell(1, 1)
+    numbers.item(3, 0).setSelected(True)
+    persistent = QPersistentModelIndex(numbers.model().index(3, 1))
+    layoutChanges = []
+    numbers.model().layoutChanged.connect(lambda *args: layoutChanges.append(args))
+    numbers.sortItems(1)
+    assert tableRows(numbers) == [["d", "-1"], ["a", "9"], ["c", "10"], ["b", "100"]]
+    assert len(layoutChanges) == 1
+    assert persistent.row() == 3
+    assert (numbers.currentRow(), numbers.currentColumn()) == (1, 1)
+    assert sorted(item.text() for item in numbers.selectedItems()) == ["9", "b"]
+    assert numbers.rowWhere("name", "c") == {"name": "c", "value": "10"}
+    numbers.sortItems(1, Qt.DescendingOrder)
+    assert [row[1] for row in tableRows(numbers)] == ["100", "10", "9", "-1"]
+    assert persistent.row() == 0
+
+
+def test_typed_sort_empty_cells(numbers):
+    numbers.setColumnType("value", "numeric")
+    numbers.takeItem(1, 0)
+    numbers.sortItems(1)
+    assert numbers.item(1, 0) is None
+    assert numbers.item(0, 0).text() == "d"
+    assert [numbers.item(row, 1).text() for row in range(4)] == ["-1", "9", "10", "100"]
+
+
+@pytest.mark.parametrize("columnType", [None, "numeric"])
+def test_sort_filtered(numbers, columnType):
+    if columnType is not None:
+        numbers.setColumnType("value", columnType)
+    numbers.setFilter("name", lambda name: name != "a")
+    numbers.sortItems(1)
+    hidden = [numbers.item(row, 0).text() for row in range(4) if numbers.isRowHidden(row)]
+    assert hidden == ["a"]
+
+
+@pytest.mark.parametrize("columnType", [None, "numeric"])
+def test_insert_while_sorted(numbers, columnType):
+    if columnType is not None:
+        numbers.setColumnType("value", columnType)
+    numbers.setSortingEnabled(True)
+    numbers.sortItems(0)
+    numbers.setFilter("name", lambda name: name != "aa")
+    numbers.addRow(["aa", "1"])
+    numbers.addRow(["e", "2"])
+    names = [row[0] for row in tableRows(numbers)]
+    assert names == ["a", "aa", "b", "c", "d", "e"]
+    hidden = [names[row] for row in range(len(names)) if numbers.isRowHidden(row)]
+    assert hidden == ["aa"]
+
+
+@pytest.fixture
+def sqliteModel(qapp):
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE data (id INTEGER, name TEXT)")
+    connection.executemany("INSERT INTO data VALUES (?, ?)", [(i, f"name{i}") for i in range(10)])
+    model = SqliteTableModel(connection, "data")
+    yield model
+    connection.close()
+
+
+def test_sqlite_create_column_index(sqliteModel):
+    sqliteModel.createColumnIndex("name", unique=True)
+    indexes = sqliteModel.connection.execute("PRAGMA index_list(data)").fetchall()
+    assert [(row[1], row[2]) for row in indexes] == [("idx_data_name", 1)]
+    assert sqliteModel.findRows(1, "name3") == [[3, "name3"]]
+
+
+def test_sqlite_model_create_index(sqliteModel):
+    # QAbstractItemModel.createIndex is not hidden
+    idx = sqliteModel.createIndex(2, 1)
+    assert (idx.row(), idx.column()) == (2, 1)
+    sqliteModel.fetchMore(QModelIndex())
+    assert sqliteModel.data(sqliteModel.index(2, 1), Qt.DisplayRole) == "name2"
+
+
+def test_sqlite_view_create_column_index(qapp, sqliteModel):
+    view = SqliteTableView(model=sqliteModel)
+    view.createColumnIndex("id")
+    indexes = sqliteModel.connection.execute("PRAGMA index_list(data)").fetchall()
+    assert [row[1] for row in indexes] == ["idx_data_id"]
+    assert view.rowWhere("id", 4) == {"id": 4, "name": "name4"}
+    view.deleteLater()
+
+
+def fetchAll(model):
+    while model.canFetchMore(QModelIndex()):
+        model.fetchMore(QModelIndex())
+    return [model.rowData(row) for row in range(model.rowCount())]
+
+
+@pytest.mark.parametrize("order", [Qt.AscendingOrder, Qt.DescendingOrder])
+def test_sqlite_sort_nulls(order):
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE data (a INTEGER, b INTEGER)")
+    rows = [(i, None if i % 2 else i % 3) for i in range(10)]
+    connection.executemany("INSERT INTO data VALUES (?, ?)", rows)
+    model = SqliteTableModel(connection, "data", pageSize=2)
+    model.sort(1, order)
+    # NULLs last in ascending order, ties in rowid order
+    expected = sorted(rows, key=lambda row: (row[1] is None, row[1] or 0, row[0]))
+    if order == Qt.DescendingOrder:
+        expected.reverse()
+    assert fetchAll(model) == [list(row) for row in expected]
+    model.sort(-1)
+    assert fetchAll(model) == [list(row) for row in rows]
+    connection.close()
+
+
+def test_snapshot_round_trip(table, tmp_path):
+    path = tmp_path / "table.snap"
+    table.item(1, 1).setToolTip("tip")
+    table.item(2, 0).setData(Qt.UserRole, 42)
+    table.setColumnWidth(1, 123)
+    table.saveSnapshot(path, version="v1")
+
+    restored = TableWidget(horizontalHeader=["id", "name"])
+    restored.createColumnIndex("id", unique=True)
+    assert restored.restoreSnapshot(path, version="v1")
+    assert restored.rowCount == 5
+    assert [restored.rowData(row)["name"] for row in range(5)] == [f"name{i}" for i in range(5)]
+    assert restored.item(1, 1).toolTip() == "tip"
+    assert restored.item(2, 0).data(Qt.UserRole) == 42
+    assert restored.columnWidth(1) == 123
+    assert restored.rowWhere("id", "3") == {"id": "3", "name": "name3"}
+    # the file is not held open
+    path.unlink()
+    restored.deleteLater()
+
+
+def test_snapshot_stale(table, tmp_path, monkeypatch):
+    path = tmp_path / "table.snap"
+    table.saveSnapshot(path, version="v1")
+    other = TableWidget(horizontalHeader=["id", "name"])
+    assert not other.restoreSnapshot(path, version="v2")
+    assert not other.restoreSnapshot(tmp_path / "missing.snap", version="v1")
+    monkeypatch.setattr(tablewidget, "_qtMinorVersion", lambda: "0.0")
+    assert not other.restoreSnapshot(path, version="v1")
+    assert other.rowCount == 0
+    other.deleteLater()
+
+
+def test_snapshot_corrupt(table, tmp_path):
+    path = tmp_path / "table.snap"
+    table.saveSnapshot(path)
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+    other = TableWidget(horizontalHeader=["id", "name"])
+    assert not other.restoreSnapshot(path)
+    path.write_bytes(b"")
+    assert not other.restoreSnapshot(path)
+    assert other.rowCount == 0
+    other.deleteLater()
+
+
+class RecordingDelegate(ElideDelegate):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.painted = []
+
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        self.painted.append((index.row(), index.column(), styleOf(option)))
+
+
+def styleOf(option):
+    return option.palette.text().color().name(), option.font.bold()
+
+
+def paintTable(table):
+    table.resize(400, 300)
+    table.viewport().grab()
+
+
+@pytest.mark.parametrize("before", [True, False])
+def test_format_rule_keeps_delegate(table, before):
+    delegate = RecordingDelegate(table)
+    if before:
+        table.setItemDelegate(delegate)
+    table.addFormatRule("id", lambda value: int(value) == 2, foreground="#ff0000", wholeRow=True)
+    if not before:
+        table.setItemDelegate(delegate)
+    assert table.itemDelegate() is delegate
+    paintTable(table)
+    colors = {(row, col): style[0] for row, col, style in delegate.painted}
+    assert colors[(2, 0)] == colors[(2, 1)] == "#ff0000"
+    assert colors[(1, 0)] != "#ff0000"
+
+
+@pytest.mark.parametrize("chained", [False, True])
+def test_format_rule_item_precedence(table, chained):
+    delegate = RecordingDelegate(table)
+    if chained:
+        table.setItemDelegate(delegate)
+    bold = QFont()
+    bold.setBold(True)
+    table.addFormatRule("id", lambda value: True, foreground="#ff0000", font=bold)
+    table.item(1, 0).setForeground(QColor("#0000ff"))
+    notBold = QFont()
+    notBold.setBold(False)
+    table.item(2, 0).setFont(notBold)
+    if chained:
+        paintTable(table)
+        styles = {(row, col): style for row, col, style in delegate.painted}
+    else:
+        styles = {}
+        for row in range(3):
+            option = QStyleOptionViewItem()
+            table.itemDelegate().initStyleOption(option, table.model().index(row, 0))
+            styles[(row, 0)] = styleOf(option)
+    assert styles[(0, 0)] == ("#ff0000", True)
+    assert styles[(1, 0)] == ("#0000ff", True)
+    assert styles[(2, 0)] == ("#ff0000", False)
+
+
+def test_format_rule_delegate_signals(table):
+    delegate = ElideDelegate(table)
+    table.setItemDelegate(delegate)
+    table.addFormatRule("id", lambda value: True, background="blue")
+    committed = []
+    table.findChild(tablewidget._FormatDelegate).commitData.connect(committed.append)
+    editor = QLineEdit()
+    delegate.commitData.emit(editor)
+    assert committed == [editor]
+    editor.deleteLater()
+
+
+def runExtend(qapp, table):
+    while table.isExtending:
+        qapp.processEvents()
+
+
+def test_extend(qapp, table):
+    finished = []
+    table.extendFinished.connect(finished.append)
+    table.extend(([str(i), f"name{i}"] for i in range(5, 2500)), chunkSize=100, timeBudgetMs=1)
+    assert table.isExtending
+    runExtend(qapp, table)
+    assert finished == [2495]
+    assert table.rowCount == 2500
+    assert table.rowWhere("id", "2499") == {"id": "2499", "name": "name2499"}
+
+
+def test_extend_cancel(qapp, table):
+    table.extendProgress.connect(lambda count: table.cancelExtend())
+    table.extend(([str(i), f"name{i}"] for i in range(5, 10_000)), chunkSize=10, timeBudgetMs=1)
+    runExtend(qapp, table)
+    assert 5 < table.rowCount < 10_000
+
+
+@pytest.mark.parametrize("kwargs", [{"chunkSize": 0}, {"chunkSize": -1}, {"timeBudgetMs": 0}])
+def test_extend_invalid(table, kwargs):
+    with pytest.raises(ValueError):
+        table.extend([["5", "name5"]], **kwargs)
+    assert not table.isExtending
+    assert table.rowCount == 5
+
+
+def test_replace_data(table):
+    table.item(3, 1).setToolTip("tip")
+    table.item(3, 0).setSelected(True)
+    changes = []
+    table.model().dataChanged.connect(
+        lambda first, last, *args: changes.append(
+            (first.row(), first.column(), last.row(), last.column())
+        )
+    )
+    rows = [["3", "name3"], ["0", "name0"], ["1", "changed"], ["5", "name5"], ["2", "name2"]]
+    table.replaceData(rows, "id")
+    assert tableRows(table) == rows
+    # unchanged rows keep their items
+    assert table.item(0, 1).toolTip() == "tip"
+    assert [item.text() for item in table.selectedItems()] == ["3"]
+    assert table.rowWhere("id", "4") == {}
+    assert table.rowWhere("id", "5") == {"id": "5", "name": "name5"}
+    # with the stored keys and values, only changed rows are updated
+    changes.clear()
+    rows[4] = ["2", "again"]
+    table.replaceData(rows, "id")
+    assert changes == [(4, 1, 4, 1)]
+    assert tableRows(table) == rows
+
+
+def test_replace_data_empty_cells(table):
+    table.takeItem(1, 1)
+    table.takeItem(2, 1)
+    table.takeItem(4, 0)
+    rows = [["2", "new2"], ["0", "name0"], ["", "name4"], ["1", "new1"]]
+    table.replaceData(rows, "id")
+    assert tableRows(table) == rows
+    assert table.rowWhere("id", "1") == {"id": "1", "name": "new1"}
+
+
+def test_replace_data_invalid(table):
+    with pytest.raises(ValueError):
+        table.replaceData([["1", "a"], ["1", "b"]], "id")
+    with pytest.raises(ValueError):
+        table.replaceData([["1"]], "id")
+    assert tableRows(table) == [[str(i), f"name{i}"] for i in range(5)]
+
+
+@pytest.fixture
+def view(qapp):
+    view = TableView(horizontalHeader=["name", "value"])
+    view.addRows([["c", 10], ["a", 9], ["d", -1], ["b", 100]], toolTip="tip")
+    yield view
+    view.deleteLater()
+
+
+def viewRows(view):
+    return [view.rowData(row, returnType="list") for row in range(view.rowCount)]
+
+
+def test_table_view_rows(view):
+    assert view.rowCount == 4
+    assert view.rowData(1) == {"name": "a", "value": 9}
+    assert view.columnData("value") == [10, 9, -1, 100]
+    index = view.model().index(3, 1)
+    assert index.data() == "100"
+    assert index.data(Qt.ToolTipRole) == "tip"
+    view.updateRow(1, ["a", 90])
+    view.removeRow(2)
+    view.addRow(["e", 5])
+    assert viewRows(view) == [["c", 10], ["a", 90], ["b", 100], ["e", 5]]
+    assert view.rowWhere("name", "b") == {"name": "b", "value": 100}
+    assert view.rowsWhere("value", 5, returnType="list") == [["e", 5]]
+    view.clearTable()
+    assert view.rowCount == 0
+
+
+def test_table_view_sort(view):
+    view.model().sort(1)
+    # compared as text by default
+    assert view.columnData("name") == ["d", "c", "b", "a"]
+    view.setColumnType("value", "numeric")
+    assert view.columnData("name") == ["d", "a", "c", "b"]
+    view.model().sort(0, Qt.DescendingOrder)
+    assert view.columnData("name") == ["d", "c", "b", "a"]
+    # rows added while sorted are shown in order
+    view.addRow(["bb", 0])
+    assert view.columnData("name") == ["d", "c", "bb", "b", "a"]
+    assert view.rowWhere("name", "bb") == {"name": "bb", "value": 0}
+    view.model().sort(-1)
+    assert view.columnData("name") == ["c", "a", "d", "b", "bb"]
+
+
+def test_table_view_filter(view):
+    view.setFilter("value", lambda value: int(value) > 0)
+    assert view.columnData("name") == ["c", "a", "b"]
+    assert view.rowWhere("name", "d") == {}
+    view.updateRow(0, ["c", -10])
+    view.addRow(["e", 1])
+    assert view.columnData("name") == ["a", "b", "e"]
+    view.clearFilters()
+    assert view.rowCount == 5
+
+
+def tableState(table):
+    """Return text, tool tip, hidden and selected state of every cell, in row order"""
+    return [
+        [
+            (item.text(), item.toolTip(), table.isRowHidden(row), item.isSelected())
+            for item in map(table.item, [row] * table.columnCount, range(table.columnCount))
+        ]
+        for row in range(table.rowCount)
+    ]
+
+
+@pytest.mark.parametrize("sorting", [None, "plain", "typed"])
+@pytest.mark.parametrize("filtered", [False, True])
+def test_add_rows_matches_add_row(qapp, sorting, filtered):
+    # values are unique, as Qt may order equal rows differently when they are added one by one
+    rows = [[f"name{i}", str((i * 7) % 23)] for i in range(20)]
+    kwargs = {"toolTip": ["name tip", "value tip"], "selected": [False, True]}
+    tables = []
+    for _ in range(2):
+        table = TableWidget(horizontalHeader=["name", "value"])
+        table.addRows([["first", "50"]])
+        if sorting is not None:
+            if sorting == "typed":
+                table.setColumnType("value", "numeric")
+            table.setSortingEnabled(True)
+            table.sortItems(1)
+        if filtered:
+            table.setFilter("value", lambda value: int(value) % 2 == 0)
+        table.createColumnIndex("name", unique=True)
+        tables.append(table)
+    loop, batch = tables
+    for row in rows:
+        loop.addRow(row, **kwargs)
+    batch.addRows(rows, **kwargs)
+    assert tableState(batch) == tableState(loop)
+    assert batch.rowWhere("name", "name13") == loop.rowWhere("name", "name13")
+    for table in tables:
+        table.deleteLater()
+
+
+CSV_ROWS = [
+    ["plain", "1"],
+    ['quote "marks"', "comma, here"],
+    ["tab\there", "new\nline"],
+    ["", "trailing space "],
+]
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".tsv"])
+def test_csv_round_trip(qapp, tmp_path, suffix):
+    path = tmp_path / f"table{suffix}"
+    table = TableWidget(horizontalHeader=["name", "value"])
+    table.addRows(CSV_ROWS)
+    table.toCsv(path, chunkSize=3)
+    with open(path, newline="") as fileobj:
+        first = fileobj.readline()
+    assert first == ("name\tvalue\r\n" if suffix == ".tsv" else "name,value\r\n")
+
+    restored = TableWidget()
+    assert restored.fromCsv(path, chunkSize=3, toolTip="tip") == len(CSV_ROWS)
+    assert restored.header == ["name", "value"]
+    assert tableRows(restored) == CSV_ROWS
+    assert restored.item(2, 1).toolTip() == "tip"
+    # appending to a table with a matching header
+    assert restored.fromCsv(path) == len(CSV_ROWS)
+    assert tableRows(restored) == CSV_ROWS * 2
+    table.deleteLater()
+    restored.deleteLater()
+
+
+def test_csv_stream_no_header(table):
+    stream = io.StringIO(newline="")
+    table.toCsv(stream, delimiter=";", header=False)
+    assert stream.getvalue().splitlines()[0] == "0;name0"
+    stream.seek(0)
+    restored = TableWidget(horizontalHeader=["id", "name"])
+    assert restored.fromCsv(stream, delimiter=";", header=False) == 5
+    assert tableRows(restored) == tableRows(table)
+    restored.deleteLater()
+
+
+def test_csv_invalid(table):
+    with pytest.raises(ValueError):
+        table.fromCsv(io.StringIO("other,header\n1,2\n"))
+    with pytest.raises(ValueError):
+        table.fromCsv(io.StringIO("id,name\n1,2,3\n"))
+
+
+def runResize(qapp, table):
+    while len(table._resizePending) > 0:
+        qapp.processEvents()
+
+
+def test_sampled_resize(qapp, monkeypatch):
+    # sample the first rows of the middle, so the rows that are measured are known
+    monkeypatch.setattr(tablewidget.random, "sample", lambda rows, k: list(rows)[:k])
+    short, wide = "x", "x" * 80
+    table = TableWidget(horizontalHeader=["a", "b"])
+    table.resizeSampleSize = 6
+    rows = [[short, short] for _ in range(50)]
+    rows[-1][0] = wide
+    rows[25][1] = wide
+    table.addRows(rows)
+    table.setResizeMode("Sampled")
+    runResize(qapp, table)
+    header = table.horizontalHeader()
+    assert header.sectionResizeMode(0) == QHeaderView.Interactive
+    # rows at the end are measured, but most of those in the middle are not
+    narrow = header.sectionSize(1)
+    assert header.sectionSize(0) > narrow
+    assert header.sectionSize(0) >= table.fontMetrics().horizontalAdvance(wide)
+    assert narrow < table.fontMetrics().horizontalAdvance(wide)
+
+    # added and changed rows widen the column, but never narrow it
+    table.addRow([short, wide])
+    runResize(qapp, table)
+    assert header.sectionSize(1) == header.sectionSize(0)
+    table.item(50, 1).setText(short)
+    runResize(qapp, table)
+    assert header.sectionSize(1) == header.sectionSize(0)
+    table.deleteLater()
@@ -0,0 +1,176 @@
+import time
+import pytest
+from qtpy.QtCore import Signal
+from qtpy.QtWidgets import QWidget
+from customQObjects.core import WrapSignalsMeta
+from customQObjects.widgets import StackedWidget
+
+
+class Page(QWidget):
+    def __init__(self, value=0):
+        super().__init__()
+        self._value = value
+
+    def method(self, offset):
+        return self._value + offset
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._value = value
+
+
+class OtherPage(QWidget):
+    value = "other"
+
+    def method(self, offset):
+        return f"other{offset}"
+
+
+class Container(StackedWidget, metaclass=WrapSignalsMeta, widget_class=Page):
+    pass
+
+
+@pytest.fixture
+def container(qapp):
+    container = Container()
+    yield container
+    container.deleteLater()
+
+
+def test_forwarders(container):
+    assert "method" in vars(Container)
+    assert isinstance(vars(Container)["value"], property)
+    container.addWidget("a", 1)
+    container.addWidget("b", 10)
+    assert container.method(2) == 3
+    container.setCurrentKey("b")
+    assert container.method(2) == 12
+    assert container.value == 10
+    container.value = 5
+    assert container.currentWidget().value == 5
+
+
+def test_forwarders_no_current_widget(container):
+    with pytest.raises(AttributeError, match="no current widget for 'method'"):
+        container.method(1)
+    with pytest.raises(AttributeError, match="no current widget for 'value'"):
+        container.value
+    with pytest.raises(AttributeError, match="no current widget for 'value'"):
+        container.value = 1
+    with pytest.raises(AttributeError, match="no current widget for 'other'"):
+        container.other
+
+
+def test_forwarders_other_page(container):
+    # a page that isn't a widget_class instance, added by the base class's addWidget
+    StackedWidget.addWidget(container, OtherPage(), key="other")
+    assert container.method(1) == "other1"
+    assert container.value == "other"
+    container.value = "changed"
+    assert container.currentWidget().value == "changed"
+
+
+class SignalPage(QWidget):
+    changed = Signal(int)
+
+
+class BatchContainer(StackedWidget, metaclass=WrapSignalsMeta, widget_class=SignalPage, coalesce=0):
+    pass
+
+
+class LatestContainer(
+    StackedWidget,
+    metaclass=WrapSignalsMeta,
+    widget_class=SignalPage,
+    coalesce=0,
+    coalesce_latest=True,
+):
+    pass
+
+
+def waitFor(qapp, condition, timeout=5):
+    deadline = time.perf_counter() + timeout
+    while not condition() and time.perf_counter() < deadline:
+        qapp.processEvents()
+    return condition()
+
+
+@pytest.fixture
+def batches(qapp, request):
+    container = request.param()
+    batches = []
+    container.changedBatched.connect(batches.append)
+    for key in "abc":
+        container.addWidget(key)
+    yield container, batches
+    container.deleteLater()
+
+
+@pytest.mark.parametrize("batches", [BatchContainer], indirect=True)
+def test_coalesce(qapp, batches):
+    container, batches = batches
+    unbatched = []
+    container.changed.connect(lambda *args: unbatched.append(args))
+    container["a"].changed.emit(1)
+    container["b"].changed.emit(2)
+    container["a"].changed.emit(3)
+    assert batches == []
+    assert waitFor(qapp, lambda: len(batches) > 0)
+    assert batches == [[("a", (1,)), ("b", (2,)), ("a", (3,))]]
+    assert unbatched == []
+    container["c"].changed.emit(4)
+    assert waitFor(qapp, lambda: len(batches) > 1)
+    assert batches[1] == [("c", (4,))]
+
+
+@pytest.mark.parametrize("batches", [LatestContainer], indirect=True)
+def test_coalesce_latest(qapp, batches):
+    container, batches = batches
+    container["a"].changed.emit(1)
+    container["b"].changed.emit(2)
+    container["a"].changed.emit(3)
+    assert waitFor(qapp, lambda: len(batches) > 0)
+    assert batches == [[("b", (2,)), ("a", (3,))]]
+
+
+@pytest.mark.parametrize("batches", [BatchContainer], indirect=True)
+def test_flush_signals(qapp, batches):
+    container, batches = batches
+    container.flushSignals()
+    assert batches == []
+    container["a"].changed.emit(1)
+    container.flushSignals()
+    assert batches == [[("a", (1,))]]
+    # emissions from a slot connected to the batched signal are queued for the next batch
+    container.changedBatched.connect(lambda batch: container["b"].changed.emit(len(batches)))
+    container["a"].changed.emit(2)
+    container.flushSignals()
+    assert batches == [[("a", (1,))], [("a", (2,))]]
+    assert waitFor(qapp, lambda: len(batches) > 2)
+    assert batches[2] == [("b", (2,))]
+
+
+@pytest.mark.parametrize("coalesce", [-1, 1.5, "0"])
+def test_coalesce_invalid(coalesce):
+    with pytest.raises(ValueError):
+
+        class Invalid(
+            StackedWidget, metaclass=WrapSignalsMeta, widget_class=SignalPage, coalesce=coalesce
+        ):
+            pass
+
+
+def test_widget_class_not_qobject():
+    with pytest.raises(TypeError):
+
+        class Invalid(StackedWidget, metaclass=WrapSignalsMeta, widget_class=OtherPage.method):
+            pass
+
+    with pytest.raises(TypeError):
+
+        class NotQObject(StackedWidget, metaclass=WrapSignalsMeta, widget_class=object):
+            pass